@@ -1,7 +1,7 @@
 from typing import Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.core.security import verify_token
+from app.core.security import token_role, verify_token
 from app.db.database import get_db, get_users_collection
 from app.schemas.mongodb_schemas import MongoDBUser as User
 from bson import ObjectId
@@ -77,6 +77,33 @@ async def get_current_user(
     return user
 
 
+async def get_user_from_token(token: str) -> Optional[User]:
+    """Resolve a bearer token passed outside the Authorization header.
+
+    Browsers cannot set headers on WebSocket or EventSource requests, so
+    streaming endpoints take the token as a query parameter.
+    """
+    if not token:
+        return None
+    return await get_optional_current_user(
+        db=None,
+        credentials=HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    )
+
+
+def get_optional_token_role(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
+) -> Optional[str]:
+    """Role claim of the bearer token, if any.
+
+    Read from the signed token alone, so it costs no database query but
+    reflects the user's role when the token was issued.
+    """
+    if credentials is None:
+        return None
+    return token_role(credentials.credentials)
+
+
 def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
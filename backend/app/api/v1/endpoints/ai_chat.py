@@ -1,69 +1,169 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta
 import httpx
+import json
 import os
 from ..deps import get_current_user
+from app.core.config import settings
 from app.schemas.mongodb_schemas import MongoDBUser as User
+from app.services.llm_client import LLMError, get_api_key, llm_client
+from app.services.semantic_cache import semantic_cache
 
 router = APIRouter()
 
+SYSTEM_PROMPT = "You are Opusnex AI, a helpful and friendly career assistant for job seekers. You help users with resume building, interview preparation, job search strategies, salary negotiation, application guidance, and general career advice. Always introduce yourself as 'Opusnex AI' and be encouraging, professional, and supportive. Keep responses concise but helpful."
+
 class ChatMessage(BaseModel):
     role: str
     content: str
 
 class ChatRequest(BaseModel):
     messages: List[ChatMessage]
+    # Stream the reply token by token as server-sent events
+    stream: bool = False
+    # Allow an answer to a near-identical earlier question
+    use_cache: bool = True
 
 class ChatResponse(BaseModel):
     response: str
     error: Optional[str] = None
 
+
+def build_chat_payload(request: ChatRequest) -> dict:
+    """OpenAI chat completion payload for a chat request"""
+    return {
+        "model": os.getenv("VITE_OPENAI_MODEL", settings.OPENAI_CHAT_MODEL),
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT}
+        ] + [{"role": msg.role, "content": msg.content} for msg in request.messages],
+        "max_tokens": 500,
+        "temperature": 0.7,
+        "stream": request.stream,
+        # Have the final streamed chunk report token usage
+        **({"stream_options": {"include_usage": True}} if request.stream else {})
+    }
+
+
+def cacheable_prompt(request: ChatRequest) -> Optional[str]:
+    """The question to look up in the semantic cache, if the request may use it.
+
+    Only opening questions are cached: with earlier turns the same words can
+    ask something else. Answers are shared between users, so personal
+    prompts (long, or with contact details) are never cached.
+    """
+    if request.use_cache and len(request.messages) == 1 and request.messages[0].role == "user":
+        prompt = request.messages[0].content
+        if semantic_cache.shareable(prompt):
+            return prompt
+    return None
+
+
+def cached_stream(answer: str, model: str) -> StreamingResponse:
+    """A cached answer in the same SSE format as a streamed completion"""
+    chunk = {
+        "object": "chat.completion.chunk",
+        "model": model,
+        "choices": [{"index": 0, "delta": {"role": "assistant", "content": answer}, "finish_reason": "stop"}]
+    }
+
+    async def event_stream():
+        yield f"data: {json.dumps(chunk)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def stream_chat(payload: dict, user_id: Optional[str] = None, cache_prompt: Optional[str] = None) -> StreamingResponse:
+    """Proxy the upstream SSE stream to the client as it arrives.
+
+    Each upstream ``data:`` event (ending with ``data: [DONE]``) is passed
+    through unchanged. Upstream errors before the first byte are returned as
+    normal HTTP errors; errors mid-stream end the stream with an ``error``
+    event. A completed answer to ``cache_prompt`` is added to the semantic
+    cache.
+    """
+    upstream = await llm_client.open_stream("/chat/completions", payload, user_id=user_id)
+
+    async def event_stream():
+        parts: List[str] = []
+        finished = False
+        try:
+            async for line in upstream.aiter_lines():
+                yield f"{line}\n"
+                if cache_prompt and line.startswith("data: {"):
+                    try:
+                        for choice in json.loads(line[6:]).get("choices") or []:
+                            parts.append(choice.get("delta", {}).get("content") or "")
+                            finished = finished or choice.get("finish_reason") == "stop"
+                    except ValueError:
+                        pass
+            if finished:
+                await semantic_cache.put(cache_prompt, payload["model"], "".join(parts))
+        except httpx.HTTPError as e:
+            yield f"event: error\ndata: {str(e) or 'Upstream stream interrupted'}\n\n"
+        finally:
+            await upstream.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat_with_ai(
     request: ChatRequest,
     current_user: User = Depends(get_current_user)
 ):
     try:
-        # Get OpenAI API key from environment
-        api_key = os.getenv("VITE_OPENAI_API_KEY") or os.getenv("OPENAI_API_KEY")
-        if not api_key:
+        if not get_api_key():
             raise HTTPException(status_code=500, detail="OpenAI API key not configured")
         
-        # Prepare the request to OpenAI
-        openai_url = "https://api.openai.com/v1/chat/completions"
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}"
-        }
+        payload = build_chat_payload(request)
+        cache_prompt = cacheable_prompt(request)
+        if cache_prompt:
+            cached = await semantic_cache.get(cache_prompt, payload["model"])
+            if cached is not None:
+                return cached_stream(cached, payload["model"]) if request.stream else ChatResponse(response=cached)
         
-        payload = {
-            "model": os.getenv("VITE_OPENAI_MODEL", "gpt-3.5-turbo"),
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "You are Opusnex AI, a helpful and friendly career assistant for job seekers. You help users with resume building, interview preparation, job search strategies, salary negotiation, application guidance, and general career advice. Always introduce yourself as 'Opusnex AI' and be encouraging, professional, and supportive. Keep responses concise but helpful."
-                }
-            ] + [{"role": msg.role, "content": msg.content} for msg in request.messages],
-            "max_tokens": 500,
-            "temperature": 0.7
-        }
+        if request.stream:
+            return await stream_chat(payload, current_user.id, cache_prompt)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(openai_url, headers=headers, json=payload, timeout=30.0)
-            
-            if response.status_code != 200:
-                error_detail = response.json() if response.content else "OpenAI API error"
-                raise HTTPException(status_code=response.status_code, detail=f"OpenAI API error: {error_detail}")
-            
-            data = response.json()
-            ai_response = data.get("choices", [{}])[0].get("message", {}).get("content", "Sorry, I could not generate a response.")
-            
-            return ChatResponse(response=ai_response)
+        data = await llm_client.request("/chat/completions", payload, user_id=current_user.id)
+        choice = data.get("choices", [{}])[0]
+        ai_response = choice.get("message", {}).get("content", "Sorry, I could not generate a response.")
+        if cache_prompt and choice.get("finish_reason") == "stop":
+            await semantic_cache.put(cache_prompt, payload["model"], ai_response)
+        
+        return ChatResponse(response=ai_response)
             
-    except httpx.TimeoutException:
-        raise HTTPException(status_code=408, detail="Request timeout")
-    except httpx.RequestError as e:
-        raise HTTPException(status_code=500, detail=f"Network error: {str(e)}")
+    except HTTPException:
+        raise
+    except LLMError as e:
+        # Upstream error bodies are JSON; timeouts, network errors and an open circuit are messages
+        detail = e.detail if isinstance(e.detail, str) else f"OpenAI API error: {e.detail}"
+        raise HTTPException(status_code=e.status_code, detail=detail)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/usage")
+async def get_ai_usage(
+    days: int = 30,
+    current_user: User = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """Token usage of the current user per day and model"""
+    since = (datetime.utcnow() - timedelta(days=max(days, 1) - 1)).strftime("%Y-%m-%d")
+    usage = await llm_client.get_usage(current_user.id, since)
+    return {
+        "since": since,
+        "total_tokens": sum(day.get("total_tokens", 0) for day in usage),
+        "usage": usage
+    }
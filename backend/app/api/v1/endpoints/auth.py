@@ -3,6 +3,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 from app.db.database import get_users_collection
 from app.schemas.mongodb_schemas import MongoDBUser
+from app.services.autocomplete import autocomplete_service
 from jose import jwt
 import bcrypt
 import logging
@@ -92,6 +93,7 @@ async def register(user_data: dict, users_collection=Depends(get_users_db)):
             result = await users_collection.insert_one(user_doc)
             user_doc["_id"] = str(result.inserted_id)
             logger.info(f"User inserted successfully with ID: {result.inserted_id}")
+            autocomplete_service.index_user(user_doc)
         except Exception as e:
             logger.error(f"Database insertion failed: {e}")
             raise HTTPException(status_code=500, detail=f"Database insertion failed: {str(e)}")
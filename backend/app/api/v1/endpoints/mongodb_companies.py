@@ -1,9 +1,11 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
+from app.crud.mongodb_companies import MongoDBCompanyCRUD, get_mongodb_company_crud
 from app.db.database import get_companies_collection
-from app.schemas.mongodb_schemas import MongoDBCompany
+from app.schemas.mongodb_schemas import MongoDBCompany, COMPANY_SCHEMA_VERSION, company_search_keys
+from app.services.autocomplete import autocomplete_service
 
 router = APIRouter()
 
@@ -12,7 +14,7 @@ def get_companies_db():
 
 
 @router.get("/", response_model=List[MongoDBCompany])
-def list_companies(
+async def list_companies(
     skip: int = 0,
     limit: int = 20,
     companies_collection = Depends(get_companies_db)
@@ -21,7 +23,7 @@ def list_companies(
     try:
         cursor = companies_collection.find().skip(skip).limit(limit)
         companies = []
-        for company in cursor:
+        async for company in cursor:
             company["_id"] = str(company["_id"])
             companies.append(MongoDBCompany(**company))
         return companies
@@ -30,13 +32,13 @@ def list_companies(
 
 
 @router.get("/{company_id}", response_model=MongoDBCompany)
-def get_company(
+async def get_company(
     company_id: str,
     companies_collection = Depends(get_companies_db)
 ):
     """Get a specific company by ID"""
     try:
-        company = companies_collection.find_one({"_id": ObjectId(company_id)})
+        company = await companies_collection.find_one({"_id": ObjectId(company_id)})
         if not company:
             raise HTTPException(status_code=404, detail="Company not found")
         
@@ -49,7 +51,7 @@ def get_company(
 
 
 @router.post("/", response_model=MongoDBCompany)
-def create_company(
+async def create_company(
     company_data: dict,
     companies_collection = Depends(get_companies_db)
 ):
@@ -82,11 +84,14 @@ def create_company(
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow(),
             "is_verified": company_data.get("is_verified", False),
-            "verification_date": company_data.get("verification_date")
+            "verification_date": company_data.get("verification_date"),
+            "schema_version": COMPANY_SCHEMA_VERSION
         }
+        company_doc["search"] = company_search_keys(company_doc)
         
-        result = companies_collection.insert_one(company_doc)
+        result = await companies_collection.insert_one(company_doc)
         company_doc["_id"] = str(result.inserted_id)
+        autocomplete_service.index_company(company_doc)
         
         return MongoDBCompany(**company_doc)
     except Exception as e:
@@ -94,19 +99,26 @@ def create_company(
 
 
 @router.put("/{company_id}", response_model=MongoDBCompany)
-def update_company(
+async def update_company(
     company_id: str,
     company_data: dict,
     companies_collection = Depends(get_companies_db)
 ):
     """Update a company"""
     try:
+        company = await companies_collection.find_one({"_id": ObjectId(company_id)})
+        if not company:
+            raise HTTPException(status_code=404, detail="Company not found")
+        
         update_data = {"updated_at": datetime.utcnow()}
         for field, value in company_data.items():
-            if value is not None:
+            if value is not None and field not in ("_id", "search", "schema_version"):
                 update_data[field] = value
+        # Keep the search keys in step with the fields they are built from
+        update_data["search"] = company_search_keys({**company, **update_data})
+        update_data["schema_version"] = COMPANY_SCHEMA_VERSION
         
-        result = companies_collection.update_one(
+        result = await companies_collection.update_one(
             {"_id": ObjectId(company_id)},
             {"$set": update_data}
         )
@@ -115,8 +127,9 @@ def update_company(
             raise HTTPException(status_code=404, detail="Company not found")
         
         # Return updated company
-        updated_company = companies_collection.find_one({"_id": ObjectId(company_id)})
+        updated_company = await companies_collection.find_one({"_id": ObjectId(company_id)})
         updated_company["_id"] = str(updated_company["_id"])
+        autocomplete_service.index_company(updated_company)
         return MongoDBCompany(**updated_company)
     except HTTPException:
         raise
@@ -125,15 +138,16 @@ def update_company(
 
 
 @router.delete("/{company_id}")
-def delete_company(
+async def delete_company(
     company_id: str,
     companies_collection = Depends(get_companies_db)
 ):
     """Delete a company"""
     try:
-        result = companies_collection.delete_one({"_id": ObjectId(company_id)})
+        result = await companies_collection.delete_one({"_id": ObjectId(company_id)})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Company not found")
+        autocomplete_service.remove_company(company_id)
         
         return {"message": "Company deleted successfully"}
     except HTTPException:
@@ -142,41 +156,27 @@ def delete_company(
         raise HTTPException(status_code=500, detail=f"Error deleting company: {str(e)}")
 
 
-@router.get("/search/")
-def search_companies(
+@router.get("/search/", response_model=List[MongoDBCompany])
+async def search_companies(
     query: Optional[str] = None,
     industry: Optional[str] = None,
     location: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 20,
-    companies_collection = Depends(get_companies_db)
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    company_crud: MongoDBCompanyCRUD = Depends(get_mongodb_company_crud)
 ):
-    """Search companies with filters"""
+    """Search companies with filters.
+
+    ``query`` matches words of the name, industry and description and the
+    start of name words, best matches first; ``industry`` and ``location``
+    (e.g. "San Francisco, CA") match the start of those fields. All given
+    filters apply together.
+    """
     try:
-        search_query = {}
-        
-        if query:
-            search_query["$or"] = [
-                {"name": {"$regex": query, "$options": "i"}},
-                {"description": {"$regex": query, "$options": "i"}}
-            ]
-        
-        if industry:
-            search_query["industry"] = {"$regex": industry, "$options": "i"}
-        
-        if location:
-            search_query["$or"] = [
-                {"location": {"$regex": location, "$options": "i"}},
-                {"city": {"$regex": location, "$options": "i"}},
-                {"state": {"$regex": location, "$options": "i"}},
-                {"country": {"$regex": location, "$options": "i"}}
-            ]
-        
-        cursor = companies_collection.find(search_query).skip(skip).limit(limit)
         companies = []
-        for company in cursor:
+        for company in await company_crud.search_companies(query, industry, location, skip, limit):
             company["_id"] = str(company["_id"])
             companies.append(MongoDBCompany(**company))
         return companies
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error searching companies: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error searching companies: {str(e)}")
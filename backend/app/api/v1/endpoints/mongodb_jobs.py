@@ -3,17 +3,24 @@ from typing import List, Optional
 from app.crud.mongodb_jobs import get_mongodb_job_crud, get_mongodb_application_crud
 from app.schemas.mongodb_schemas import (
     MongoDBJob, MongoDBJobApplication, JobCreateRequest, JobUpdateRequest,
-    JobSearchRequest, JobApplicationRequest, JobStatus, ApplicationStatus
+    JobSearchRequest, JobApplicationRequest, JobStatus, ApplicationStatus,
+    BulkApplicationStatusRequest
 )
 from app.api.deps import get_current_user
 from app.schemas.mongodb_schemas import MongoDBUser as User
 from app.db.mongodb import connect_to_mongo
+from app.services.application_stats import application_stats_service
+from app.services.notification_service import notification_service
+from app.services.notification_dispatcher import notification_dispatcher
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+mongodb_job_crud = get_mongodb_job_crud()
+mongodb_application_crud = get_mongodb_application_crud()
+
 
 @router.on_event("startup")
 async def startup_event():
@@ -114,6 +121,38 @@ async def search_jobs(
         )
 
 
+@router.get("/featured", response_model=List[MongoDBJob])
+async def get_featured_jobs(
+    limit: int = Query(10, ge=1, le=50, description="Number of featured jobs")
+):
+    """Get featured jobs"""
+    try:
+        jobs = await mongodb_job_crud.get_featured_jobs(limit=limit)
+        return jobs
+    except Exception as e:
+        logger.error(f"Error getting featured jobs: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get featured jobs"
+        )
+
+
+@router.get("/recent", response_model=List[MongoDBJob])
+async def get_recent_jobs(
+    limit: int = Query(20, ge=1, le=100, description="Number of recent jobs")
+):
+    """Get recent published jobs"""
+    try:
+        jobs = await mongodb_job_crud.get_recent_jobs(limit=limit)
+        return jobs
+    except Exception as e:
+        logger.error(f"Error getting recent jobs: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get recent jobs"
+        )
+
+
 @router.get("/{job_id}", response_model=MongoDBJob)
 async def get_job(job_id: str):
     """Get a specific job by ID"""
@@ -345,38 +384,6 @@ async def get_my_jobs(
         )
 
 
-@router.get("/featured", response_model=List[MongoDBJob])
-async def get_featured_jobs(
-    limit: int = Query(10, ge=1, le=50, description="Number of featured jobs")
-):
-    """Get featured jobs"""
-    try:
-        jobs = await mongodb_job_crud.get_featured_jobs(limit=limit)
-        return jobs
-    except Exception as e:
-        logger.error(f"Error getting featured jobs: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to get featured jobs"
-        )
-
-
-@router.get("/recent", response_model=List[MongoDBJob])
-async def get_recent_jobs(
-    limit: int = Query(20, ge=1, le=100, description="Number of recent jobs")
-):
-    """Get recent published jobs"""
-    try:
-        jobs = await mongodb_job_crud.get_recent_jobs(limit=limit)
-        return jobs
-    except Exception as e:
-        logger.error(f"Error getting recent jobs: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to get recent jobs"
-        )
-
-
 # Job Application Endpoints
 @router.post("/{job_id}/apply", response_model=MongoDBJobApplication, status_code=status.HTTP_201_CREATED)
 async def apply_to_job(
@@ -481,6 +488,64 @@ async def get_job_applications(
         )
 
 
+@router.get("/{job_id}/applications/stats", response_model=dict)
+async def get_job_application_stats(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Get application counts by status for a job (employers only)"""
+    if current_user.role != "employer":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only employers can view application statistics"
+        )
+    
+    try:
+        job = await mongodb_job_crud.get_job_by_id(job_id)
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found"
+            )
+        
+        if job.employer_id != str(current_user.id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You can only view statistics for your own job postings"
+            )
+        
+        return await application_stats_service.get_job_stats(job_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting application stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get application statistics"
+        )
+
+
+@router.get("/employer/application-stats", response_model=dict)
+async def get_my_application_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Get application counts by status across all of the current employer's jobs"""
+    if current_user.role != "employer":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only employers can view application statistics"
+        )
+    
+    try:
+        return await application_stats_service.get_employer_stats(str(current_user.id))
+    except Exception as e:
+        logger.error(f"Error getting employer application stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get application statistics"
+        )
+
+
 @router.get("/applications/my-applications", response_model=List[MongoDBJobApplication])
 async def get_my_applications(
     current_user: User = Depends(get_current_user),
@@ -508,6 +573,58 @@ async def get_my_applications(
         )
 
 
+@router.put("/applications/bulk-status", response_model=dict)
+async def bulk_update_application_status(
+    request: BulkApplicationStatusRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Update the status of many applications at once (employers only)"""
+    if current_user.role != "employer":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only employers can update application status"
+        )
+
+    try:
+        results, updated = await mongodb_application_crud.bulk_update_application_status(
+            request.application_ids,
+            request.status,
+            request.notes,
+            employer_id=str(current_user.id)
+        )
+
+        # Queue notifications to applicants; the dispatcher writes them in batches
+        try:
+            notifications = notification_service.build_application_status_notifications([
+                {
+                    "applicant_id": application["applicant_id"],
+                    "job_title": job.get("title", "Job"),
+                    "company_name": job.get("company_name") or "Company",
+                    "status": request.status.value,
+                    "job_id": application.get("job_id"),
+                    "application_id": str(application["_id"])
+                }
+                for application, job in updated
+                if application.get("applicant_id")
+            ])
+            await notification_dispatcher.enqueue(*notifications)
+        except Exception as notification_error:
+            logger.error(f"Failed to send bulk status notifications: {notification_error}")
+            # Don't fail the request if notification fails
+
+        summary = {}
+        for item in results:
+            summary[item["result"]] = summary.get(item["result"], 0) + 1
+
+        return {"status": request.status, "summary": summary, "results": results}
+    except Exception as e:
+        logger.error(f"Error bulk updating application status: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update application statuses"
+        )
+
+
 @router.put("/applications/{application_id}/status", response_model=MongoDBJobApplication)
 async def update_application_status(
     application_id: str,
@@ -547,18 +664,17 @@ async def update_application_status(
                 detail="Application not found"
             )
         
-        # Send notification to job seeker about status update
+        # Queue notification to job seeker about status update
         try:
-            from app.services.notification_service import notification_service
-            await notification_service.create_application_status_notification(
+            await notification_dispatcher.enqueue(notification_service.build_application_status_notification(
                 applicant_id=updated_application.applicant_id,
                 job_title=job.title,
                 company_name=job.company_name or "Company",
                 status=status.value,
                 job_id=updated_application.job_id,
                 application_id=application_id
-            )
-            logger.info(f"Notification sent to applicant {updated_application.applicant_id} for status: {status}")
+            ))
+            logger.info(f"Notification queued to applicant {updated_application.applicant_id} for status: {status}")
         except Exception as notification_error:
             logger.error(f"Failed to send notification: {notification_error}")
             # Don't fail the request if notification fails
@@ -1,14 +1,18 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Response, status
 from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
 from app.db.database import get_jobs_collection, get_applications_collection
 from app.schemas.mongodb_schemas import (
     MongoDBJob, JobCreateRequest, JobUpdateRequest, JobSearchRequest,
-    MongoDBJobApplication, JobApplicationRequest
+    MongoDBJobApplication, JobApplicationRequest, JobType, WorkMode,
+    JOB_SCHEMA_VERSION, normalize_job_type, normalize_work_mode
 )
+from app.services.response_cache import response_cache, JOB_FEEDS
+from app.services.application_stats import application_stats_service
+from app.services.autocomplete import autocomplete_service, CANDIDATES, CATEGORIES, MAX_SUGGESTIONS
 import logging
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_optional_token_role
 from app.schemas.mongodb_schemas import MongoDBUser as User
 
 router = APIRouter()
@@ -59,8 +63,8 @@ async def create_job(
             "responsibilities": job_data.get("responsibilities", []),
             "benefits": job_data.get("benefits", []),
             "location": job_data.get("location", ""),
-            "job_type": job_data.get("job_type", "full_time"),
-            "work_mode": job_data.get("work_mode", "on_site").replace("onsite", "on_site"),
+            "job_type": normalize_job_type(job_data.get("job_type") or JobType.FULL_TIME.value),
+            "work_mode": normalize_work_mode(job_data.get("work_mode") or WorkMode.ON_SITE.value),
             # Accept ANY salary values (including 0, negative, or no salary)
             "salary_min": job_data.get("salary_min"),
             "salary_max": job_data.get("salary_max"),
@@ -80,7 +84,8 @@ async def create_job(
             "employer_id": employer_id,
             "employer_name": employer_name,
             "company_id": company_id,
-            "company_name": company_name
+            "company_name": company_name,
+            "schema_version": JOB_SCHEMA_VERSION
         }
         
         # Store ANY additional fields the user might send
@@ -93,6 +98,8 @@ async def create_job(
         jobs_collection = get_jobs_db()
         result = await jobs_collection.insert_one(job_doc)
         job_doc["_id"] = str(result.inserted_id)
+        await response_cache.invalidate(JOB_FEEDS)
+        autocomplete_service.index_job(job_doc)
         
         logging.info(f"Job created successfully with ID: {job_doc['_id']}")
         return job_doc
@@ -113,20 +120,6 @@ async def list_jobs(
         jobs = []
         async for job in cursor:
             job["_id"] = str(job["_id"])
-            # Convert hyphen format to underscore format for compatibility
-            if "job_type" in job and job["job_type"]:
-                job["job_type"] = job["job_type"].replace("-", "_")
-            if "work_mode" in job and job["work_mode"]:
-                # Fix work_mode values to match enum
-                work_mode = job["work_mode"]
-                if work_mode == "onsite":
-                    job["work_mode"] = "on_site"
-                elif work_mode == "remote":
-                    job["work_mode"] = "remote"
-                elif work_mode == "hybrid":
-                    job["work_mode"] = "hybrid"
-                else:
-                    job["work_mode"] = "on_site"  # Default fallback
             # Return raw job data instead of MongoDBJob object to avoid schema issues
             jobs.append(job)
         return jobs
@@ -163,20 +156,6 @@ async def get_employer_jobs(
         jobs = []
         async for job in cursor:
             job["_id"] = str(job["_id"])
-            # Convert hyphen format to underscore format for compatibility
-            if "job_type" in job and job["job_type"]:
-                job["job_type"] = job["job_type"].replace("-", "_")
-            if "work_mode" in job and job["work_mode"]:
-                # Fix work_mode values to match enum
-                work_mode = job["work_mode"]
-                if work_mode == "onsite":
-                    job["work_mode"] = "on_site"
-                elif work_mode == "remote":
-                    job["work_mode"] = "remote"
-                elif work_mode == "hybrid":
-                    job["work_mode"] = "hybrid"
-                else:
-                    job["work_mode"] = "on_site"  # Default fallback
             # Return raw job data instead of MongoDBJob object to avoid schema issues
             jobs.append(job)
         
@@ -206,6 +185,29 @@ async def test_employer_endpoint(
     }
 
 
+@router.get("/suggestions/")
+async def get_suggestions(
+    response: Response,
+    query: str = Query(..., min_length=1, max_length=100),
+    top_k: int = Query(5, ge=1, le=MAX_SUGGESTIONS),
+    role: Optional[str] = Depends(get_optional_token_role)
+):
+    """Type-ahead suggestions for skills, job titles, companies and (for employers) candidate names.
+
+    Answered from in-memory indexes, and the caller's role is read from the
+    token's ``role`` claim, so no database query is made and it can be called
+    on every (debounced) keystroke.
+    """
+    categories = CATEGORIES
+    if role not in ("employer", "admin"):
+        categories = tuple(category for category in CATEGORIES if category != CANDIDATES)
+    suggestions = {category: [] for category in CATEGORIES}
+    suggestions.update(autocomplete_service.suggest(query, top_k, categories))
+    # Repeated keystrokes for the same prefix are answered by the browser
+    response.headers["Cache-Control"] = "private, max-age=30"
+    return suggestions
+
+
 @router.get("/{job_id}", response_model=MongoDBJob)
 async def get_job(
     job_id: str,
@@ -218,11 +220,6 @@ async def get_job(
             raise HTTPException(status_code=404, detail="Job not found")
         
         job["_id"] = str(job["_id"])
-        # Convert hyphen format to underscore format for compatibility
-        if "job_type" in job and job["job_type"]:
-            job["job_type"] = job["job_type"].replace("-", "_")
-        if "work_mode" in job and job["work_mode"]:
-            job["work_mode"] = job["work_mode"].replace("-", "_")
         return MongoDBJob(**job)
     except HTTPException:
         raise
@@ -251,15 +248,12 @@ async def update_job(
         
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Job not found")
+        await response_cache.invalidate(JOB_FEEDS)
         
         # Return updated job
         updated_job = await jobs_collection.find_one({"_id": ObjectId(job_id)})
         updated_job["_id"] = str(updated_job["_id"])
-        # Convert hyphen format to underscore format for compatibility
-        if "job_type" in updated_job and updated_job["job_type"]:
-            updated_job["job_type"] = updated_job["job_type"].replace("-", "_")
-        if "work_mode" in updated_job and updated_job["work_mode"]:
-            updated_job["work_mode"] = updated_job["work_mode"].replace("-", "_")
+        autocomplete_service.index_job(updated_job)
         return MongoDBJob(**updated_job)
     except HTTPException:
         raise
@@ -298,6 +292,8 @@ async def delete_job(
         result = await jobs_collection.delete_one({"_id": ObjectId(job_id)})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Job not found")
+        await response_cache.invalidate(JOB_FEEDS)
+        autocomplete_service.remove_job(job_id)
         
         logging.info(f"Job {job_id} deleted successfully by user {current_user.email}")
         return {"message": "Job deleted successfully"}
@@ -367,6 +363,7 @@ async def apply_to_job(
             {"_id": ObjectId(job_id)},
             {"$inc": {"applications_count": 1}}
         )
+        await application_stats_service.record_application(job_id, employer_id=job.get("employer_id"))
         
         logging.info(f"Job application submitted: {current_user.email} applied to job {job_id}")
         return application_doc
@@ -490,11 +487,6 @@ async def search_jobs(
         jobs = []
         async for job in cursor:
             job["_id"] = str(job["_id"])
-            # Convert hyphen format to underscore format for compatibility
-            if "job_type" in job and job["job_type"]:
-                job["job_type"] = job["job_type"].replace("-", "_")
-            if "work_mode" in job and job["work_mode"]:
-                job["work_mode"] = job["work_mode"].replace("-", "_")
             jobs.append(MongoDBJob(**job))
         return jobs
     except Exception as e:
@@ -1,9 +1,16 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Dict, Any
 from datetime import datetime
 from bson import ObjectId
+import asyncio
+import json
+from app.api.deps import get_user_from_token
+from app.core.config import settings
 from app.db.database import get_notifications_collection
 from app.schemas.mongodb_schemas import MongoDBNotification
+from app.services.notification_broker import notification_broker
+from app.services.notification_service import notification_service
 
 router = APIRouter()
 
@@ -31,23 +38,80 @@ async def list_notifications(
 
 
 @router.get("/unread-count")
-async def get_unread_count(
-    user_id: str = None,
-    notifications_collection = Depends(get_notifications_db)
-):
+async def get_unread_count(user_id: str = None):
     """Get unread notification count for a user"""
     try:
         if not user_id:
             return {"unread_count": 0}
-        count = await notifications_collection.count_documents({
-            "user_id": user_id,
-            "is_read": False
-        })
-        return {"unread_count": count}
+        return {"unread_count": await notification_service.get_unread_count(user_id)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching unread count: {str(e)}")
 
 
+def _sse_message(event: Dict[str, Any]) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+@router.get("/stream")
+async def stream_notifications(request: Request, token: str = Query(..., description="Access token")):
+    """Server-Sent Events stream of notification events for the authenticated user.
+
+    Starts with the current unread count, then pushes an event whenever a
+    notification is created, read, archived or deleted.
+    """
+    user = await get_user_from_token(token)
+    if user is None:
+        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+    user_id = str(user.id)
+
+    async def event_stream():
+        # Subscribe before counting so nothing published in between is missed
+        async with notification_broker.subscribe(user_id) as queue:
+            unread_count = await notification_service.get_unread_count(user_id)
+            yield _sse_message({"type": "unread_count", "unread_count": unread_count})
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=settings.NOTIFICATION_STREAM_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _sse_message(event)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/ws")
+async def notifications_websocket(websocket: WebSocket, token: Optional[str] = Query(None)):
+    """WebSocket carrying the same events as the SSE stream"""
+    user = await get_user_from_token(token)
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    user_id = str(user.id)
+
+    async with notification_broker.subscribe(user_id) as queue:
+        try:
+            unread_count = await notification_service.get_unread_count(user_id)
+            await websocket.send_json({"type": "unread_count", "unread_count": unread_count})
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=settings.NOTIFICATION_STREAM_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    event = {"type": "ping"}
+                await websocket.send_json(event)
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+
+
 @router.get("/{notification_id}", response_model=MongoDBNotification)
 async def get_notification(
     notification_id: str,
@@ -89,30 +153,44 @@ async def create_notification(
         
         result = await notifications_collection.insert_one(notification_doc)
         notification_doc["_id"] = str(result.inserted_id)
+        await notification_service.notify_created(notification_doc)
         
         return MongoDBNotification(**notification_doc)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating notification: {str(e)}")
 
 
-@router.put("/{notification_id}/read")
-async def mark_as_read(
-    notification_id: str,
-    notifications_collection = Depends(get_notifications_db)
+@router.put("/read-all")
+async def mark_all_as_read(
+    user_id: str,
+    before: Optional[datetime] = Query(None, description="Only notifications created at or before this time")
+):
+    """Mark all of a user's notifications as read"""
+    try:
+        modified = await notification_service.mark_all_as_read(user_id, before)
+        return {"message": "Notifications marked as read", "modified_count": modified}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error marking notifications as read: {str(e)}")
+
+
+@router.put("/archive-old")
+async def archive_old_notifications(
+    user_id: str,
+    older_than_days: int = Query(30, ge=0, description="Archive notifications older than this many days")
 ):
+    """Archive a user's notifications older than a number of days"""
+    try:
+        modified = await notification_service.archive_older_than(user_id, older_than_days)
+        return {"message": "Notifications archived", "modified_count": modified}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error archiving notifications: {str(e)}")
+
+
+@router.put("/{notification_id}/read")
+async def mark_as_read(notification_id: str):
     """Mark a notification as read"""
     try:
-        result = await notifications_collection.update_one(
-            {"_id": ObjectId(notification_id)},
-            {
-                "$set": {
-                    "is_read": True,
-                    "read_at": datetime.utcnow()
-                }
-            }
-        )
-        
-        if result.matched_count == 0:
+        if await notification_service.mark_as_read(notification_id) is None:
             raise HTTPException(status_code=404, detail="Notification not found")
         
         return {"message": "Notification marked as read"}
@@ -123,18 +201,10 @@ async def mark_as_read(
 
 
 @router.put("/{notification_id}/archive")
-async def archive_notification(
-    notification_id: str,
-    notifications_collection = Depends(get_notifications_db)
-):
+async def archive_notification(notification_id: str):
     """Archive a notification"""
     try:
-        result = await notifications_collection.update_one(
-            {"_id": ObjectId(notification_id)},
-            {"$set": {"is_archived": True}}
-        )
-        
-        if result.matched_count == 0:
+        if await notification_service.archive_notification(notification_id) is None:
             raise HTTPException(status_code=404, detail="Notification not found")
         
         return {"message": "Notification archived"}
@@ -145,14 +215,10 @@ async def archive_notification(
 
 
 @router.delete("/{notification_id}")
-async def delete_notification(
-    notification_id: str,
-    notifications_collection = Depends(get_notifications_db)
-):
+async def delete_notification(notification_id: str):
     """Delete a notification"""
     try:
-        result = await notifications_collection.delete_one({"_id": ObjectId(notification_id)})
-        if result.deleted_count == 0:
+        if await notification_service.delete_notification(notification_id) is None:
             raise HTTPException(status_code=404, detail="Notification not found")
         
         return {"message": "Notification deleted successfully"}
@@ -5,6 +5,7 @@ from bson import ObjectId
 from app.db.database import get_users_collection
 from app.schemas.mongodb_schemas import MongoDBUser
 from app.api.deps import get_current_user
+from app.services.autocomplete import autocomplete_service
 
 router = APIRouter()
 
@@ -54,6 +55,7 @@ async def update_current_user_profile(
         updated_user = await users_collection.find_one({"email": current_user.email})
         if updated_user:
             updated_user["_id"] = str(updated_user["_id"])
+            autocomplete_service.index_user(updated_user)
             print(f"Returning updated user: {updated_user.get('name', 'Unknown')}")
             return MongoDBUser(**updated_user)
         else:
@@ -1,10 +1,12 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from app.db.database import get_db, get_notifications_collection
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.db.database import get_notifications_collection
 from app.api.deps import get_current_user
 from app.schemas.mongodb_schemas import MongoDBUser as User
 from app.schemas.mongodb_schemas import MongoDBNotification as Notification
 from app.schemas.notification import NotificationResponse, NotificationUpdate
+from app.services.notification_service import notification_service
 from bson import ObjectId
 
 router = APIRouter()
@@ -31,97 +33,95 @@ async def get_notifications(
         return []
 
 
-@router.put("/{notification_id}", response_model=NotificationResponse)
-def update_notification(
-    notification_id: int,
+@router.post("/mark-all-read")
+async def mark_all_notifications_read(
+    before: Optional[datetime] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Mark all notifications as read"""
+    try:
+        modified = await notification_service.mark_all_as_read(str(current_user.id), before)
+        return {"message": "All notifications marked as read", "modified_count": modified}
+    except Exception as e:
+        print(f"Error marking notifications as read: {e}")
+        return {"message": "Failed to mark notifications as read"}
+
+
+@router.post("/archive-old")
+async def archive_old_notifications(
+    older_than_days: int = Query(30, ge=0),
+    current_user: User = Depends(get_current_user)
+):
+    """Archive notifications older than a number of days"""
+    try:
+        modified = await notification_service.archive_older_than(str(current_user.id), older_than_days)
+        return {"message": "Old notifications archived", "modified_count": modified}
+    except Exception as e:
+        print(f"Error archiving notifications: {e}")
+        return {"message": "Failed to archive notifications"}
+
+
+@router.get("/unread-count")
+async def get_unread_notifications_count(
+    current_user: User = Depends(get_current_user)
+):
+    """Get count of unread notifications"""
+    try:
+        count = await notification_service.get_unread_count(str(current_user.id))
+        return {"count": count}
+    except Exception as e:
+        print(f"Error getting unread count: {e}")
+        return {"count": 0}
+
+
+@router.put("/{notification_id}", response_model=Notification)
+async def update_notification(
+    notification_id: str,
     notification_data: NotificationUpdate,
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Update notification (mark as read)"""
-    notification = db.query(Notification).filter(
-        Notification.id == notification_id,
-        Notification.user_id == current_user.id
-    ).first()
+    if not ObjectId.is_valid(notification_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Notification not found"
+        )
     
+    user_id = str(current_user.id)
+    if notification_data.is_read is None:
+        found = True
+    elif notification_data.is_read:
+        found = await notification_service.mark_as_read(notification_id, user_id) is not None
+    else:
+        found = await notification_service.mark_as_unread(notification_id, user_id) is not None
+    
+    notification = await get_notifications_collection().find_one(
+        {"_id": ObjectId(notification_id), "user_id": user_id}
+    ) if found else None
     if not notification:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Notification not found"
         )
     
-    # Update notification
-    if notification_data.is_read is not None:
-        notification.is_read = notification_data.is_read
-        if notification_data.is_read:
-            from datetime import datetime
-            notification.read_at = datetime.utcnow()
-    
-    db.commit()
-    db.refresh(notification)
-    return notification
+    notification["_id"] = str(notification["_id"])
+    return Notification(**notification)
 
 
 @router.delete("/{notification_id}")
-def delete_notification(
-    notification_id: int,
-    db: Session = Depends(get_db),
+async def delete_notification(
+    notification_id: str,
     current_user: User = Depends(get_current_user)
 ):
     """Delete notification"""
-    notification = db.query(Notification).filter(
-        Notification.id == notification_id,
-        Notification.user_id == current_user.id
-    ).first()
+    deleted = None
+    if ObjectId.is_valid(notification_id):
+        deleted = await notification_service.delete_notification(notification_id, str(current_user.id))
     
-    if not notification:
+    if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Notification not found"
         )
     
-    db.delete(notification)
-    db.commit()
     return {"message": "Notification deleted successfully"}
-
-
-@router.post("/mark-all-read")
-def mark_all_notifications_read(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Mark all notifications as read"""
-    from datetime import datetime
-    
-    try:
-        db.query(Notification).filter(
-            Notification.user_id == current_user.id,
-            Notification.is_read == False
-        ).update({
-            "is_read": True,
-            "read_at": datetime.utcnow()
-        })
-        
-        db.commit()
-        return {"message": "All notifications marked as read"}
-    except Exception as e:
-        print(f"Error marking notifications as read: {e}")
-        return {"message": "Failed to mark notifications as read"}
-
-
-@router.get("/unread-count")
-def get_unread_notifications_count(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Get count of unread notifications"""
-    try:
-        count = db.query(Notification).filter(
-            Notification.user_id == current_user.id,
-            Notification.is_read == False
-        ).count()
-        
-        return {"count": count}
-    except Exception as e:
-        print(f"Error getting unread count: {e}")
-        return {"count": 0}
\ No newline at end of file
@@ -1,10 +1,17 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from typing import List, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, status, UploadFile, File, Form
+from fastapi.responses import Response
 from app.services.google_drive_service import google_drive_service
-from app.services.pdf_generator import pdf_generator
+from app.services.pdf_cache import resume_data_hash
+from app.services.pdf_generator import DEFAULT_TEMPLATE, TEMPLATES
+from app.services.pdf_renderer import pdf_renderer
+from app.services.resume_parser import resume_parser, SUPPORTED_MIME_TYPES
 import os
+import io
+import re
 import json
 import logging
+import zipfile
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +21,16 @@ class Session:
 
 router = APIRouter()
 
+MAX_BATCH_RESUMES = 20
+MAX_BATCH_PDFS = 100
+
+
+def _pdf_filename(resume_data: dict) -> str:
+    name = resume_data.get('personalInfo', {}).get('name') or 'resume'
+    # Safe in ZIP entries and Content-Disposition headers
+    name = re.sub(r'[^\w-]+', '_', name.strip().lower()).strip('_') or 'resume'
+    return f"{name}_resume.pdf"
+
 
 # @router.get("/", response_model=List[ResumeResponse])
 # def get_resumes(
@@ -37,20 +54,61 @@ router = APIRouter()
 # (All these endpoints depend on SQLAlchemy models that are not available in MongoDB setup)
 
 
+def _check_template(template: str) -> None:
+    if template not in TEMPLATES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown resume template '{template}'. Available: {', '.join(TEMPLATES)}"
+        )
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+@router.get("/templates")
+async def list_resume_templates():
+    """List the templates resume PDFs can be rendered with"""
+    return {
+        "default": DEFAULT_TEMPLATE,
+        "templates": [
+            {"id": template_id, "name": template["name"]}
+            for template_id, template in TEMPLATES.items()
+        ]
+    }
+
+
 @router.post("/generate-pdf")
 async def generate_resume_pdf(
-    resume_data: dict
+    resume_data: dict,
+    request: Request,
+    response: Response,
+    template: str = Query(DEFAULT_TEMPLATE, description="Template id, see /resumes/templates")
 ):
-    """Generate a PDF for the resume from provided data"""
+    """Generate a PDF for the resume from provided data.
+
+    The ETag identifies the resume data and template; a request whose
+    If-None-Match carries it gets 304 Not Modified without rendering.
+    """
     try:
         logger.info(f"Generating PDF for resume data: {resume_data.keys()}")
+        _check_template(template)
+        
+        etag = f'"{resume_data_hash(resume_data, template)}"'
+        if _etag_matches(request, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
         
-        # Generate PDF from resume data
-        pdf_content = pdf_generator.generate_resume_pdf(resume_data)
+        # Generate PDF from resume data in the renderer's worker processes
+        # (or return the cached PDF of the same data)
+        pdf_content = await pdf_renderer.render(resume_data, template)
+        response.headers["ETag"] = etag
         
         # Create filename
-        name = resume_data.get('personalInfo', {}).get('name', 'resume')
-        filename = f"{name.replace(' ', '_').lower()}_resume.pdf"
+        filename = _pdf_filename(resume_data)
         
         logger.info(f"PDF generated successfully, filename: {filename}")
         
@@ -61,6 +119,8 @@ async def generate_resume_pdf(
             "pdf_content": pdf_content.hex()  # Convert bytes to hex for JSON transmission
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error generating PDF: {e}")
         raise HTTPException(
@@ -69,6 +129,29 @@ async def generate_resume_pdf(
         )
 
 
+@router.post("/generate-pdf/file")
+async def download_resume_pdf(
+    resume_data: dict,
+    request: Request,
+    template: str = Query(DEFAULT_TEMPLATE, description="Template id, see /resumes/templates")
+):
+    """Generate a PDF for the resume and return the file itself, with an ETag"""
+    _check_template(template)
+    etag = f'"{resume_data_hash(resume_data, template)}"'
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    pdf_content = await pdf_renderer.render(resume_data, template)
+    return Response(
+        content=pdf_content,
+        media_type="application/pdf",
+        headers={
+            "ETag": etag,
+            "Content-Disposition": f'attachment; filename="{_pdf_filename(resume_data)}"'
+        }
+    )
+
+
 @router.get("/test-pdf")
 async def test_pdf_generation():
     """Test PDF generation with sample data"""
@@ -87,20 +170,66 @@ async def test_pdf_generation():
     }
     
     try:
-        pdf_content = pdf_generator.generate_resume_pdf(sample_data)
+        pdf_content = await pdf_renderer.render(sample_data)
         return {
             "success": True,
             "message": "Test PDF generated successfully",
             "pdf_size": len(pdf_content)
         }
-    except Exception as e:
-        logger.error(f"Test PDF generation failed: {e}")
+    except HTTPException as e:
+        logger.error(f"Test PDF generation failed: {e.detail}")
         return {
             "success": False,
-            "error": str(e)
+            "error": e.detail
         }
 
 
+@router.post("/generate-pdf-batch")
+async def generate_resume_pdf_batch(
+    resumes: List[dict] = Body(...),
+    template: str = Query(DEFAULT_TEMPLATE, description="Template id, see /resumes/templates")
+):
+    """Generate PDFs for several resumes, all with one template, and return them as one ZIP archive.
+
+    Resumes that fail to render are listed in ``errors.txt`` in the archive.
+    """
+    _check_template(template)
+    if not resumes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No resumes to export."
+        )
+    if len(resumes) > MAX_BATCH_PDFS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_PDFS} resumes can be exported at once."
+        )
+    
+    archive = io.BytesIO()
+    errors = []
+    used_names = set()
+    # PDF pages are already compressed, so entries are stored as they are
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_STORED) as zip_file:
+        for index, (resume_data, pdf_content) in enumerate(zip(resumes, await pdf_renderer.render_many(resumes, template)), start=1):
+            filename = _pdf_filename(resume_data)
+            if filename in used_names:
+                filename = f"{filename[:-len('.pdf')]}_{index}.pdf"
+            used_names.add(filename)
+            if isinstance(pdf_content, Exception):
+                detail = pdf_content.detail if isinstance(pdf_content, HTTPException) else str(pdf_content)
+                errors.append(f"{index}. {filename}: {detail}")
+            else:
+                zip_file.writestr(filename, pdf_content)
+        if errors:
+            zip_file.writestr("errors.txt", "\n".join(errors) + "\n")
+    
+    return Response(
+        content=archive.getvalue(),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="resumes.zip"'}
+    )
+
+
 # @router.post("/{resume_id}/upload-video")
 # @router.post("/{resume_id}/upload-audio")
 # (Upload endpoints also depend on SQLAlchemy models - commented out for MongoDB setup)
@@ -108,10 +237,14 @@ async def test_pdf_generation():
 
 @router.post("/parse-google-drive")
 async def parse_google_drive_resume(
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
     metadata: str = Form(...)
 ):
-    """Parse resume from Google Drive file"""
+    """Parse resume from Google Drive file.
+
+    Parses the uploaded file, or, without one, downloads the file from
+    Google Drive with the ``accessToken`` given in the metadata.
+    """
     try:
         # Parse metadata
         file_metadata = json.loads(metadata)
@@ -125,40 +258,33 @@ async def parse_google_drive_resume(
             )
         
         # Validate file type
-        allowed_types = [
-            'application/pdf',
-            'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-        ]
-        
-        if mime_type not in allowed_types:
+        if mime_type not in SUPPORTED_MIME_TYPES:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Unsupported file type. Only PDF and DOCX files are supported."
             )
         
-        # Validate file size (10MB limit)
-        if file.size and file.size > 10 * 1024 * 1024:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File size must be less than 10MB."
-            )
-        
-        # For now, we'll parse the uploaded file directly
-        # In a production environment, you might want to use the Google Drive API
-        # to download the file using the file_id and access token
-        
-        file_content = await file.read()
-        
-        # Parse based on file type
-        if mime_type == 'application/pdf':
-            parsed_data = google_drive_service.parse_pdf_content(file_content)
-        elif mime_type == 'application/vnd.openxmlformats-officedocument.wordprocessingml.document':
-            parsed_data = google_drive_service.parse_docx_content(file_content)
+        if file is None:
+            access_token = file_metadata.get('accessToken')
+            if not access_token:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Either a file or a Google OAuth access token is required"
+                )
+            # Streamed from Drive straight into the parser (10MB limit)
+            parsed_data = await google_drive_service.process_google_drive_file(file_id, access_token, mime_type)
         else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Unsupported file type"
-            )
+            # Validate file size (10MB limit)
+            if file.size and file.size > 10 * 1024 * 1024:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="File size must be less than 10MB."
+                )
+            
+            file_content = await file.read()
+            
+            # Parse in the resume parser's worker processes, off the event loop
+            parsed_data = await resume_parser.parse(file_content, mime_type)
         
         return {
             "success": True,
@@ -171,8 +297,45 @@ async def parse_google_drive_resume(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid metadata format"
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to parse resume: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/parse-batch")
+async def parse_resume_batch(
+    files: List[UploadFile] = File(...)
+):
+    """Parse several PDF or DOCX resumes concurrently"""
+    if len(files) > MAX_BATCH_RESUMES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_RESUMES} files can be parsed at once."
+        )
+    
+    documents = []
+    for file in files:
+        if file.size and file.size > 10 * 1024 * 1024:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{file.filename}: file size must be less than 10MB."
+            )
+        documents.append((await file.read(), file.content_type))
+    
+    results = []
+    for file, parsed in zip(files, await resume_parser.parse_many(documents)):
+        if isinstance(parsed, HTTPException):
+            results.append({"filename": file.filename, "success": False, "error": parsed.detail})
+        elif isinstance(parsed, Exception):
+            results.append({"filename": file.filename, "success": False, "error": str(parsed)})
+        else:
+            results.append({"filename": file.filename, "success": True, "data": parsed})
+    
+    return {
+        "success": all(result["success"] for result in results),
+        "results": results
+    }
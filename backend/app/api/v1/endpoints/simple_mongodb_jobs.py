@@ -1,9 +1,20 @@
-from fastapi import APIRouter, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import os
 from motor.motor_asyncio import AsyncIOMotorClient
 from bson import ObjectId
+from pymongo import ReturnDocument
+from app.schemas.mongodb_schemas import JOB_SCHEMA_VERSION, normalize_job_type, normalize_work_mode
+from app.api.deps import get_current_employer
+from app.crud.mongodb_jobs import write_status_changes, skipped_status_result
+from app.schemas.mongodb_schemas import MongoDBUser as User
+from app.services.response_cache import response_cache, FEATURED_JOBS, RECENT_JOBS, JOB_FEEDS
+from app.services.autocomplete import autocomplete_service
+from app.services.view_counter import view_counter
+from app.services.application_stats import application_stats_service
+from app.services.notification_service import notification_service
+from app.services.notification_dispatcher import notification_dispatcher
 
 router = APIRouter()
 
@@ -15,6 +26,9 @@ MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "jobify")
 client: Optional[AsyncIOMotorClient] = None
 db = None
 
+# Upper bound on application ids accepted by the bulk status endpoint
+MAX_BULK_APPLICATIONS = 500
+
 
 @router.on_event("startup")
 async def startup_event():
@@ -81,6 +95,69 @@ async def list_jobs(
         )
 
 
+@router.get("/featured", response_model=List[Dict[str, Any]])
+async def get_featured_jobs(
+    limit: int = Query(10, ge=1, le=50, description="Number of featured jobs")
+):
+    """Get featured jobs"""
+    try:
+        async def load():
+            cursor = db.jobs.find({
+                "status": "published",
+                "is_featured": True
+            }).sort("created_at", -1).limit(limit)
+            
+            jobs = []
+            async for job in cursor:
+                job["_id"] = str(job["_id"])
+                jobs.append(job)
+            return jobs
+        
+        return await response_cache.get_or_set(FEATURED_JOBS, {"limit": limit}, load)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get featured jobs: {str(e)}"
+        )
+
+
+@router.get("/recent", response_model=List[Dict[str, Any]])
+async def get_recent_jobs(
+    limit: int = Query(20, ge=1, le=100, description="Number of recent jobs")
+):
+    """Get recent published jobs"""
+    try:
+        async def load():
+            cursor = db.jobs.find({
+                "status": "published"
+            }).sort("published_at", -1).limit(limit)
+            
+            jobs = []
+            async for job in cursor:
+                job["_id"] = str(job["_id"])
+                jobs.append(job)
+            return jobs
+        
+        return await response_cache.get_or_set(RECENT_JOBS, {"limit": limit}, load)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get recent jobs: {str(e)}"
+        )
+
+
+@router.get("/employer/{employer_id}/application-stats", response_model=Dict[str, Any])
+async def get_employer_application_stats(employer_id: str):
+    """Get application counts by status across all of an employer's jobs"""
+    try:
+        return await application_stats_service.get_employer_stats(employer_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get application stats: {str(e)}"
+        )
+
+
 @router.get("/{job_id}", response_model=Dict[str, Any])
 async def get_job(job_id: str):
     """Get a specific job by ID"""
@@ -92,11 +169,8 @@ async def get_job(job_id: str):
                 detail="Job not found"
             )
         
-        # Increment view count
-        await db.jobs.update_one(
-            {"_id": ObjectId(job_id)},
-            {"$inc": {"views_count": 1}}
-        )
+        # Increment view count (buffered and written in batches)
+        await view_counter.record(job_id)
         
         job["_id"] = str(job["_id"])
         return job
@@ -113,17 +187,28 @@ async def get_job(job_id: str):
 async def create_job(job_data: Dict[str, Any]):
     """Create a new job posting (simplified version)"""
     try:
+        # Store enum fields in their canonical form
+        if job_data.get("job_type"):
+            job_data["job_type"] = normalize_job_type(job_data["job_type"])
+        if job_data.get("work_mode"):
+            job_data["work_mode"] = normalize_work_mode(job_data["work_mode"])
+        
         # Add metadata
         job_data.update({
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow(),
             "views_count": 0,
-            "applications_count": 0
+            "applications_count": 0,
+            "schema_version": JOB_SCHEMA_VERSION
         })
         
         result = await db.jobs.insert_one(job_data)
         job_data["_id"] = str(result.inserted_id)
         
+        if job_data.get("status") == "published":
+            await response_cache.invalidate(JOB_FEEDS)
+        autocomplete_service.index_job(job_data)
+        
         return job_data
     except Exception as e:
         raise HTTPException(
@@ -153,9 +238,12 @@ async def publish_job(job_id: str):
                 detail="Job not found"
             )
         
+        await response_cache.invalidate(JOB_FEEDS)
+        
         # Get updated job
         job = await db.jobs.find_one({"_id": ObjectId(job_id)})
         job["_id"] = str(job["_id"])
+        autocomplete_service.index_job(job)
         return job
     except HTTPException:
         raise
@@ -166,53 +254,6 @@ async def publish_job(job_id: str):
         )
 
 
-@router.get("/featured", response_model=List[Dict[str, Any]])
-async def get_featured_jobs(
-    limit: int = Query(10, ge=1, le=50, description="Number of featured jobs")
-):
-    """Get featured jobs"""
-    try:
-        cursor = db.jobs.find({
-            "status": "published",
-            "is_featured": True
-        }).sort("created_at", -1).limit(limit)
-        
-        jobs = []
-        async for job in cursor:
-            job["_id"] = str(job["_id"])
-            jobs.append(job)
-        
-        return jobs
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get featured jobs: {str(e)}"
-        )
-
-
-@router.get("/recent", response_model=List[Dict[str, Any]])
-async def get_recent_jobs(
-    limit: int = Query(20, ge=1, le=100, description="Number of recent jobs")
-):
-    """Get recent published jobs"""
-    try:
-        cursor = db.jobs.find({
-            "status": "published"
-        }).sort("published_at", -1).limit(limit)
-        
-        jobs = []
-        async for job in cursor:
-            job["_id"] = str(job["_id"])
-            jobs.append(job)
-        
-        return jobs
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get recent jobs: {str(e)}"
-        )
-
-
 @router.post("/{job_id}/apply", response_model=Dict[str, Any], status_code=status.HTTP_201_CREATED)
 async def apply_to_job(job_id: str, application_data: Dict[str, Any]):
     """Apply to a job (simplified version)"""
@@ -262,16 +303,17 @@ async def apply_to_job(job_id: str, application_data: Dict[str, Any]):
         
         print(f"📊 Updated applications count for job: {job_id}")
         
-        # Send notification to employer about new application
+        await application_stats_service.record_application(job_id, employer_id=job.get("employer_id"))
+        
+        # Queue notification to employer about new application
         try:
-            from app.services.notification_service import notification_service
-            await notification_service.create_new_application_notification(
+            await notification_dispatcher.enqueue(notification_service.build_new_application_notification(
                 employer_id=job.get("employer_id"),
                 applicant_name=application_data.get("applicant_name", "Applicant"),
                 job_title=job.get("title", "Job"),
                 job_id=job_id,
                 application_id=str(result.inserted_id)
-            )
+            ))
         except Exception as notification_error:
             print(f"Failed to send notification to employer: {notification_error}")
             # Don't fail the request if notification fails
@@ -323,6 +365,163 @@ async def get_job_applications(job_id: str):
         )
 
 
+@router.get("/{job_id}/applications/stats", response_model=Dict[str, Any])
+async def get_job_application_stats(job_id: str):
+    """Get application counts by status for a specific job"""
+    try:
+        return await application_stats_service.get_job_stats(job_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get application stats: {str(e)}"
+        )
+
+
+@router.put("/applications/bulk-status", response_model=Dict[str, Any])
+async def bulk_update_application_status(
+    status_data: Dict[str, Any],
+    current_user: User = Depends(get_current_employer)
+):
+    """Update the status of many applications at once (employers only).
+
+    Expects ``application_ids`` and ``status`` (plus optional ``notes``).
+    Applications are read with one query, updated with one ``bulk_write``
+    and applicants are notified with one ``insert_many``; the response
+    reports the outcome for every requested id. Applications for another
+    employer's jobs are reported as forbidden and left untouched;
+    applications whose status changed since they were read are reported as
+    unchanged or conflict.
+    """
+    try:
+        valid_statuses = ["pending", "accepted", "rejected", "waiting", "under_review", "shortlisted", "interview_scheduled"]
+        new_status = status_data.get("status")
+        if new_status not in valid_statuses:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid status. Must be one of: {valid_statuses}"
+            )
+
+        application_ids = status_data.get("application_ids") or []
+        if not isinstance(application_ids, list) or not application_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="application_ids must be a non-empty list"
+            )
+        if len(application_ids) > MAX_BULK_APPLICATIONS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {MAX_BULK_APPLICATIONS} applications can be updated at once"
+            )
+
+        # Keep the caller's order but drop duplicates
+        application_ids = list(dict.fromkeys(str(app_id) for app_id in application_ids))
+        results: Dict[str, Dict[str, Any]] = {}
+        object_ids = []
+        for app_id in application_ids:
+            if ObjectId.is_valid(app_id):
+                object_ids.append(ObjectId(app_id))
+            else:
+                results[app_id] = {"application_id": app_id, "result": "invalid_id"}
+
+        applications = {}
+        async for application in db.job_applications.find(
+            {"_id": {"$in": object_ids}},
+            {"job_id": 1, "applicant_id": 1, "status": 1}
+        ):
+            applications[str(application["_id"])] = application
+
+        job_object_ids = [
+            ObjectId(app["job_id"]) for app in applications.values() if ObjectId.is_valid(str(app.get("job_id")))
+        ]
+        jobs = {}
+        async for job in db.jobs.find(
+            {"_id": {"$in": job_object_ids}},
+            {"title": 1, "company_name": 1, "employer_id": 1}
+        ):
+            jobs[str(job["_id"])] = job
+
+        employer_id = str(current_user.id)
+        to_update = []
+        for app_id in application_ids:
+            if app_id in results:
+                continue
+            application = applications.get(app_id)
+            if not application:
+                results[app_id] = {"application_id": app_id, "result": "not_found"}
+            elif jobs.get(application.get("job_id"), {}).get("employer_id") != employer_id:
+                results[app_id] = {"application_id": app_id, "result": "forbidden"}
+            elif application.get("status", "pending") == new_status:
+                results[app_id] = {"application_id": app_id, "result": "unchanged", "status": new_status}
+            else:
+                to_update.append(application)
+
+        if to_update:
+            update_data = {
+                "status": new_status,
+                "updated_at": datetime.utcnow()
+            }
+            if status_data.get("notes"):
+                update_data["employer_notes"] = status_data["notes"]
+
+            # Rows a concurrent request changed in the meantime are left alone
+            to_update, skipped = await write_status_changes(db.job_applications, to_update, update_data)
+            for app_id, application in skipped.items():
+                results[app_id] = skipped_status_result(app_id, application, new_status)
+
+            await application_stats_service.record_status_changes(
+                (
+                    app.get("job_id"),
+                    jobs.get(app.get("job_id"), {}).get("employer_id"),
+                    app.get("status", "pending"),
+                    new_status
+                )
+                for app in to_update
+            )
+
+            # Queue notifications to applicants; the dispatcher writes them in batches
+            try:
+                notifications = notification_service.build_application_status_notifications([
+                    {
+                        "applicant_id": app["applicant_id"],
+                        "job_title": jobs.get(app.get("job_id"), {}).get("title", "Job"),
+                        "company_name": jobs.get(app.get("job_id"), {}).get("company_name") or "Company",
+                        "status": new_status,
+                        "job_id": app.get("job_id"),
+                        "application_id": str(app["_id"])
+                    }
+                    for app in to_update
+                    if app.get("applicant_id")
+                ])
+                await notification_dispatcher.enqueue(*notifications)
+            except Exception as notification_error:
+                print(f"Failed to send bulk status update notifications: {notification_error}")
+
+            for app in to_update:
+                results[str(app["_id"])] = {
+                    "application_id": str(app["_id"]),
+                    "result": "updated",
+                    "previous_status": app.get("status", "pending"),
+                    "status": new_status
+                }
+
+        items = [results[app_id] for app_id in application_ids]
+        summary: Dict[str, int] = {}
+        for item in items:
+            summary[item["result"]] = summary.get(item["result"], 0) + 1
+
+        print(f"✅ Bulk status update to {new_status}: {summary}")
+        return {"status": new_status, "summary": summary, "results": items}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Error in bulk status update: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to update application statuses: {str(e)}"
+        )
+
+
 @router.put("/applications/{application_id}/status", response_model=Dict[str, Any])
 async def update_application_status(
     application_id: str, 
@@ -344,16 +543,7 @@ async def update_application_status(
                 detail=f"Invalid status. Must be one of: {valid_statuses}"
             )
         
-        # Check if application exists
-        try:
-            application = await db.job_applications.find_one({"_id": ObjectId(application_id)})
-            if not application:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Application not found"
-                )
-        except Exception as e:
-            print(f"❌ Error finding application: {e}")
+        if not ObjectId.is_valid(application_id):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid application ID format: {application_id}"
@@ -369,17 +559,14 @@ async def update_application_status(
         if status_data.get("notes"):
             update_data["employer_notes"] = status_data["notes"]
         
+        # One atomic read-and-write, so the status the stats move away from is
+        # the one this update replaced even when two updates race
         try:
-            result = await db.job_applications.update_one(
+            application = await db.job_applications.find_one_and_update(
                 {"_id": ObjectId(application_id)},
-                {"$set": update_data}
+                {"$set": update_data},
+                return_document=ReturnDocument.BEFORE
             )
-            
-            if result.modified_count == 0:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to update application status"
-                )
         except Exception as e:
             print(f"❌ Error updating application: {e}")
             raise HTTPException(
@@ -387,33 +574,36 @@ async def update_application_status(
                 detail=f"Database error: {str(e)}"
             )
         
-        # Get the updated application
-        try:
-            updated_application = await db.job_applications.find_one({"_id": ObjectId(application_id)})
-            if updated_application:
-                updated_application["_id"] = str(updated_application["_id"])
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to retrieve updated application"
-                )
-        except Exception as e:
-            print(f"❌ Error retrieving updated application: {e}")
+        if not application:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to retrieve updated application: {str(e)}"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Application not found"
             )
         
-        # Send notification to job seeker about status change
+        updated_application = {**application, **update_data, "_id": str(application["_id"])}
+        
+        await application_stats_service.record_status_change(
+            application.get("job_id"),
+            application.get("status", "pending"),
+            new_status
+        )
+        
+        # Queue notification to job seeker about status change
         try:
-            from app.services.notification_service import notification_service
-            await notification_service.create_status_update_notification(
+            job = {}
+            if ObjectId.is_valid(str(application.get("job_id"))):
+                job = await db.jobs.find_one(
+                    {"_id": ObjectId(application["job_id"])},
+                    {"title": 1, "company_name": 1}
+                ) or {}
+            await notification_dispatcher.enqueue(notification_service.build_application_status_notification(
                 applicant_id=application.get("applicant_id"),
+                job_title=job.get("title") or application.get("job_title", "Job"),
+                company_name=job.get("company_name") or "Company",
                 status=new_status,
-                job_title=application.get("job_title", "Job"),
                 job_id=application.get("job_id"),
                 application_id=application_id
-            )
+            ))
         except Exception as notification_error:
             print(f"Failed to send status update notification: {notification_error}")
         
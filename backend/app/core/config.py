@@ -37,6 +37,18 @@ class Settings(BaseSettings):
     MAIL_PORT: int = 587
     MAIL_SERVER: str = "smtp.gmail.com"
     MAIL_FROM_NAME: str = "SkillGlide"
+    # "smtp" sends for real; "console" logs messages and "memory" keeps them in
+    # mail_transport.outbox (a local stand-in for development and tests)
+    MAIL_BACKEND: str = "smtp"
+    MAIL_STARTTLS: bool = True
+    MAIL_USE_TLS: bool = False
+    MAIL_TIMEOUT_SECONDS: float = 30.0
+    MAIL_POOL_SIZE: int = 2
+    MAIL_IDLE_TIMEOUT_SECONDS: float = 60.0
+    MAIL_QUEUE_MAX_SIZE: int = 1000
+    MAIL_BATCH_SIZE: int = 50
+    MAIL_MAX_RETRIES: int = 3
+    MAIL_RETRY_DELAY_SECONDS: float = 2.0
     
     # File Storage
     AWS_ACCESS_KEY_ID: Optional[str] = None
@@ -46,6 +58,38 @@ class Settings(BaseSettings):
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379"
+    REDIS_ENABLED: bool = False
+    
+    # Response cache (in-process tier, plus Redis tier when REDIS_ENABLED)
+    CACHE_LOCAL_TTL_SECONDS: int = 30
+    CACHE_REDIS_TTL_SECONDS: int = 300
+    CACHE_MAX_ENTRIES: int = 512
+    
+    # Job view counters (write-behind)
+    VIEW_COUNTER_FLUSH_INTERVAL_SECONDS: float = 5.0
+    VIEW_COUNTER_MAX_PENDING: int = 1000
+    
+    # Real-time notification stream (WebSocket/SSE)
+    NOTIFICATION_STREAM_QUEUE_SIZE: int = 100
+    NOTIFICATION_STREAM_HEARTBEAT_SECONDS: float = 15.0
+    
+    # Unread notification counters
+    NOTIFICATION_COUNTER_RECONCILE_INTERVAL_SECONDS: float = 3600.0
+    # Archived notifications are deleted by a TTL index after this many days
+    NOTIFICATION_ARCHIVE_RETENTION_DAYS: int = 90
+    
+    # Notification dispatch queue ("memory" writes from an in-process worker,
+    # "celery" hands batches to the Celery worker in app/worker.py)
+    NOTIFICATION_DISPATCH_BACKEND: str = "memory"
+    NOTIFICATION_QUEUE_MAX_SIZE: int = 10000
+    NOTIFICATION_BATCH_SIZE: int = 100
+    NOTIFICATION_BATCH_WAIT_SECONDS: float = 0.05
+    NOTIFICATION_DISPATCH_MAX_RETRIES: int = 3
+    NOTIFICATION_RETRY_DELAY_SECONDS: float = 0.5
+    CELERY_BROKER_URL: Optional[str] = None  # defaults to REDIS_URL
+    
+    # Locale used for email and notification templates without a translation
+    DEFAULT_LOCALE: str = "en"
     
     # Environment
     ENVIRONMENT: str = "development"
@@ -53,6 +97,50 @@ class Settings(BaseSettings):
 
     # OpenAI / Twilio
     OPENAI_API_KEY: Optional[str] = None
+    # Point at scripts/mock_openai.py (http://localhost:8001/v1) for local testing
+    OPENAI_BASE_URL: str = "https://api.openai.com/v1"
+    OPENAI_CHAT_MODEL: str = "gpt-3.5-turbo"
+    OPENAI_TIMEOUT_SECONDS: float = 30.0
+    OPENAI_MAX_CONNECTIONS: int = 20
+    # LLM gateway limits (app/services/llm_client.py)
+    LLM_MAX_CONCURRENCY: int = 16
+    LLM_MAX_CONCURRENCY_PER_USER: int = 2
+    LLM_MAX_RETRIES: int = 3
+    LLM_RETRY_DELAY_SECONDS: float = 0.5
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0
+    LLM_USAGE_FLUSH_INTERVAL_SECONDS: float = 60.0
+    # Embedding cache and micro-batching (app/services/embedding_service.py)
+    EMBEDDING_MODEL: str = "text-embedding-3-small"
+    EMBEDDING_CACHE_SIZE: int = 2000
+    EMBEDDING_BATCH_SIZE: int = 100
+    EMBEDDING_BATCH_WAIT_SECONDS: float = 0.01
+    # Semantic cache of AI chat answers (app/services/semantic_cache.py)
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_THRESHOLD: float = 0.92
+    SEMANTIC_CACHE_TTL_SECONDS: float = 86400
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 1000
+    # Answers are shared between users, so only short prompts without contact details are cached
+    SEMANTIC_CACHE_MAX_PROMPT_CHARS: int = 200
+    
+    # Resume parsing process pool (app/services/resume_parser.py)
+    RESUME_PARSER_WORKERS: int = 2
+    RESUME_PARSE_TIMEOUT_SECONDS: float = 20.0
+    RESUME_PARSER_PAGES_PER_WORKER: int = 8
+    RESUME_PARSE_CACHE_TTL_DAYS: int = 30
+    # Resume PDF rendering process pool (app/services/pdf_renderer.py)
+    PDF_RENDER_WORKERS: int = 2
+    PDF_RENDER_TIMEOUT_SECONDS: float = 30.0
+    # Rendered PDFs, keyed by resume data (app/services/pdf_cache.py)
+    PDF_CACHE_ENABLED: bool = True
+    PDF_CACHE_DIR: str = "cache/pdfs"
+    PDF_CACHE_TTL_DAYS: int = 7
+    # Google Drive API (app/services/google_drive_service.py); point at
+    # scripts/mock_google_drive.py (http://localhost:8002) for local testing
+    GOOGLE_DRIVE_API_URL: str = "https://www.googleapis.com"
+    GOOGLE_DRIVE_TIMEOUT_SECONDS: float = 30.0
+    # Type-ahead suggestion indexes, rebuilt from MongoDB (app/services/autocomplete.py)
+    AUTOCOMPLETE_REFRESH_MINUTES: int = 30
     TWILIO_ACCOUNT_SID: Optional[str] = None
     TWILIO_AUTH_TOKEN: Optional[str] = None
     TWILIO_VERIFY_SID: Optional[str] = None
@@ -62,6 +150,9 @@ class Settings(BaseSettings):
     # MongoDB
     MONGODB_URI: str = "mongodb://localhost:27017"
     MONGODB_DB_NAME: str = "jobify"
+    # Apply pending non-destructive schema migrations when the API starts; one
+    # process at a time, under a lease lock in MongoDB
+    RUN_MIGRATIONS_ON_STARTUP: bool = True
 
     # ✅ This is what makes .env auto-load
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
@@ -49,6 +49,19 @@ def verify_token(token: str, token_type: str = "access") -> Optional[str]:
         return None
 
 
+def token_role(token: str) -> Optional[str]:
+    """Verify an access token and return its ``role`` claim, without a user lookup"""
+    try:
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+        if payload.get("sub") is None or payload.get("type") != "access":
+            return None
+        return payload.get("role")
+    except JWTError:
+        return None
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify password against hash"""
     return pwd_context.verify(plain_password, hashed_password)
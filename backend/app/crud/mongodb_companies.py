@@ -0,0 +1,114 @@
+import asyncio
+import re
+from typing import Any, Dict, List, Optional
+from motor.motor_asyncio import AsyncIOMotorCollection
+from app.db.mongodb import get_companies_collection
+from app.schemas.mongodb_schemas import search_terms
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Ranked search merges candidates in memory; deeper pages than this return nothing
+MAX_SEARCH_WINDOW = 1000
+
+
+def _prefix(term: str) -> re.Pattern:
+    # Anchored and case-sensitive over folded keys, so MongoDB turns it into an
+    # index range. Folded terms are word characters and single spaces, so there
+    # is nothing to escape.
+    return re.compile("^" + term)
+
+
+class MongoDBCompanyCRUD:
+    """MongoDB CRUD operations for companies"""
+
+    def __init__(self):
+        self.companies_collection: Optional[AsyncIOMotorCollection] = None
+
+    def _get_companies_collection(self):
+        """Get companies collection with lazy initialization"""
+        if self.companies_collection is None:
+            self.companies_collection = get_companies_collection()
+        return self.companies_collection
+
+    @staticmethod
+    def _filters(industry: Optional[str], location: Optional[str]) -> List[Dict[str, Any]]:
+        """Filter groups on the ``search`` keys, combined with $and"""
+        filters = []
+        industry_key = " ".join(search_terms(industry))
+        if industry_key:
+            filters.append({"search.industry": _prefix(industry_key)})
+        # "San Francisco, CA": every part must start one of the company's locations
+        parts = [" ".join(search_terms(part)) for part in (location or "").split(",")]
+        parts = [part for part in parts if part]
+        if parts:
+            filters.append({"search.locations": {"$all": [_prefix(part) for part in parts]}})
+        return filters
+
+    @staticmethod
+    def _rank(company: Dict[str, Any], words: List[str]) -> tuple:
+        """Exact name, then name prefix, then word prefixes, then text score"""
+        name = " ".join(company.get("search", {}).get("words", []))
+        query = " ".join(words)
+        if name == query:
+            tier = 3
+        elif name.startswith(query):
+            tier = 2
+        elif company.get("prefix_match"):
+            tier = 1
+        else:
+            tier = 0
+        return (tier, company.get("score", 0.0), company.get("jobs_posted", 0))
+
+    async def search_companies(
+        self,
+        query: Optional[str] = None,
+        industry: Optional[str] = None,
+        location: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Search companies by name/description text, industry and location.
+
+        Filters are prefix matches on the folded ``search`` keys. A query
+        runs as two indexed lookups, a text search over name, industry and
+        description and a prefix match on every name word (so partly typed
+        names are found), and the union is ranked by _rank().
+        """
+        try:
+            collection = self._get_companies_collection()
+            filters = self._filters(industry, location)
+            words = search_terms(query)
+
+            if not words:
+                cursor = collection.find({"$and": filters} if filters else {})
+                cursor.sort("name", 1).skip(skip).limit(limit)
+                return [company async for company in cursor]
+
+            window = min(skip + limit, MAX_SEARCH_WINDOW)
+            text_cursor = collection.find(
+                # The folded words, so quotes and "-" in the query are not text operators
+                {"$and": [{"$text": {"$search": " ".join(words)}}, *filters]},
+                {"score": {"$meta": "textScore"}}
+            ).sort([("score", {"$meta": "textScore"})]).limit(window)
+            prefix_cursor = collection.find(
+                {"$and": [{"search.words": {"$all": [_prefix(word) for word in words]}}, *filters]}
+            ).limit(window)
+            text_matches, prefix_matches = await asyncio.gather(
+                text_cursor.to_list(length=window),
+                prefix_cursor.to_list(length=window)
+            )
+
+            companies = {company["_id"]: company for company in text_matches}
+            for company in prefix_matches:
+                companies.setdefault(company["_id"], company)["prefix_match"] = True
+            ranked = sorted(companies.values(), key=lambda company: self._rank(company, words), reverse=True)
+            return ranked[skip:skip + limit]
+        except Exception as e:
+            logger.error(f"Error searching companies: {e}")
+            raise
+
+
+def get_mongodb_company_crud() -> MongoDBCompanyCRUD:
+    """Get MongoDB company CRUD instance"""
+    return MongoDBCompanyCRUD()
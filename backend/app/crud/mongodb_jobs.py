@@ -1,12 +1,18 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReturnDocument, UpdateOne
 from app.db.mongodb import get_jobs_collection, get_job_applications_collection
 from app.schemas.mongodb_schemas import (
     MongoDBJob, MongoDBJobApplication, JobCreateRequest, 
-    JobUpdateRequest, JobSearchRequest, JobStatus, ApplicationStatus
+    JobUpdateRequest, JobSearchRequest, JobStatus, ApplicationStatus,
+    JOB_SCHEMA_VERSION
 )
+from app.services.response_cache import response_cache, FEATURED_JOBS, RECENT_JOBS, JOB_FEEDS
+from app.services.view_counter import view_counter
+from app.services.application_stats import application_stats_service
+from app.services.autocomplete import autocomplete_service
 import logging
 
 logger = logging.getLogger(__name__)
@@ -42,11 +48,13 @@ class MongoDBJobCRUD:
                 "company_id": company_id,
                 "company_name": company_name,
                 "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow()
+                "updated_at": datetime.utcnow(),
+                "schema_version": JOB_SCHEMA_VERSION
             })
             
             result = await self._get_jobs_collection().insert_one(job_dict)
             job_dict["_id"] = str(result.inserted_id)
+            autocomplete_service.index_job(job_dict)
             
             return MongoDBJob(**job_dict)
         except Exception as e:
@@ -56,7 +64,7 @@ class MongoDBJobCRUD:
     async def get_job_by_id(self, job_id: str) -> Optional[MongoDBJob]:
         """Get a job by ID"""
         try:
-            job_doc = await self.jobs_collection.find_one({"_id": ObjectId(job_id)})
+            job_doc = await self._get_jobs_collection().find_one({"_id": ObjectId(job_id)})
             if job_doc:
                 job_doc["_id"] = str(job_doc["_id"])
                 return MongoDBJob(**job_doc)
@@ -65,10 +73,17 @@ class MongoDBJobCRUD:
             logger.error(f"Error getting job by ID: {e}")
             raise
     
+    async def _reload_job(self, job_id: str) -> Optional[MongoDBJob]:
+        """Get a job after a write and refresh its autocomplete terms"""
+        job = await self.get_job_by_id(job_id)
+        if job is not None:
+            autocomplete_service.index_job(job.dict(by_alias=True))
+        return job
+    
     async def get_jobs_by_employer(self, employer_id: str, skip: int = 0, limit: int = 20) -> List[MongoDBJob]:
         """Get all jobs by an employer"""
         try:
-            cursor = self.jobs_collection.find({"employer_id": employer_id})
+            cursor = self._get_jobs_collection().find({"employer_id": employer_id})
             cursor.skip(skip).limit(limit).sort("created_at", -1)
             
             jobs = []
@@ -91,13 +106,14 @@ class MongoDBJobCRUD:
             if update_data.get("status") == JobStatus.PUBLISHED:
                 update_data["published_at"] = datetime.utcnow()
             
-            result = await self.jobs_collection.update_one(
+            result = await self._get_jobs_collection().update_one(
                 {"_id": ObjectId(job_id)},
                 {"$set": update_data}
             )
             
             if result.modified_count > 0:
-                return await self.get_job_by_id(job_id)
+                await response_cache.invalidate(JOB_FEEDS)
+                return await self._reload_job(job_id)
             return None
         except Exception as e:
             logger.error(f"Error updating job: {e}")
@@ -106,7 +122,10 @@ class MongoDBJobCRUD:
     async def delete_job(self, job_id: str) -> bool:
         """Delete a job posting"""
         try:
-            result = await self.jobs_collection.delete_one({"_id": ObjectId(job_id)})
+            result = await self._get_jobs_collection().delete_one({"_id": ObjectId(job_id)})
+            if result.deleted_count > 0:
+                await response_cache.invalidate(JOB_FEEDS)
+                autocomplete_service.remove_job(job_id)
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error deleting job: {e}")
@@ -121,13 +140,14 @@ class MongoDBJobCRUD:
                 "updated_at": datetime.utcnow()
             }
             
-            result = await self.jobs_collection.update_one(
+            result = await self._get_jobs_collection().update_one(
                 {"_id": ObjectId(job_id)},
                 {"$set": update_data}
             )
             
             if result.modified_count > 0:
-                return await self.get_job_by_id(job_id)
+                await response_cache.invalidate(JOB_FEEDS)
+                return await self._reload_job(job_id)
             return None
         except Exception as e:
             logger.error(f"Error publishing job: {e}")
@@ -141,13 +161,14 @@ class MongoDBJobCRUD:
                 "updated_at": datetime.utcnow()
             }
             
-            result = await self.jobs_collection.update_one(
+            result = await self._get_jobs_collection().update_one(
                 {"_id": ObjectId(job_id)},
                 {"$set": update_data}
             )
             
             if result.modified_count > 0:
-                return await self.get_job_by_id(job_id)
+                await response_cache.invalidate(JOB_FEEDS)
+                return await self._reload_job(job_id)
             return None
         except Exception as e:
             logger.error(f"Error closing job: {e}")
@@ -189,13 +210,13 @@ class MongoDBJobCRUD:
                 query["company_id"] = search_request.company_id
             
             # Count total results
-            total = await self.jobs_collection.count_documents(query)
+            total = await self._get_jobs_collection().count_documents(query)
             
             # Get paginated results
             skip = (search_request.page - 1) * search_request.limit
             sort_order = -1 if search_request.sort_order == "desc" else 1
             
-            cursor = self.jobs_collection.find(query)
+            cursor = self._get_jobs_collection().find(query)
             cursor.skip(skip).limit(search_request.limit).sort(search_request.sort_by, sort_order)
             
             jobs = []
@@ -215,53 +236,116 @@ class MongoDBJobCRUD:
             raise
     
     async def increment_job_views(self, job_id: str) -> bool:
-        """Increment job view count"""
+        """Increment job view count (buffered and written in batches)"""
         try:
-            result = await self.jobs_collection.update_one(
-                {"_id": ObjectId(job_id)},
-                {"$inc": {"views_count": 1}}
-            )
-            return result.modified_count > 0
+            await view_counter.record(job_id)
+            return True
         except Exception as e:
             logger.error(f"Error incrementing job views: {e}")
             raise
     
     async def get_featured_jobs(self, limit: int = 10) -> List[MongoDBJob]:
-        """Get featured jobs"""
+        """Get featured jobs (served from the response cache)"""
         try:
-            cursor = self.jobs_collection.find({
-                "status": JobStatus.PUBLISHED,
-                "is_featured": True
-            }).sort("created_at", -1).limit(limit)
-            
-            jobs = []
-            async for job_doc in cursor:
-                job_doc["_id"] = str(job_doc["_id"])
-                jobs.append(MongoDBJob(**job_doc))
-            
-            return jobs
+            async def load():
+                cursor = self._get_jobs_collection().find({
+                    "status": JobStatus.PUBLISHED,
+                    "is_featured": True
+                }).sort("created_at", -1).limit(limit)
+                
+                docs = []
+                async for job_doc in cursor:
+                    job_doc["_id"] = str(job_doc["_id"])
+                    docs.append(job_doc)
+                return docs
+            
+            docs = await response_cache.get_or_set(FEATURED_JOBS, {"limit": limit}, load)
+            return [MongoDBJob(**job_doc) for job_doc in docs]
         except Exception as e:
             logger.error(f"Error getting featured jobs: {e}")
             raise
     
     async def get_recent_jobs(self, limit: int = 20) -> List[MongoDBJob]:
-        """Get recent published jobs"""
+        """Get recent published jobs (served from the response cache)"""
         try:
-            cursor = self.jobs_collection.find({
-                "status": JobStatus.PUBLISHED
-            }).sort("published_at", -1).limit(limit)
-            
-            jobs = []
-            async for job_doc in cursor:
-                job_doc["_id"] = str(job_doc["_id"])
-                jobs.append(MongoDBJob(**job_doc))
-            
-            return jobs
+            async def load():
+                cursor = self._get_jobs_collection().find({
+                    "status": JobStatus.PUBLISHED
+                }).sort("published_at", -1).limit(limit)
+                
+                docs = []
+                async for job_doc in cursor:
+                    job_doc["_id"] = str(job_doc["_id"])
+                    docs.append(job_doc)
+                return docs
+            
+            docs = await response_cache.get_or_set(RECENT_JOBS, {"limit": limit}, load)
+            return [MongoDBJob(**job_doc) for job_doc in docs]
         except Exception as e:
             logger.error(f"Error getting recent jobs: {e}")
             raise
 
 
+async def write_status_changes(
+    applications_collection,
+    applications: List[Dict[str, Any]],
+    update_data: Dict[str, Any]
+) -> Tuple[List[Dict[str, Any]], Dict[str, Optional[Dict[str, Any]]]]:
+    """Apply ``update_data`` to applications still in the status they were read with.
+
+    Sends one ``bulk_write`` of per-application updates, each guarded by the
+    status read earlier, so an application changed by a concurrent request
+    is left alone. Returns the applications that were updated and, for the
+    others, the current document (None if it was deleted).
+    """
+    if not applications:
+        return [], {}
+    # A bulk result only has totals. When some rows were missed, the ones this
+    # request wrote are told apart by its updated_at, truncated to the
+    # millisecond MongoDB stores so it compares equal when read back.
+    updated_at = update_data.get("updated_at") or datetime.utcnow()
+    updated_at = updated_at.replace(microsecond=updated_at.microsecond // 1000 * 1000)
+    update_data = {**update_data, "updated_at": updated_at}
+    result = await applications_collection.bulk_write([
+        UpdateOne(
+            {"_id": application["_id"], "status": application.get("status")},
+            {"$set": update_data}
+        )
+        for application in applications
+    ], ordered=False)
+    if result.matched_count == len(applications):
+        return list(applications), {}
+
+    current = {}
+    async for app_doc in applications_collection.find(
+        {"_id": {"$in": [application["_id"] for application in applications]}},
+        {"status": 1, "updated_at": 1}
+    ):
+        current[app_doc["_id"]] = app_doc
+    written, skipped = [], {}
+    for application in applications:
+        app_doc = current.get(application["_id"])
+        if (
+            app_doc is not None
+            and app_doc.get("status") == update_data["status"]
+            and app_doc.get("updated_at") == updated_at
+        ):
+            written.append(application)
+        else:
+            skipped[str(application["_id"])] = app_doc
+    return written, skipped
+
+
+def skipped_status_result(app_id: str, app_doc: Optional[Dict[str, Any]], status: str) -> Dict[str, Any]:
+    """Per-id result for an application write_status_changes() left alone"""
+    if app_doc is None:
+        return {"application_id": app_id, "result": "not_found"}
+    current_status = app_doc.get("status", ApplicationStatus.PENDING)
+    if current_status == status:
+        return {"application_id": app_id, "result": "unchanged", "status": status}
+    return {"application_id": app_id, "result": "conflict", "status": current_status}
+
+
 class MongoDBJobApplicationCRUD:
     """MongoDB CRUD operations for job applications"""
     
@@ -295,6 +379,10 @@ class MongoDBJobApplicationCRUD:
                 {"_id": ObjectId(application_data["job_id"])},
                 {"$inc": {"applications_count": 1}}
             )
+            await application_stats_service.record_application(
+                application_data["job_id"],
+                status=application_data.get("status", ApplicationStatus.PENDING)
+            )
             
             return MongoDBJobApplication(**application_data)
         except Exception as e:
@@ -304,7 +392,7 @@ class MongoDBJobApplicationCRUD:
     async def get_application_by_id(self, application_id: str) -> Optional[MongoDBJobApplication]:
         """Get an application by ID"""
         try:
-            app_doc = await self.applications_collection.find_one({"_id": ObjectId(application_id)})
+            app_doc = await self._get_applications_collection().find_one({"_id": ObjectId(application_id)})
             if app_doc:
                 app_doc["_id"] = str(app_doc["_id"])
                 return MongoDBJobApplication(**app_doc)
@@ -316,7 +404,7 @@ class MongoDBJobApplicationCRUD:
     async def get_applications_by_job(self, job_id: str, skip: int = 0, limit: int = 20) -> List[MongoDBJobApplication]:
         """Get all applications for a job"""
         try:
-            cursor = self.applications_collection.find({"job_id": job_id})
+            cursor = self._get_applications_collection().find({"job_id": job_id})
             cursor.skip(skip).limit(limit).sort("created_at", -1)
             
             applications = []
@@ -332,7 +420,7 @@ class MongoDBJobApplicationCRUD:
     async def get_applications_by_applicant(self, applicant_id: str, skip: int = 0, limit: int = 20) -> List[MongoDBJobApplication]:
         """Get all applications by an applicant"""
         try:
-            cursor = self.applications_collection.find({"applicant_id": applicant_id})
+            cursor = self._get_applications_collection().find({"applicant_id": applicant_id})
             cursor.skip(skip).limit(limit).sort("created_at", -1)
             
             applications = []
@@ -357,22 +445,123 @@ class MongoDBJobApplicationCRUD:
             if notes:
                 update_data["interview_notes"] = notes
             
-            result = await self.applications_collection.update_one(
+            previous = await self._get_applications_collection().find_one_and_update(
                 {"_id": ObjectId(application_id)},
-                {"$set": update_data}
+                {"$set": update_data},
+                return_document=ReturnDocument.BEFORE
             )
             
-            if result.modified_count > 0:
-                return await self.get_application_by_id(application_id)
-            return None
+            if previous is None:
+                return None
+            
+            await application_stats_service.record_status_change(
+                previous["job_id"],
+                previous.get("status", ApplicationStatus.PENDING),
+                status
+            )
+            
+            previous.update(update_data)
+            previous["_id"] = str(previous["_id"])
+            return MongoDBJobApplication(**previous)
         except Exception as e:
             logger.error(f"Error updating application status: {e}")
             raise
     
+    async def bulk_update_application_status(
+        self,
+        application_ids: List[str],
+        status: ApplicationStatus,
+        notes: Optional[str] = None,
+        employer_id: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+        """Update the status of many applications with a single ``bulk_write``.
+
+        When ``employer_id`` is given, applications for jobs owned by someone
+        else are reported as ``forbidden`` and left untouched. Applications
+        whose status changed since they were read are reported as
+        ``unchanged`` or ``conflict``. Returns the per-id results in request
+        order and the ``(application, job)`` pairs that were updated, with
+        the application as it was before the update.
+        """
+        try:
+            application_ids = list(dict.fromkeys(application_ids))
+            results: Dict[str, Dict[str, Any]] = {}
+            object_ids = []
+            for app_id in application_ids:
+                if ObjectId.is_valid(app_id):
+                    object_ids.append(ObjectId(app_id))
+                else:
+                    results[app_id] = {"application_id": app_id, "result": "invalid_id"}
+
+            applications = {}
+            async for app_doc in self._get_applications_collection().find(
+                {"_id": {"$in": object_ids}},
+                {"job_id": 1, "applicant_id": 1, "status": 1}
+            ):
+                applications[str(app_doc["_id"])] = app_doc
+
+            job_ids = {app_doc.get("job_id") for app_doc in applications.values()}
+            jobs = {}
+            async for job_doc in self._get_jobs_collection().find(
+                {"_id": {"$in": [ObjectId(job_id) for job_id in job_ids if ObjectId.is_valid(str(job_id))]}},
+                {"title": 1, "company_name": 1, "employer_id": 1}
+            ):
+                jobs[str(job_doc["_id"])] = job_doc
+
+            to_update = []
+            for app_id in application_ids:
+                if app_id in results:
+                    continue
+                app_doc = applications.get(app_id)
+                if not app_doc:
+                    results[app_id] = {"application_id": app_id, "result": "not_found"}
+                    continue
+                job_doc = jobs.get(app_doc.get("job_id"), {})
+                if employer_id is not None and job_doc.get("employer_id") != employer_id:
+                    results[app_id] = {"application_id": app_id, "result": "forbidden"}
+                elif app_doc.get("status", ApplicationStatus.PENDING) == status:
+                    results[app_id] = {"application_id": app_id, "result": "unchanged", "status": status}
+                else:
+                    to_update.append(app_doc)
+
+            updated = []
+            if to_update:
+                update_data = {
+                    "status": status,
+                    "updated_at": datetime.utcnow()
+                }
+                if notes:
+                    update_data["interview_notes"] = notes
+
+                written, skipped = await write_status_changes(
+                    self._get_applications_collection(), to_update, update_data
+                )
+                for app_id, app_doc in skipped.items():
+                    results[app_id] = skipped_status_result(app_id, app_doc, status)
+                for app_doc in written:
+                    job_doc = jobs.get(app_doc.get("job_id"), {})
+                    updated.append((app_doc, job_doc))
+                    results[str(app_doc["_id"])] = {
+                        "application_id": str(app_doc["_id"]),
+                        "result": "updated",
+                        "previous_status": app_doc.get("status", ApplicationStatus.PENDING),
+                        "status": status
+                    }
+                await application_stats_service.record_status_changes(
+                    (app_doc.get("job_id"), job_doc.get("employer_id"),
+                     app_doc.get("status", ApplicationStatus.PENDING), status)
+                    for app_doc, job_doc in updated
+                )
+
+            return [results[app_id] for app_id in application_ids], updated
+        except Exception as e:
+            logger.error(f"Error bulk updating application status: {e}")
+            raise
+
     async def check_application_exists(self, job_id: str, applicant_id: str) -> bool:
         """Check if an application already exists"""
         try:
-            count = await self.applications_collection.count_documents({
+            count = await self._get_applications_collection().count_documents({
                 "job_id": job_id,
                 "applicant_id": applicant_id
             })
@@ -17,7 +17,12 @@ applications_collection = database.applications
 companies_collection = database.companies
 users_collection = database.users
 notifications_collection = database.notifications
+notification_counters_collection = database.notification_counters
+notification_dead_letters_collection = database.notification_dead_letters
 resumes_collection = database.resumes
+llm_usage_collection = database.llm_usage
+embeddings_collection = database.embeddings
+parsed_resumes_collection = database.parsed_resumes
 
 def get_database():
     """Get MongoDB database instance"""
@@ -51,10 +56,30 @@ def get_notifications_collection():
     """Get notifications collection"""
     return notifications_collection
 
+def get_notification_counters_collection():
+    """Get per-user unread notification counters collection"""
+    return notification_counters_collection
+
+def get_notification_dead_letters_collection():
+    """Get notifications that could not be delivered"""
+    return notification_dead_letters_collection
+
 def get_resumes_collection():
     """Get resumes collection"""
     return resumes_collection
 
+def get_llm_usage_collection():
+    """Get daily LLM token usage collection"""
+    return llm_usage_collection
+
+def get_embeddings_collection():
+    """Get cached text embeddings collection"""
+    return embeddings_collection
+
+def get_parsed_resumes_collection():
+    """Get cached resume parse results collection"""
+    return parsed_resumes_collection
+
 async def check_mongodb_health():
     """Check MongoDB connection health"""
     try:
@@ -0,0 +1,11 @@
+"""
+Versioned MongoDB schema migrations.
+
+Run pending migrations with ``python scripts/migrate.py up`` from the backend
+directory, or let the API apply the non-destructive ones on startup.
+"""
+from .base import Migration
+from .runner import MigrationRunner
+from .versions import MIGRATIONS
+
+__all__ = ["Migration", "MigrationRunner", "MIGRATIONS"]
@@ -0,0 +1,54 @@
+"""
+Base class for MongoDB data migrations
+"""
+from typing import Any, Dict, List, Optional
+from pymongo.operations import DeleteOne, UpdateOne
+
+
+class Migration:
+    """A single versioned migration over one collection.
+
+    Subclasses set ``version``, ``name`` and ``collection``, narrow the
+    documents to visit with ``query`` and return a write operation (or None to
+    leave the document untouched) from ``transform``. Migrations that rebuild
+    a collection as a whole set ``batched = False`` and implement
+    ``apply_once`` instead.
+    """
+
+    version: int = 0
+    name: str = ""
+    collection: str = ""
+    description: str = ""
+
+    # Destructive migrations (deletes) only run when explicitly allowed
+    destructive: bool = False
+    # Visit documents in checkpointed batches; False runs apply_once() instead
+    batched: bool = True
+
+    def query(self) -> Dict[str, Any]:
+        """Filter selecting the documents this migration still has to visit"""
+        return {}
+
+    def transform(self, doc: Dict[str, Any]) -> Optional[Any]:
+        """Return an UpdateOne/DeleteOne for ``doc`` or None to skip it"""
+        raise NotImplementedError
+
+    async def after_batch(self, db, docs: List[Dict[str, Any]], operations: List[Any]) -> None:
+        """Hook run after each batch has been written (e.g. for cascades)"""
+        return None
+
+    async def apply_once(self, db) -> int:
+        """Whole migration of an unbatched migration; returns the documents written"""
+        raise NotImplementedError
+
+    # Helpers for building operations
+    @staticmethod
+    def set_fields(doc: Dict[str, Any], fields: Dict[str, Any]) -> UpdateOne:
+        return UpdateOne({"_id": doc["_id"]}, {"$set": fields})
+
+    @staticmethod
+    def delete(doc: Dict[str, Any]) -> DeleteOne:
+        return DeleteOne({"_id": doc["_id"]})
+
+    def __repr__(self) -> str:
+        return f"<Migration {self.version:04d} {self.name}>"
@@ -0,0 +1,263 @@
+"""
+Resumable batch runner for MongoDB migrations
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+from pymongo.errors import DuplicateKeyError
+
+from .base import Migration
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_COLLECTION = "schema_migrations"
+LOCK_COLLECTION = "schema_migrations_lock"
+LOCK_ID = "migrations"
+# A lock not renewed for this long belongs to a runner that died
+LOCK_LEASE_SECONDS = 300
+# How often a runner waiting for the lock checks it again
+LOCK_POLL_SECONDS = 2
+
+ProgressCallback = Callable[[Migration, int, int], None]
+
+
+class MigrationRunner:
+    """Apply migrations in version order, checkpointing after every batch.
+
+    Progress for each migration is stored in the ``schema_migrations``
+    collection (keyed by version) together with the ``_id`` of the last
+    document visited, so an interrupted run continues where it stopped.
+
+    Runners in different processes (API workers starting together, or
+    scripts/migrate.py) take a lease lock with acquire_lock() first. The
+    lease is renewed after every batch, dry runs included, and expires
+    after LOCK_LEASE_SECONDS if its holder dies.
+    """
+
+    def __init__(
+        self,
+        db,
+        migrations: List[Migration],
+        batch_size: int = 500,
+        progress_callback: Optional[ProgressCallback] = None
+    ):
+        self.db = db
+        self.migrations = sorted(migrations, key=lambda m: m.version)
+        self.batch_size = batch_size
+        self.progress_callback = progress_callback
+        self.state_collection = db[MIGRATIONS_COLLECTION]
+        self.lock_collection = db[LOCK_COLLECTION]
+        self._lock_owner: Optional[str] = None
+
+    async def acquire_lock(self, owner: str, wait: bool = False) -> bool:
+        """Take the migration lock.
+
+        Returns False if another runner holds an unexpired lease, or with
+        ``wait`` keeps trying until that runner releases the lock or its
+        lease expires.
+        """
+        while not await self._try_lock(owner):
+            if not wait:
+                return False
+            await asyncio.sleep(LOCK_POLL_SECONDS)
+        self._lock_owner = owner
+        return True
+
+    async def _try_lock(self, owner: str) -> bool:
+        now = datetime.utcnow()
+        try:
+            # Matches only an expired lock; otherwise the upsert's insert hits the existing _id
+            await self.lock_collection.update_one(
+                {"_id": LOCK_ID, "expires_at": {"$lt": now}},
+                {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=LOCK_LEASE_SECONDS)}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            return False
+        return True
+
+    async def release_lock(self) -> None:
+        """Give up the migration lock if this runner holds it"""
+        if self._lock_owner is not None:
+            await self.lock_collection.delete_one({"_id": LOCK_ID, "owner": self._lock_owner})
+            self._lock_owner = None
+
+    async def _renew_lock(self) -> None:
+        if self._lock_owner is None:
+            return
+        result = await self.lock_collection.update_one(
+            {"_id": LOCK_ID, "owner": self._lock_owner},
+            {"$set": {"expires_at": datetime.utcnow() + timedelta(seconds=LOCK_LEASE_SECONDS)}}
+        )
+        if result.matched_count == 0:
+            self._lock_owner = None
+            raise RuntimeError("Lost the migration lock to another runner")
+
+    async def status(self) -> List[Dict[str, Any]]:
+        """Return the recorded state of every known migration"""
+        states = {}
+        async for state in self.state_collection.find({}):
+            states[state["_id"]] = state
+
+        result = []
+        for migration in self.migrations:
+            state = states.get(migration.version, {})
+            result.append({
+                "version": migration.version,
+                "name": migration.name,
+                "collection": migration.collection,
+                "destructive": migration.destructive,
+                "status": state.get("status", "pending"),
+                "scanned": state.get("scanned", 0),
+                "modified": state.get("modified", 0),
+                "completed_at": state.get("completed_at")
+            })
+        return result
+
+    async def pending(self, allow_destructive: bool = False) -> List[Migration]:
+        """Migrations that have not completed yet"""
+        completed = set()
+        async for state in self.state_collection.find({"status": "completed"}, {"_id": 1}):
+            completed.add(state["_id"])
+
+        return [
+            m for m in self.migrations
+            if m.version not in completed and (allow_destructive or not m.destructive)
+        ]
+
+    async def run(
+        self,
+        target: Optional[int] = None,
+        allow_destructive: bool = False,
+        dry_run: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Apply pending migrations up to and including ``target``"""
+        results = []
+        for migration in await self.pending(allow_destructive=allow_destructive):
+            if target is not None and migration.version > target:
+                break
+            results.append(await self.apply(migration, dry_run=dry_run))
+        return results
+
+    async def apply(self, migration: Migration, dry_run: bool = False) -> Dict[str, Any]:
+        """Apply a single migration, resuming from its last checkpoint"""
+        collection = self.db[migration.collection]
+        state = await self.state_collection.find_one({"_id": migration.version}) or {}
+        if state.get("status") == "completed":
+            logger.info(f"{migration!r} already applied")
+            return state
+        if not migration.batched:
+            return await self._apply_once(migration, dry_run)
+
+        last_id = state.get("last_id")
+        scanned = state.get("scanned", 0)
+        modified = state.get("modified", 0)
+
+        base_query = migration.query()
+        total = scanned + await collection.count_documents(self._after(base_query, last_id))
+
+        if last_id is not None:
+            logger.info(f"Resuming {migration!r} after _id {last_id} ({scanned}/{total})")
+        else:
+            logger.info(f"Applying {migration!r}: {total} documents to scan")
+
+        if not dry_run:
+            await self._save_state(migration, {
+                "status": "running",
+                "started_at": state.get("started_at") or datetime.utcnow()
+            })
+
+        while True:
+            cursor = collection.find(self._after(base_query, last_id)).sort("_id", 1).limit(self.batch_size)
+            docs = await cursor.to_list(length=self.batch_size)
+            if not docs:
+                break
+
+            operations = []
+            for doc in docs:
+                operation = migration.transform(doc)
+                if operation is not None:
+                    operations.append(operation)
+
+            if operations and not dry_run:
+                result = await collection.bulk_write(operations, ordered=False)
+                modified += result.modified_count + result.deleted_count
+                await migration.after_batch(self.db, docs, operations)
+            elif dry_run:
+                modified += len(operations)
+
+            scanned += len(docs)
+            last_id = docs[-1]["_id"]
+            await self._renew_lock()
+
+            if not dry_run:
+                await self._save_state(migration, {
+                    "last_id": last_id,
+                    "scanned": scanned,
+                    "modified": modified
+                })
+            self._report(migration, scanned, total)
+
+            if len(docs) < self.batch_size:
+                break
+
+        summary = {
+            "version": migration.version,
+            "name": migration.name,
+            "scanned": scanned,
+            "modified": modified,
+            "dry_run": dry_run
+        }
+        if not dry_run:
+            await self._save_state(migration, {
+                "status": "completed",
+                "completed_at": datetime.utcnow()
+            })
+        logger.info(f"{'Checked' if dry_run else 'Applied'} {migration!r}: {scanned} scanned, {modified} changed")
+        return summary
+
+    async def _apply_once(self, migration: Migration, dry_run: bool) -> Dict[str, Any]:
+        if dry_run:
+            logger.info(f"Would apply {migration!r}")
+            modified = 0
+        else:
+            logger.info(f"Applying {migration!r}")
+            await self._save_state(migration, {"status": "running", "started_at": datetime.utcnow()})
+            modified = await migration.apply_once(self.db)
+            await self._save_state(migration, {
+                "status": "completed",
+                "modified": modified,
+                "completed_at": datetime.utcnow()
+            })
+            logger.info(f"Applied {migration!r}: {modified} documents written")
+        return {
+            "version": migration.version,
+            "name": migration.name,
+            "scanned": 0,
+            "modified": modified,
+            "dry_run": dry_run
+        }
+
+    @staticmethod
+    def _after(query: Dict[str, Any], last_id: Any) -> Dict[str, Any]:
+        """Restrict ``query`` to documents after the checkpoint"""
+        if last_id is None:
+            return query
+        return {"$and": [query, {"_id": {"$gt": last_id}}]}
+
+    async def _save_state(self, migration: Migration, fields: Dict[str, Any]) -> None:
+        fields.update({"name": migration.name, "collection": migration.collection})
+        await self.state_collection.update_one(
+            {"_id": migration.version},
+            {"$set": fields},
+            upsert=True
+        )
+
+    def _report(self, migration: Migration, scanned: int, total: int) -> None:
+        if self.progress_callback:
+            self.progress_callback(migration, scanned, total)
+        else:
+            percent = int(scanned * 100 / total) if total else 100
+            logger.info(f"{migration!r}: {scanned}/{total} ({percent}%)")
@@ -0,0 +1,127 @@
+"""
+Registered MongoDB migrations, in version order
+"""
+from typing import Any, Dict, List, Optional
+import logging
+
+from app.schemas.mongodb_schemas import (
+    COMPANY_SCHEMA_VERSION, company_search_keys, normalize_job_type, normalize_work_mode
+)
+from .base import Migration
+
+logger = logging.getLogger(__name__)
+
+
+class NormalizeJobEnums(Migration):
+    """Rewrite legacy job_type/work_mode spellings to the enum values"""
+
+    version = 1
+    name = "normalize_job_enums"
+    collection = "jobs"
+    description = "Normalize job_type/work_mode to JobType/WorkMode values and stamp schema_version"
+
+    def query(self) -> Dict[str, Any]:
+        return {"$or": [
+            {"schema_version": {"$exists": False}},
+            {"schema_version": {"$lt": self.version}}
+        ]}
+
+    def transform(self, doc: Dict[str, Any]) -> Optional[Any]:
+        fields = {"schema_version": self.version}
+        if doc.get("job_type"):
+            fields["job_type"] = normalize_job_type(doc["job_type"])
+        if doc.get("work_mode"):
+            fields["work_mode"] = normalize_work_mode(doc["work_mode"])
+        return self.set_fields(doc, fields)
+
+
+# Markers of test data, carried over from the old cleanup_dummy_jobs.py and
+# cleanup_specific_jobs.py scripts. The title pattern matches whole titles
+# only ("Test", "Dummy Job"), so real postings like "Test Engineer" stay.
+DUMMY_TITLE_PATTERN = r"^\s*(?:test|dummy|sample|example|fake|mock|placeholder)(?:\s+job)?\s*$"
+DUMMY_EMPLOYER_NAMES = [None, "", "null", "Anonymous", "Anonymous Employer"]
+DUMMY_JOB_TITLES = ["My Job", "Test Job", "Sample Job", "Dummy Job", "Example Job"]
+
+
+class RemoveDummyJobs(Migration):
+    """Delete jobs that look like test data, together with their applications.
+
+    Preview with ``scripts/migrate.py up --allow-destructive --dry-run``; the
+    script asks for confirmation before deleting anything.
+    """
+
+    version = 2
+    name = "remove_dummy_jobs"
+    collection = "jobs"
+    description = "Delete test/placeholder jobs and the applications submitted to them"
+    destructive = True
+
+    def query(self) -> Dict[str, Any]:
+        return {"$or": [
+            {"title": {"$in": DUMMY_JOB_TITLES}},
+            {"title": {"$regex": DUMMY_TITLE_PATTERN, "$options": "i"}},
+            # $in with None would also match jobs that have no such field
+            {"employer_name": {"$exists": True, "$in": DUMMY_EMPLOYER_NAMES}},
+            {"company_name": {"$exists": True, "$in": DUMMY_EMPLOYER_NAMES}}
+        ]}
+
+    def transform(self, doc: Dict[str, Any]) -> Optional[Any]:
+        logger.info(f"Dummy job {doc['_id']}: {doc.get('title', 'No title')} ({doc.get('employer_name')})")
+        return self.delete(doc)
+
+    async def after_batch(self, db, docs: List[Dict[str, Any]], operations: List[Any]) -> None:
+        # Every document selected by query() is deleted by transform()
+        deleted_ids = [str(doc["_id"]) for doc in docs]
+        # Applications have lived in both collections over time
+        for name in ("job_applications", "applications"):
+            result = await db[name].delete_many({"job_id": {"$in": deleted_ids}})
+            if result.deleted_count:
+                logger.info(f"Deleted {result.deleted_count} {name} for removed jobs")
+
+
+class AddCompanySearchKeys(Migration):
+    """Store the folded search keys that company search queries"""
+
+    version = 3
+    name = "add_company_search_keys"
+    collection = "companies"
+    description = "Add search.words/industry/locations to companies and stamp schema_version"
+
+    def query(self) -> Dict[str, Any]:
+        return {"$or": [
+            {"schema_version": {"$exists": False}},
+            {"schema_version": {"$lt": COMPANY_SCHEMA_VERSION}}
+        ]}
+
+    def transform(self, doc: Dict[str, Any]) -> Optional[Any]:
+        return self.set_fields(doc, {
+            "search": company_search_keys(doc),
+            "schema_version": COMPANY_SCHEMA_VERSION
+        })
+
+
+class BackfillApplicationStats(Migration):
+    """Seed the materialized application counts from the existing applications.
+
+    Status changes adjust the counters with $inc, so without a backfill the
+    counts of applications made before them would go negative.
+    """
+
+    version = 4
+    name = "backfill_application_stats"
+    collection = "application_stats"
+    description = "Rebuild per-job and per-employer application counts from the application collections"
+    batched = False
+
+    async def apply_once(self, db) -> int:
+        from app.services.application_stats import application_stats_service
+
+        return await application_stats_service.rebuild(db=db)
+
+
+MIGRATIONS: List[Migration] = [
+    NormalizeJobEnums(),
+    RemoveDummyJobs(),
+    AddCompanySearchKeys(),
+    BackfillApplicationStats(),
+]
@@ -1,8 +1,11 @@
 import os
+import socket
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import MongoClient
+from pymongo.errors import OperationFailure
 from typing import Optional
 import logging
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -72,10 +75,22 @@ async def create_indexes():
         await async_db.job_applications.create_index("status")
         await async_db.job_applications.create_index("created_at")
         
-        # Companies collection indexes
+        # Companies collection indexes: company search matches the folded
+        # keys under "search" by prefix and ranks full words by text score
         await async_db.companies.create_index("name")
-        await async_db.companies.create_index("industry")
-        await async_db.companies.create_index("location")
+        await async_db.companies.create_index("search.words")
+        await async_db.companies.create_index("search.industry")
+        await async_db.companies.create_index("search.locations")
+        await async_db.companies.create_index(
+            [("name", "text"), ("industry", "text"), ("description", "text")],
+            weights={"name": 10, "industry": 3, "description": 1},
+            name="company_search"
+        )
+        # Unanchored case-insensitive regexes never used these
+        existing = await async_db.companies.index_information()
+        for name in ("industry_1", "location_1"):
+            if name in existing:
+                await async_db.companies.drop_index(name)
         
         # Users collection indexes (for MongoDB-specific user data)
         await async_db.users.create_index("email")
@@ -83,9 +98,37 @@ async def create_indexes():
         await async_db.users.create_index("location")
         
         # Notifications collection indexes
-        await async_db.notifications.create_index("user_id")
-        await async_db.notifications.create_index("read")
+        await async_db.notifications.create_index([("user_id", 1), ("is_read", 1), ("created_at", -1)])
         await async_db.notifications.create_index("created_at")
+        # Archived notifications expire after the retention period
+        retention_seconds = settings.NOTIFICATION_ARCHIVE_RETENTION_DAYS * 86400
+        try:
+            await async_db.notifications.create_index("archived_at", expireAfterSeconds=retention_seconds)
+        except OperationFailure:
+            # The retention period changed; update the existing TTL index in place
+            await async_db.command({
+                "collMod": "notifications",
+                "index": {"keyPattern": {"archived_at": 1}, "expireAfterSeconds": retention_seconds}
+            })
+        # Drop indexes superseded by the compound index above ("read" was
+        # never a field on notification documents)
+        existing = await async_db.notifications.index_information()
+        for name in ("read_1", "user_id_1", "user_id_1_is_read_1"):
+            if name in existing:
+                await async_db.notifications.drop_index(name)
+        
+        # LLM token usage: one document per user, model and day
+        await async_db.llm_usage.create_index([("user_id", 1), ("date", 1), ("model", 1)], unique=True)
+        
+        # Cached resume parse results expire (they hold personal data)
+        parse_cache_seconds = settings.RESUME_PARSE_CACHE_TTL_DAYS * 86400
+        try:
+            await async_db.parsed_resumes.create_index("created_at", expireAfterSeconds=parse_cache_seconds)
+        except OperationFailure:
+            await async_db.command({
+                "collMod": "parsed_resumes",
+                "index": {"keyPattern": {"created_at": 1}, "expireAfterSeconds": parse_cache_seconds}
+            })
         
         logger.info("MongoDB indexes created successfully")
         
@@ -93,6 +136,31 @@ async def create_indexes():
         logger.error(f"Failed to create indexes: {e}")
 
 
+async def apply_pending_migrations():
+    """Apply pending non-destructive schema migrations.
+
+    Only the process holding the migration lock runs them. Other API workers
+    starting at the same time wait for the lock instead of serving documents
+    that have not been migrated yet, then find nothing left to apply.
+    """
+    from app.db.migrations import MIGRATIONS, MigrationRunner
+    
+    runner = MigrationRunner(async_db, MIGRATIONS)
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    try:
+        if not await runner.acquire_lock(owner):
+            logger.info("Another process is applying migrations, waiting for it to finish")
+            await runner.acquire_lock(owner, wait=True)
+        try:
+            results = await runner.run()
+        finally:
+            await runner.release_lock()
+        for result in results:
+            logger.info(f"Applied migration {result['version']:04d} {result['name']}: {result['modified']} documents updated")
+    except Exception as e:
+        logger.error(f"Failed to apply migrations: {e}")
+
+
 def get_mongo_db():
     """Get MongoDB database instance."""
     return async_db
@@ -136,4 +204,11 @@ def get_notifications_collection():
     """Get notifications collection."""
     if async_db is None:
         raise RuntimeError("MongoDB not connected. Call connect_to_mongo() first.")
-    return async_db.notifications 
\ No newline at end of file
+    return async_db.notifications 
+
+
+def get_application_stats_collection():
+    """Get materialized application statistics collection."""
+    if async_db is None:
+        raise RuntimeError("MongoDB not connected. Call connect_to_mongo() first.")
+    return async_db.application_stats
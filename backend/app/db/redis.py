@@ -0,0 +1,34 @@
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Shared async Redis client, created lazily when REDIS_ENABLED is set
+redis_client = None
+
+
+def get_redis():
+    """Get the shared async Redis client, or None when Redis is disabled."""
+    global redis_client
+    
+    if not settings.REDIS_ENABLED:
+        return None
+    if redis_client is None:
+        try:
+            import redis.asyncio as aioredis
+            redis_client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+        except Exception as e:
+            logger.error(f"Failed to create Redis client: {e}")
+            return None
+    return redis_client
+
+
+async def close_redis_connection():
+    """Close the shared Redis client."""
+    global redis_client
+    
+    if redis_client is not None:
+        await redis_client.close()
+        redis_client = None
+        logger.info("Redis connection closed")
@@ -9,7 +9,20 @@ import logging
 import os
 from dotenv import load_dotenv
 from app.core.config import settings
-from app.db.mongodb import connect_to_mongo, close_mongo_connection
+from app.db.mongodb import connect_to_mongo, close_mongo_connection, apply_pending_migrations
+from app.db.redis import close_redis_connection
+from app.services.view_counter import view_counter
+from app.services.notification_broker import notification_broker
+from app.services.notification_counter import unread_counter
+from app.services.notification_dispatcher import notification_dispatcher
+from app.services.email import email_queue, mail_transport
+from app.services.templates import template_registry
+from app.services.llm_client import llm_client
+from app.services.resume_parser import resume_parser
+from app.services.pdf_renderer import pdf_renderer
+from app.services.pdf_cache import pdf_cache
+from app.services.google_drive_service import google_drive_service
+from app.services.autocomplete import autocomplete_service
 from app.api.v1.endpoints import (
     mongodb_jobs_clean, mongodb_users, mongodb_notifications, 
     mongodb_companies, health, auth, upload, ai_chat, resumes, simple_mongodb_jobs,
@@ -151,12 +164,40 @@ async def startup_event():
     logger.info("Starting Jobify API server...")
     await connect_to_mongo()
     logger.info("MongoDB connection established")
+    if settings.RUN_MIGRATIONS_ON_STARTUP:
+        await apply_pending_migrations()
+    template_registry.load()
+    view_counter.start()
+    notification_broker.start()
+    unread_counter.start()
+    notification_dispatcher.start()
+    email_queue.start()
+    llm_client.start()
+    resume_parser.start()
+    pdf_renderer.start()
+    pdf_cache.start()
+    google_drive_service.start()
+    autocomplete_service.start()
 
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down Jobify API server...")
+    # Write buffered view counts and queued notifications before the database connection goes away
+    await view_counter.stop()
+    await notification_dispatcher.stop()
+    await email_queue.stop()
+    await mail_transport.close()
+    await llm_client.stop()
+    resume_parser.stop()
+    pdf_renderer.stop()
+    await pdf_cache.stop()
+    await google_drive_service.stop()
+    await autocomplete_service.stop()
+    await notification_broker.stop()
+    await unread_counter.stop()
     await close_mongo_connection()
+    await close_redis_connection()
 
 # Root endpoint
 @app.get("/")
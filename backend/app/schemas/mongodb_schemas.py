@@ -2,6 +2,8 @@ from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
+import re
+import unicodedata
 
 
 class JobStatus(str, Enum):
@@ -34,6 +36,56 @@ class ApplicationStatus(str, Enum):
     ACCEPTED = "accepted"
 
 
+# Current shape of documents in the jobs collection. Bump this together with a
+# new migration in app/db/migrations/versions.py whenever stored values change.
+JOB_SCHEMA_VERSION = 1
+
+_WORK_MODE_ALIASES = {
+    "onsite": WorkMode.ON_SITE,
+    "on-site": WorkMode.ON_SITE,
+    "on site": WorkMode.ON_SITE,
+    "office": WorkMode.ON_SITE,
+    "in_office": WorkMode.ON_SITE,
+    "wfh": WorkMode.REMOTE,
+}
+
+_JOB_TYPE_ALIASES = {
+    "fulltime": JobType.FULL_TIME,
+    "full time": JobType.FULL_TIME,
+    "parttime": JobType.PART_TIME,
+    "part time": JobType.PART_TIME,
+    "contractor": JobType.CONTRACT,
+    "intern": JobType.INTERNSHIP,
+}
+
+
+def normalize_job_type(value: Optional[str]) -> Optional[str]:
+    """Map legacy job_type spellings (e.g. "full-time") onto JobType values"""
+    if not value:
+        return value
+    key = str(value).strip().lower()
+    if key in _JOB_TYPE_ALIASES:
+        return _JOB_TYPE_ALIASES[key].value
+    key = key.replace("-", "_").replace(" ", "_")
+    if key in JobType._value2member_map_:
+        return key
+    # Unknown values are kept as-is so no information is lost
+    return value
+
+
+def normalize_work_mode(value: Optional[str]) -> Optional[str]:
+    """Map legacy work_mode spellings (e.g. "onsite") onto WorkMode values"""
+    if not value:
+        return value
+    key = str(value).strip().lower()
+    if key in _WORK_MODE_ALIASES:
+        return _WORK_MODE_ALIASES[key].value
+    key = key.replace("-", "_").replace(" ", "_")
+    if key in WorkMode._value2member_map_:
+        return key
+    return WorkMode.ON_SITE.value  # Default fallback
+
+
 class MongoDBJob(BaseModel):
     """MongoDB Job Schema - All fields optional, no validation constraints"""
     id: Optional[str] = Field(None, alias="_id")
@@ -85,6 +137,9 @@ class MongoDBJob(BaseModel):
     employer_id: Optional[str] = None
     employer_name: Optional[str] = None
     
+    # Document schema version (see JOB_SCHEMA_VERSION)
+    schema_version: Optional[int] = None
+    
     class Config:
         allow_population_by_field_name = True
         json_encoders = {
@@ -135,6 +190,41 @@ class MongoDBJobApplication(BaseModel):
         }
 
 
+# Current shape of documents in the companies collection; see JOB_SCHEMA_VERSION
+COMPANY_SCHEMA_VERSION = 1
+
+_WORD = re.compile(r"\w+")
+
+
+def search_terms(value: Optional[str]) -> List[str]:
+    """Case- and accent-folded words of a text, as stored for search ("Nestlé S.A." -> ["nestle", "s", "a"])"""
+    if not value:
+        return []
+    text = unicodedata.normalize("NFKD", str(value).casefold())
+    return _WORD.findall("".join(char for char in text if not unicodedata.combining(char)))
+
+
+def company_search_keys(company: Dict[str, Any]) -> Dict[str, Any]:
+    """Folded copies of the searchable company fields, stored as ``search`` on the document.
+
+    Queries match these with anchored regexes, which use the indexes on
+    them, so "acm" finds "ACME Corp" without an unanchored case-insensitive
+    scan of every company.
+    """
+    locations = set()
+    for field in ("city", "state", "country"):
+        locations.add(" ".join(search_terms(company.get(field))))
+    # Free-text locations are usually "City, State, Country"
+    for part in str(company.get("location") or "").split(","):
+        locations.add(" ".join(search_terms(part)))
+    locations.discard("")
+    return {
+        "words": search_terms(company.get("name")),
+        "industry": " ".join(search_terms(company.get("industry"))) or None,
+        "locations": sorted(locations)
+    }
+
+
 class MongoDBCompany(BaseModel):
     """MongoDB Company Schema"""
     id: Optional[str] = Field(None, alias="_id")
@@ -263,6 +353,7 @@ class MongoDBNotification(BaseModel):
     # Timestamps
     created_at: datetime = Field(default_factory=datetime.utcnow)
     read_at: Optional[datetime] = None
+    archived_at: Optional[datetime] = None
     
     class Config:
         allow_population_by_field_name = True
@@ -342,4 +433,10 @@ class JobApplicationRequest(BaseModel):
     audio_resume_url: Optional[str] = None
     portfolio_url: Optional[str] = None
     linkedin_url: Optional[str] = None
-    github_url: Optional[str] = None 
\ No newline at end of file
+    github_url: Optional[str] = None 
+
+class BulkApplicationStatusRequest(BaseModel):
+    """Request model for updating the status of many applications"""
+    application_ids: List[str] = Field(..., min_length=1, max_length=500)
+    status: ApplicationStatus
+    notes: Optional[str] = None
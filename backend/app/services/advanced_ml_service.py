@@ -26,6 +26,7 @@ from nltk.sentiment import SentimentIntensityAnalyzer
 import spacy
 from textblob import TextBlob
 import warnings
+from app.services.skill_taxonomy import get_skill_taxonomy
 warnings.filterwarnings('ignore')
 
 # Download required NLTK data
@@ -162,24 +163,8 @@ class AdvancedMLService:
         return ' '.join(tokens)
     
     def extract_skills(self, text: str) -> List[str]:
-        """Extract skills from text using NLP and pattern matching"""
-        skills = []
-        
-        # Common technical skills
-        technical_skills = [
-            'python', 'java', 'javascript', 'react', 'angular', 'vue', 'node.js',
-            'sql', 'mongodb', 'postgresql', 'mysql', 'redis', 'docker', 'kubernetes',
-            'aws', 'azure', 'gcp', 'machine learning', 'ai', 'deep learning',
-            'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy', 'matplotlib',
-            'git', 'jenkins', 'ci/cd', 'rest api', 'graphql', 'microservices',
-            'agile', 'scrum', 'kanban', 'jira', 'confluence', 'figma', 'sketch'
-        ]
-        
-        # Extract skills using pattern matching
-        text_lower = text.lower()
-        for skill in technical_skills:
-            if skill in text_lower:
-                skills.append(skill)
+        """Extract skills from text using the skill taxonomy and NLP"""
+        skills = get_skill_taxonomy().extract(text)
         
         # Use spaCy for named entity recognition
         if self.nlp:
@@ -188,7 +173,13 @@ class AdvancedMLService:
                 if ent.label_ in ['ORG', 'PRODUCT', 'GPE']:
                     skills.append(ent.text.lower())
         
-        return list(set(skills))
+        return list(dict.fromkeys(skills))
+    
+    def extract_skills_batch(self, texts: List[str]) -> List[List[str]]:
+        """Extract skills from several texts"""
+        if self.nlp:
+            return [self.extract_skills(text) for text in texts]
+        return get_skill_taxonomy().extract_many(texts)
     
     def analyze_sentiment(self, text: str) -> Dict[str, float]:
         """Analyze sentiment of text"""
@@ -257,8 +248,14 @@ class AdvancedMLService:
             count = 1
         return count
     
-    def advanced_job_matching(self, resume_text: str, job_text: str) -> Dict[str, float]:
-        """Advanced job matching with multiple algorithms"""
+    def advanced_job_matching(self, resume_text: str, job_text: str,
+                              resume_skills: Optional[List[str]] = None,
+                              job_skills: Optional[List[str]] = None) -> Dict[str, float]:
+        """Advanced job matching with multiple algorithms.
+
+        Skills already extracted from either text can be passed in to avoid
+        extracting them again.
+        """
         results = {}
         
         # Preprocess texts
@@ -274,8 +271,8 @@ class AdvancedMLService:
         results['count_similarity'] = float(cosine_similarity(count_matrix[0:1], count_matrix[1:2])[0][0])
         
         # Skills matching
-        resume_skills = set(self.extract_skills(resume_text))
-        job_skills = set(self.extract_skills(job_text))
+        resume_skills = set(resume_skills if resume_skills is not None else self.extract_skills(resume_text))
+        job_skills = set(job_skills if job_skills is not None else self.extract_skills(job_text))
         
         if job_skills:
             skill_overlap = len(resume_skills.intersection(job_skills))
@@ -304,12 +301,17 @@ class AdvancedMLService:
                       top_k: int = 10) -> List[Dict[str, Any]]:
         """Recommend jobs based on user profile"""
         recommendations = []
+        resume_text = user_profile.get('resume_text', '')
+        resume_skills = self.extract_skills(resume_text)
+        jobs_skills = self.extract_skills_batch([job.get('description', '') for job in available_jobs])
         
-        for job in available_jobs:
+        for job, job_skills in zip(available_jobs, jobs_skills):
             # Calculate multiple similarity scores
             matching_scores = self.advanced_job_matching(
-                user_profile.get('resume_text', ''),
-                job.get('description', '')
+                resume_text,
+                job.get('description', ''),
+                resume_skills=resume_skills,
+                job_skills=job_skills
             )
             
             # Additional factors
@@ -346,11 +348,15 @@ class AdvancedMLService:
                            top_k: int = 10) -> List[Dict[str, Any]]:
         """Recommend candidates for a job"""
         recommendations = []
+        job_skills = self.extract_skills(job_description)
+        candidates_skills = self.extract_skills_batch([candidate.get('resume_text', '') for candidate in candidates])
         
-        for candidate in candidates:
+        for candidate, candidate_skills in zip(candidates, candidates_skills):
             matching_scores = self.advanced_job_matching(
                 candidate.get('resume_text', ''),
-                job_description
+                job_description,
+                resume_skills=candidate_skills,
+                job_skills=job_skills
             )
             
             # Additional candidate factors
@@ -473,15 +479,25 @@ class AdvancedMLService:
             return 1.0
     
     def _get_top_skills(self, jobs_data: List[Dict[str, Any]]) -> List[str]:
-        """Get top skills from job data"""
-        all_skills = []
+        """Get top skills from job data.
+
+        Listed skills are counted under their canonical names; jobs without
+        required_skills contribute the skills found in their description.
+        """
+        taxonomy = get_skill_taxonomy()
+        skill_counts = Counter()
+        unlisted = []
         for job in jobs_data:
             skills = job.get('required_skills', [])
             if isinstance(skills, str):
                 skills = skills.split(',')
-            all_skills.extend(skills)
+            skills = [skill.strip() for skill in skills if skill and skill.strip()]
+            if not skills:
+                unlisted.append(job.get('description', ''))
+                continue
+            skill_counts.update(set(taxonomy.normalize(skill) or skill for skill in skills))
         
-        skill_counts = Counter(all_skills)
+        skill_counts.update(taxonomy.document_frequency(unlisted))
         return [skill for skill, count in skill_counts.most_common(20)]
     
     def save_models(self, filepath: str):
@@ -505,36 +521,5 @@ class AdvancedMLService:
         self.scalers = model_data['scalers']
         self.encoders = model_data['encoders']
 
-    def get_live_suggestions(
-        self,
-        query: str,
-        candidates: Optional[List[Dict[str, Any]]] = None,
-        jobs: Optional[List[Dict[str, Any]]] = None,
-        skills: Optional[List[str]] = None,
-        top_k: int = 5
-    ) -> Dict[str, List[str]]:
-        """
-        Provide live search suggestions for skills, job titles, and candidate names based on partial input.
-        Returns a dict with keys: 'skills', 'jobs', 'candidates'.
-        """
-        query_lower = query.lower().strip()
-        suggestions = {"skills": [], "jobs": [], "candidates": []}
-
-        # Skills suggestions
-        if skills:
-            suggestions["skills"] = [s for s in skills if query_lower in s.lower()][:top_k]
-
-        # Job title suggestions
-        if jobs:
-            job_titles = [j.get("title", "") for j in jobs]
-            suggestions["jobs"] = [t for t in job_titles if query_lower in t.lower()][:top_k]
-
-        # Candidate name suggestions
-        if candidates:
-            candidate_names = [c.get("name", "") for c in candidates]
-            suggestions["candidates"] = [n for n in candidate_names if query_lower in n.lower()][:top_k]
-
-        return suggestions
-
 # Global instance
 advanced_ml_service = AdvancedMLService() 
\ No newline at end of file
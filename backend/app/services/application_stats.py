@@ -0,0 +1,234 @@
+"""
+Materialized per-job and per-employer application counts by status
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+import logging
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from app.db.mongodb import (
+    get_application_stats_collection, get_jobs_collection, get_mongo_db
+)
+from app.schemas.mongodb_schemas import ApplicationStatus
+
+logger = logging.getLogger(__name__)
+
+# Collections applications have been stored in over time
+APPLICATION_COLLECTIONS = ("job_applications", "applications")
+
+
+def _status_value(status: Any) -> str:
+    return status.value if isinstance(status, ApplicationStatus) else str(status)
+
+
+class ApplicationStatsService:
+    """Keep application counts per job and per employer up to date.
+
+    Each job and each employer has one document in ``application_stats``
+    (``_id`` is ``job:<id>`` or ``employer:<id>``) holding a ``total`` and a
+    ``counts`` map keyed by status. Counters are adjusted with ``$inc`` when
+    an application is created or changes status, so reading a summary is a
+    single ``find_one`` by ``_id``.
+    """
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"job:{job_id}"
+
+    @staticmethod
+    def _employer_key(employer_id: str) -> str:
+        return f"employer:{employer_id}"
+
+    async def _employer_for_job(self, job_id: str) -> Optional[str]:
+        try:
+            job = await get_jobs_collection().find_one({"_id": ObjectId(job_id)}, {"employer_id": 1})
+        except Exception:
+            return None
+        return job.get("employer_id") if job else None
+
+    def _operations(self, job_id: str, employer_id: Optional[str], inc: Dict[str, int]) -> list:
+        now = datetime.utcnow()
+        operations = [UpdateOne(
+            {"_id": self._job_key(job_id)},
+            {
+                "$inc": inc,
+                "$set": {"updated_at": now},
+                "$setOnInsert": {"scope": "job", "job_id": job_id, "employer_id": employer_id}
+            },
+            upsert=True
+        )]
+        if employer_id:
+            operations.append(UpdateOne(
+                {"_id": self._employer_key(employer_id)},
+                {
+                    "$inc": inc,
+                    "$set": {"updated_at": now},
+                    "$setOnInsert": {"scope": "employer", "employer_id": employer_id}
+                },
+                upsert=True
+            ))
+        return operations
+
+    async def record_application(
+        self,
+        job_id: str,
+        employer_id: Optional[str] = None,
+        status: Any = ApplicationStatus.PENDING
+    ) -> None:
+        """Count a newly submitted application"""
+        try:
+            if employer_id is None:
+                employer_id = await self._employer_for_job(job_id)
+            inc = {"total": 1, f"counts.{_status_value(status)}": 1}
+            await get_application_stats_collection().bulk_write(
+                self._operations(job_id, employer_id, inc), ordered=False
+            )
+        except Exception as e:
+            logger.error(f"Error recording application stats for job {job_id}: {e}")
+
+    async def record_status_change(
+        self,
+        job_id: str,
+        old_status: Any,
+        new_status: Any,
+        employer_id: Optional[str] = None,
+        count: int = 1
+    ) -> None:
+        """Move ``count`` applications of a job from one status to another"""
+        old_value, new_value = _status_value(old_status), _status_value(new_status)
+        if old_value == new_value or count <= 0:
+            return
+        try:
+            if employer_id is None:
+                employer_id = await self._employer_for_job(job_id)
+            inc = {f"counts.{old_value}": -count, f"counts.{new_value}": count}
+            await get_application_stats_collection().bulk_write(
+                self._operations(job_id, employer_id, inc), ordered=False
+            )
+        except Exception as e:
+            logger.error(f"Error recording status change stats for job {job_id}: {e}")
+
+    async def record_status_changes(
+        self,
+        changes: Iterable[Tuple[str, Optional[str], Any, Any]]
+    ) -> None:
+        """Apply many ``(job_id, employer_id, old_status, new_status)`` moves in one write.
+
+        Moves are summed per job before writing, so a bulk update touching
+        hundreds of applications costs a single ``bulk_write``.
+        """
+        per_job: Dict[str, Dict[str, int]] = {}
+        employers: Dict[str, Optional[str]] = {}
+        for job_id, employer_id, old_status, new_status in changes:
+            old_value, new_value = _status_value(old_status), _status_value(new_status)
+            if not job_id or old_value == new_value:
+                continue
+            inc = per_job.setdefault(job_id, {})
+            inc[f"counts.{old_value}"] = inc.get(f"counts.{old_value}", 0) - 1
+            inc[f"counts.{new_value}"] = inc.get(f"counts.{new_value}", 0) + 1
+            employers[job_id] = employers.get(job_id) or employer_id
+        if not per_job:
+            return
+        try:
+            operations = []
+            for job_id, inc in per_job.items():
+                inc = {field: n for field, n in inc.items() if n}
+                if inc:
+                    operations.extend(self._operations(job_id, employers[job_id], inc))
+            if operations:
+                await get_application_stats_collection().bulk_write(operations, ordered=False)
+        except Exception as e:
+            logger.error(f"Error recording bulk status change stats: {e}")
+
+    async def get_job_stats(self, job_id: str) -> Dict[str, Any]:
+        """Application counts for one job"""
+        doc = await get_application_stats_collection().find_one({"_id": self._job_key(job_id)})
+        return self._format(doc, {"job_id": job_id})
+
+    async def get_employer_stats(self, employer_id: str) -> Dict[str, Any]:
+        """Application counts across all jobs of an employer"""
+        doc = await get_application_stats_collection().find_one({"_id": self._employer_key(employer_id)})
+        return self._format(doc, {"employer_id": employer_id})
+
+    @staticmethod
+    def _format(doc: Optional[Dict[str, Any]], ids: Dict[str, Any]) -> Dict[str, Any]:
+        counts = {status.value: 0 for status in ApplicationStatus}
+        doc = doc or {}
+        # Statuses outside the enum (legacy values) are reported as-is
+        counts.update({k: v for k, v in (doc.get("counts") or {}).items() if v})
+        return {
+            **ids,
+            "total": doc.get("total", 0),
+            "counts": counts,
+            "updated_at": doc.get("updated_at")
+        }
+
+    async def rebuild(self, collections: Iterable[str] = APPLICATION_COLLECTIONS, db=None) -> int:
+        """Recompute all statistics from the application collections.
+
+        Used to backfill the collection (migration 4) and to reconcile drift;
+        returns the number of stats documents written. ``db`` defaults to the
+        API's connection.
+        """
+        if db is None:
+            db = get_mongo_db()
+        per_job: Dict[str, Dict[str, int]] = {}
+        for name in collections:
+            pipeline = [{"$group": {"_id": {"job_id": "$job_id", "status": "$status"}, "n": {"$sum": 1}}}]
+            async for row in db[name].aggregate(pipeline):
+                job_id = row["_id"].get("job_id")
+                if not job_id:
+                    continue
+                status = row["_id"].get("status") or ApplicationStatus.PENDING.value
+                counts = per_job.setdefault(str(job_id), {})
+                counts[status] = counts.get(status, 0) + row["n"]
+
+        employers: Dict[str, str] = {}
+        object_ids = [ObjectId(job_id) for job_id in per_job if ObjectId.is_valid(job_id)]
+        async for job in db.jobs.find({"_id": {"$in": object_ids}}, {"employer_id": 1}):
+            if job.get("employer_id"):
+                employers[str(job["_id"])] = job["employer_id"]
+
+        now = datetime.utcnow()
+        per_employer: Dict[str, Dict[str, int]] = {}
+        operations = []
+        for job_id, counts in per_job.items():
+            employer_id = employers.get(job_id)
+            operations.append(UpdateOne(
+                {"_id": self._job_key(job_id)},
+                {"$set": {
+                    "scope": "job", "job_id": job_id, "employer_id": employer_id,
+                    "counts": counts, "total": sum(counts.values()), "updated_at": now
+                }},
+                upsert=True
+            ))
+            if employer_id:
+                totals = per_employer.setdefault(employer_id, {})
+                for status, n in counts.items():
+                    totals[status] = totals.get(status, 0) + n
+
+        for employer_id, counts in per_employer.items():
+            operations.append(UpdateOne(
+                {"_id": self._employer_key(employer_id)},
+                {"$set": {
+                    "scope": "employer", "employer_id": employer_id,
+                    "counts": counts, "total": sum(counts.values()), "updated_at": now
+                }},
+                upsert=True
+            ))
+
+        stats_collection = db.application_stats
+        if operations:
+            await stats_collection.bulk_write(operations, ordered=False)
+        # Drop stats for jobs/employers that no longer have applications
+        keys = [self._job_key(job_id) for job_id in per_job]
+        keys += [self._employer_key(employer_id) for employer_id in per_employer]
+        await stats_collection.delete_many({"_id": {"$nin": keys}})
+        logger.info(f"Rebuilt application stats for {len(per_job)} jobs and {len(per_employer)} employers")
+        return len(operations)
+
+
+# Global instance
+application_stats_service = ApplicationStatsService()
@@ -0,0 +1,330 @@
+"""
+Type-ahead suggestions from in-memory prefix tries
+"""
+import asyncio
+import heapq
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import logging
+
+from app.core.config import settings
+from app.db.mongodb import get_companies_collection, get_jobs_collection, get_users_collection
+
+logger = logging.getLogger(__name__)
+
+SKILLS = "skills"
+JOBS = "jobs"
+COMPANIES = "companies"
+CANDIDATES = "candidates"
+CATEGORIES = (SKILLS, JOBS, COMPANIES, CANDIDATES)
+
+# Suggestions cached on every trie node; the most a lookup can return
+MAX_SUGGESTIONS = 10
+# Trie depth; longer prefixes are matched by filtering the entries at this depth
+MAX_KEY_LENGTH = 32
+
+# Words keep inner "+", "#" and ".", so "C++", "C#" and "Node.js" stay apart from "C" and "Node"
+_WORD = re.compile(r"\w(?:[\w+#]|\.(?=\w))*")
+
+
+def fold(text: str) -> str:
+    """Lowercase, accent-free words of ``text`` joined by single spaces"""
+    text = unicodedata.normalize("NFKD", str(text).casefold())
+    return " ".join(_WORD.findall("".join(char for char in text if not unicodedata.combining(char))))
+
+
+_EMPTY: List[str] = []
+
+
+class _Node:
+    __slots__ = ("children", "keys", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        # Entries whose (truncated) key ends here, created on first use since
+        # most nodes have none
+        self.keys: Optional[Set[str]] = None
+        # The MAX_SUGGESTIONS most popular entries in this subtree. Lists are
+        # replaced, never changed in place, so nodes can share them.
+        self.top: List[str] = _EMPTY
+
+
+class PrefixIndex:
+    """Popularity-ranked prefix lookup over the terms of one category.
+
+    Terms are folded with fold() and inserted once for every word they
+    contain, so "react" finds "Senior React Developer". A term's
+    popularity is the number of sources (jobs, companies, users) that
+    currently list it; set_terms() replaces what one source contributes.
+    Every node keeps its subtree's top MAX_SUGGESTIONS entries, so a lookup
+    walks the prefix and reads that list, however many terms there are.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        # Folded key -> [display text, popularity]
+        self._entries: Dict[str, List[Any]] = {}
+        self._by_source: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _suffixes(key: str) -> List[str]:
+        words = key.split(" ")
+        return [" ".join(words[i:])[:MAX_KEY_LENGTH] for i in range(len(words))]
+
+    def _rank(self, key: str) -> Tuple[int, str]:
+        return (-self._entries[key][1], key)
+
+    def _path(self, suffix: str, create: bool = False) -> List[_Node]:
+        """Nodes from the root to the end of ``suffix``, root first"""
+        node = self._root
+        path = [node]
+        for char in suffix:
+            child = node.children.get(char)
+            if child is None:
+                if not create:
+                    return []
+                child = node.children[char] = _Node()
+            node = child
+            path.append(node)
+        return path
+
+    def _add_key(self, node: _Node, key: str) -> None:
+        if node.keys is None:
+            node.keys = set()
+        node.keys.add(key)
+
+    def _raise(self, key: str) -> None:
+        # Popularity only went up, so the key can only move up in each top list
+        for suffix in self._suffixes(key):
+            path = self._path(suffix, create=True)
+            self._add_key(path[-1], key)
+            for node in path:
+                top = node.top if key in node.top else node.top + [key]
+                node.top = sorted(top, key=self._rank)[:MAX_SUGGESTIONS]
+
+    def _lower(self, key: str, removed: bool) -> None:
+        # Entries outside a top list may now belong in it; rebuild the lists
+        # that held the key from their children, deepest first
+        for suffix in self._suffixes(key):
+            path = self._path(suffix)
+            if removed:
+                path[-1].keys.discard(key)
+            for node in reversed(path):
+                if key not in node.top:
+                    continue
+                candidates = set(node.keys or ())
+                for child in node.children.values():
+                    candidates.update(child.top)
+                node.top = heapq.nsmallest(MAX_SUGGESTIONS, candidates, key=self._rank)
+
+    @classmethod
+    def build(cls, sources: Dict[str, List[Optional[str]]]) -> "PrefixIndex":
+        """Index the terms of many sources at once (much faster than set_terms() for each)"""
+        index = cls()
+        for source, terms in sources.items():
+            displays = index._displays(terms)
+            if displays:
+                index._by_source[source] = set(displays)
+            for key, display in displays.items():
+                index._entries.setdefault(key, [display, 0])[1] += 1
+        for key in index._entries:
+            for suffix in index._suffixes(key):
+                index._add_key(index._path(suffix, create=True)[-1], key)
+        index._fill(index._root)
+        return index
+
+    def _fill(self, node: _Node) -> None:
+        for child in node.children.values():
+            self._fill(child)
+        if not node.keys and len(node.children) == 1:
+            # Most nodes sit inside a single word and share their child's list
+            node.top = next(iter(node.children.values())).top
+            return
+        candidates = set(node.keys or ())
+        for child in node.children.values():
+            candidates.update(child.top)
+        node.top = heapq.nsmallest(MAX_SUGGESTIONS, candidates, key=self._rank)
+
+    @staticmethod
+    def _displays(terms: Iterable[Optional[str]]) -> Dict[str, str]:
+        """Folded key -> display text of each distinct term"""
+        displays = {}
+        for term in terms:
+            key = fold(term) if term else ""
+            if key and key not in displays:
+                displays[key] = str(term).strip()
+        return displays
+
+    def set_terms(self, source: str, terms: Iterable[Optional[str]]) -> None:
+        """Make ``terms`` the terms listed by ``source``, replacing earlier ones"""
+        displays = self._displays(terms)
+        previous = self._by_source.pop(source, set())
+        if displays:
+            self._by_source[source] = set(displays)
+        for key in previous - set(displays):
+            entry = self._entries[key]
+            entry[1] -= 1
+            if entry[1] <= 0:
+                self._lower(key, removed=True)
+                del self._entries[key]
+            else:
+                self._lower(key, removed=False)
+        for key in set(displays) - previous:
+            entry = self._entries.setdefault(key, [displays[key], 0])
+            entry[1] += 1
+            self._raise(key)
+
+    def remove_source(self, source: str) -> None:
+        self.set_terms(source, [])
+
+    def lookup(self, prefix: str, limit: int = 5) -> List[str]:
+        """Most popular terms with a word starting with ``prefix``"""
+        key = fold(prefix)
+        if not key:
+            return []
+        path = self._path(key[:MAX_KEY_LENGTH])
+        if not path:
+            return []
+        node = path[-1]
+        if len(key) <= MAX_KEY_LENGTH:
+            keys = node.top
+        else:
+            keys = sorted(
+                (k for k in node.keys or () if f" {k}".find(f" {key}") >= 0),
+                key=self._rank
+            )
+        return [self._entries[k][0] for k in keys[:limit]]
+
+
+class AutocompleteService:
+    """Type-ahead suggestions for skills, job titles, companies and candidates.
+
+    The indexes are built from MongoDB at start() and again every
+    AUTOCOMPLETE_REFRESH_MINUTES, off the event loop. Writes through the
+    API update them immediately with the index_*/remove_* methods. Each
+    worker process holds its own copy, so writes made in another process
+    show up at the next refresh.
+    """
+
+    def __init__(self, refresh_minutes: int = settings.AUTOCOMPLETE_REFRESH_MINUTES):
+        self.refresh_interval = refresh_minutes * 60
+        self._indexes: Dict[str, PrefixIndex] = {category: PrefixIndex() for category in CATEGORIES}
+        self._task: Optional[asyncio.Task] = None
+        # Writes made while a rebuild runs, replayed on the new indexes
+        self._pending: Optional[List[Tuple[str, str, List[Optional[str]]]]] = None
+
+    def start(self) -> None:
+        """Start building and periodically refreshing the indexes"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.rebuild()
+            except Exception as e:
+                logger.error(f"Error building autocomplete indexes: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    async def rebuild(self) -> None:
+        """Rebuild every index from the jobs, companies and users collections"""
+        sources: List[Tuple[str, str, List[Optional[str]]]] = []
+        self._pending = []
+        try:
+            async for job in get_jobs_collection().find(
+                {"status": "published"}, {"title": 1, "required_skills": 1, "company_name": 1}
+            ):
+                sources.extend(self._job_terms(job))
+            async for company in get_companies_collection().find({}, {"name": 1}):
+                sources.append((COMPANIES, f"company:{company['_id']}", [company.get("name")]))
+            async for user in get_users_collection().find(
+                {"is_active": {"$ne": False}}, {"name": 1, "role": 1, "skills": 1}
+            ):
+                sources.extend(self._user_terms(user))
+
+            indexes = await asyncio.to_thread(self._build, sources)
+            for category, source, terms in self._pending:
+                indexes[category].set_terms(source, terms)
+            self._indexes = indexes
+        finally:
+            self._pending = None
+        logger.info("Autocomplete indexes built: " + ", ".join(
+            f"{len(index)} {category}" for category, index in self._indexes.items()
+        ))
+
+    @staticmethod
+    def _build(sources: List[Tuple[str, str, List[Optional[str]]]]) -> Dict[str, PrefixIndex]:
+        by_category: Dict[str, Dict[str, List[Optional[str]]]] = {category: {} for category in CATEGORIES}
+        for category, source, terms in sources:
+            by_category[category][source] = terms
+        return {category: PrefixIndex.build(by_category[category]) for category in CATEGORIES}
+
+    @staticmethod
+    def _job_terms(job: Dict[str, Any]) -> List[Tuple[str, str, List[Optional[str]]]]:
+        source = f"job:{job['_id']}"
+        return [
+            (JOBS, source, [job.get("title")]),
+            (SKILLS, source, list(job.get("required_skills") or [])),
+            (COMPANIES, source, [job.get("company_name")])
+        ]
+
+    @staticmethod
+    def _user_terms(user: Dict[str, Any]) -> List[Tuple[str, str, List[Optional[str]]]]:
+        source = f"user:{user['_id']}"
+        is_candidate = user.get("role") == "jobseeker"
+        return [
+            (CANDIDATES, source, [user.get("name")] if is_candidate else []),
+            (SKILLS, source, list(user.get("skills") or []) if is_candidate else [])
+        ]
+
+    def _apply(self, updates: List[Tuple[str, str, List[Optional[str]]]]) -> None:
+        for category, source, terms in updates:
+            self._indexes[category].set_terms(source, terms)
+        if self._pending is not None:
+            self._pending.extend(updates)
+
+    def index_job(self, job: Dict[str, Any]) -> None:
+        """Add or update a job; jobs that are not published are removed"""
+        if job.get("status", "published") != "published":
+            self.remove_job(job["_id"])
+        else:
+            self._apply(self._job_terms(job))
+
+    def remove_job(self, job_id: Any) -> None:
+        self._apply(self._job_terms({"_id": job_id}))
+
+    def index_company(self, company: Dict[str, Any]) -> None:
+        self._apply([(COMPANIES, f"company:{company['_id']}", [company.get("name")])])
+
+    def remove_company(self, company_id: Any) -> None:
+        self._apply([(COMPANIES, f"company:{company_id}", [])])
+
+    def index_user(self, user: Dict[str, Any]) -> None:
+        self._apply(self._user_terms(user))
+
+    def suggest(
+        self,
+        query: str,
+        limit: int = 5,
+        categories: Iterable[str] = CATEGORIES
+    ) -> Dict[str, List[str]]:
+        """Top ``limit`` suggestions for ``query`` in each category"""
+        limit = min(limit, MAX_SUGGESTIONS)
+        return {category: self._indexes[category].lookup(query, limit) for category in categories}
+
+
+# Global instance
+autocomplete_service = AutocompleteService()
@@ -1,80 +1,275 @@
-import smtplib
+import asyncio
+import logging
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from app.core.config import settings
+from app.services.templates import template_registry
 
+logger = logging.getLogger(__name__)
 
-def send_email(to_email: str, subject: str, body: str, is_html: bool = False):
-    """Send email using SMTP"""
-    try:
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = settings.MAIL_FROM
-        msg['To'] = to_email
-        msg['Subject'] = subject
-        
-        # Add body
-        msg.attach(MIMEText(body, 'html' if is_html else 'plain'))
-        
-        # Connect to server and send email
-        server = smtplib.SMTP(settings.MAIL_SERVER, settings.MAIL_PORT)
-        server.starttls()
-        server.login(settings.MAIL_USERNAME, settings.MAIL_PASSWORD)
-        
-        text = msg.as_string()
-        server.sendmail(settings.MAIL_FROM, to_email, text)
-        server.quit()
-        
-        return True
-    except Exception as e:
-        print(f"Failed to send email: {e}")
+
+class SMTPTransport:
+    """Send mail over a small pool of persistent, authenticated SMTP connections.
+
+    Up to MAIL_POOL_SIZE connections are opened lazily and kept logged in
+    between sends, so a message costs one SMTP transaction instead of a TCP
+    connect, TLS handshake and login. Connections idle for longer than
+    MAIL_IDLE_TIMEOUT_SECONDS are replaced, and a connection dropped by the
+    server is reopened once per batch.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = settings.MAIL_POOL_SIZE,
+        idle_timeout: float = settings.MAIL_IDLE_TIMEOUT_SECONDS,
+        backend: str = settings.MAIL_BACKEND
+    ):
+        self.idle_timeout = idle_timeout
+        self.backend = backend
+        self._semaphore = asyncio.Semaphore(pool_size)
+        self._idle: List[Tuple[object, float]] = []
+        # Messages "sent" with the memory backend
+        self.outbox: List[MIMEMultipart] = []
+
+    async def _connect(self):
+        import aiosmtplib
+
+        client = aiosmtplib.SMTP(
+            hostname=settings.MAIL_SERVER,
+            port=settings.MAIL_PORT,
+            use_tls=settings.MAIL_USE_TLS,
+            start_tls=settings.MAIL_STARTTLS and not settings.MAIL_USE_TLS,
+            timeout=settings.MAIL_TIMEOUT_SECONDS
+        )
+        await client.connect()
+        if settings.MAIL_USERNAME and settings.MAIL_PASSWORD:
+            await client.login(settings.MAIL_USERNAME, settings.MAIL_PASSWORD)
+        return client
+
+    async def _acquire(self):
+        await self._semaphore.acquire()
+        try:
+            while self._idle:
+                client, last_used = self._idle.pop()
+                if client.is_connected and time.monotonic() - last_used < self.idle_timeout:
+                    return client
+                await self._disconnect(client)
+            return await self._connect()
+        except Exception:
+            self._semaphore.release()
+            raise
+
+    def _release(self, client, reusable: bool) -> None:
+        if reusable and client.is_connected:
+            self._idle.append((client, time.monotonic()))
+        else:
+            client.close()
+        self._semaphore.release()
+
+    @staticmethod
+    async def _disconnect(client) -> None:
+        try:
+            await client.quit()
+        except Exception:
+            client.close()
+
+    async def send_many(self, messages: List[MIMEMultipart]) -> List[Optional[Exception]]:
+        """Send messages over one connection; returns an error (or None) per message"""
+        if self.backend == "memory":
+            self.outbox.extend(messages)
+            return [None] * len(messages)
+        if self.backend == "console":
+            for message in messages:
+                logger.info(f"Email to {message['To']}: {message['Subject']}")
+            return [None] * len(messages)
+
+        import aiosmtplib
+
+        try:
+            client = await self._acquire()
+        except Exception as e:
+            return [e] * len(messages)
+
+        results: List[Optional[Exception]] = []
+        reconnected = False
+        try:
+            for message in messages:
+                while True:
+                    try:
+                        await client.send_message(message)
+                        results.append(None)
+                    except aiosmtplib.SMTPServerDisconnected:
+                        if reconnected:
+                            raise
+                        reconnected = True
+                        client.close()
+                        client = await self._connect()
+                        continue
+                    except aiosmtplib.SMTPException as e:
+                        # Rejected message; the connection is still usable
+                        results.append(e)
+                    break
+        except Exception as e:
+            results.extend([e] * (len(messages) - len(results)))
+            self._release(client, reusable=False)
+            return results
+        self._release(client, reusable=True)
+        return results
+
+    async def send(self, message: MIMEMultipart) -> Optional[Exception]:
+        """Send one message; returns the error, or None on success"""
+        return (await self.send_many([message]))[0]
+
+    async def close(self) -> None:
+        """Close all idle connections"""
+        while self._idle:
+            client, _ = self._idle.pop()
+            await self._disconnect(client)
+
+
+class EmailQueue:
+    """Send queued messages in the background, in batches, with retries.
+
+    A worker drains up to MAIL_BATCH_SIZE messages at a time and sends them
+    over one pooled connection. Messages that fail are retried up to
+    MAIL_MAX_RETRIES times with exponential backoff, then logged and dropped.
+    stop() sends everything still queued or waiting for a retry once more,
+    without waiting out the backoff. Before start() (e.g. in scripts)
+    messages are sent inline.
+    """
+
+    def __init__(
+        self,
+        transport: SMTPTransport,
+        max_size: int = settings.MAIL_QUEUE_MAX_SIZE,
+        batch_size: int = settings.MAIL_BATCH_SIZE,
+        max_retries: int = settings.MAIL_MAX_RETRIES,
+        retry_delay: float = settings.MAIL_RETRY_DELAY_SECONDS
+    ):
+        self.transport = transport
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self._task: Optional[asyncio.Task] = None
+        # Messages waiting out a retry backoff, by the task that will requeue them
+        self._retries: Dict[asyncio.Task, Tuple[MIMEMultipart, int]] = {}
+
+    def start(self) -> None:
+        """Start the background send worker"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the worker after a last attempt at everything queued or awaiting a retry"""
+        waiting = list(self._retries.values())
+        for retry in list(self._retries):
+            retry.cancel()
+        self._retries.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while not self._queue.empty():
+            waiting.append(self._queue.get_nowait())
+        for start in range(0, len(waiting), self.batch_size):
+            await self._send(waiting[start:start + self.batch_size], retry=False)
+
+    async def enqueue(self, message: MIMEMultipart) -> None:
+        """Queue a message for sending"""
+        if self._task is None:
+            await self._send([(message, 0)], retry=False)
+            return
+        await self._queue.put((message, 0))
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._send(batch, retry=True)
+            except Exception as e:
+                logger.error(f"Unexpected error sending emails: {e}")
+
+    async def _send(self, batch: List[Tuple[MIMEMultipart, int]], retry: bool) -> None:
+        errors = await self.transport.send_many([message for message, _ in batch])
+        for (message, attempt), error in zip(batch, errors):
+            if error is None:
+                continue
+            if retry and attempt < self.max_retries:
+                task = asyncio.create_task(self._retry_later(message, attempt + 1))
+                self._retries[task] = (message, attempt + 1)
+                task.add_done_callback(lambda done: self._retries.pop(done, None))
+            else:
+                logger.error(
+                    f"Failed to send email to {message['To']} ({message['Subject']!r}) "
+                    f"after {attempt + 1} attempts: {error}"
+                )
+
+    async def _retry_later(self, message: MIMEMultipart, attempt: int) -> None:
+        await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+        await self._queue.put((message, attempt))
+
+
+# Global instances
+mail_transport = SMTPTransport()
+email_queue = EmailQueue(mail_transport)
+
+
+def build_email(to_email: str, subject: str, body: str, is_html: bool = False) -> MIMEMultipart:
+    """Build an email message"""
+    msg = MIMEMultipart()
+    msg['From'] = settings.MAIL_FROM
+    msg['To'] = to_email
+    msg['Subject'] = subject
+
+    # Add body
+    msg.attach(MIMEText(body, 'html' if is_html else 'plain'))
+    return msg
+
+
+async def send_email(to_email: str, subject: str, body: str, is_html: bool = False) -> bool:
+    """Send email now over a pooled SMTP connection"""
+    error = await mail_transport.send(build_email(to_email, subject, body, is_html))
+    if error is not None:
+        logger.error(f"Failed to send email: {error}")
         return False
+    return True
+
+
+async def queue_email(to_email: str, subject: str, body: str, is_html: bool = False) -> None:
+    """Queue an email to be sent in the background"""
+    await email_queue.enqueue(build_email(to_email, subject, body, is_html))
 
 
-def send_password_reset_email(email: str, reset_token: str):
+async def queue_templated_emails(
+    template: str,
+    recipients: Iterable[Tuple[str, Dict[str, Any]]],
+    locale: Optional[str] = None
+) -> None:
+    """Render one email template for many ``(email, context)`` pairs and queue them"""
+    recipients = list(recipients)
+    rendered = template_registry.render_many(
+        f"email/{template}.html", (context for _, context in recipients), locale
+    )
+    for (to_email, _), content in zip(recipients, rendered):
+        await queue_email(to_email, content.subject, content.body, is_html=True)
+
+
+async def send_password_reset_email(email: str, reset_token: str, locale: Optional[str] = None):
     """Send password reset email"""
     reset_url = f"http://localhost:3000/reset-password?token={reset_token}"
-    
-    subject = "Password Reset - SkillGlide"
-    body = f"""
-    <html>
-        <body>
-            <h2>Password Reset Request</h2>
-            <p>You have requested to reset your password for your SkillGlide account.</p>
-            <p>Click the link below to reset your password:</p>
-            <a href="{reset_url}" style="background-color: #007bff; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">Reset Password</a>
-            <p>This link will expire in 1 hour.</p>
-            <p>If you didn't request this, please ignore this email.</p>
-            <br>
-            <p>Best regards,<br>The SkillGlide Team</p>
-        </body>
-    </html>
-    """
-    
-    return send_email(email, subject, body, is_html=True)
+    subject, body = template_registry.render_email("password_reset", locale, reset_url=reset_url)
+    await queue_email(email, subject, body, is_html=True)
 
 
-def send_welcome_email(email: str, name: str):
+async def send_welcome_email(email: str, name: str, locale: Optional[str] = None):
     """Send welcome email to new users"""
-    subject = "Welcome to SkillGlide!"
-    body = f"""
-    <html>
-        <body>
-            <h2>Welcome to SkillGlide, {name}!</h2>
-            <p>Thank you for joining SkillGlide, the AI-powered job portal.</p>
-            <p>You can now:</p>
-            <ul>
-                <li>Create and customize your professional resume</li>
-                <li>Search for jobs that match your skills</li>
-                <li>Get AI-powered job recommendations</li>
-                <li>Connect with top employers</li>
-            </ul>
-            <p>Get started by completing your profile and uploading your resume.</p>
-            <a href="http://localhost:3000/profile" style="background-color: #007bff; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">Complete Profile</a>
-            <br><br>
-            <p>Best regards,<br>The SkillGlide Team</p>
-        </body>
-    </html>
-    """
-    
-    return send_email(email, subject, body, is_html=True)
\ No newline at end of file
+    subject, body = template_registry.render_email("welcome", locale, name=name)
+    await queue_email(email, subject, body, is_html=True)
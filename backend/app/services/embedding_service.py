@@ -0,0 +1,200 @@
+"""
+Cached, micro-batched text embeddings
+"""
+import asyncio
+import hashlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+
+import numpy as np
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.db.database import get_embeddings_collection
+from app.services.llm_client import LLMError, get_api_key, llm_client
+
+logger = logging.getLogger(__name__)
+
+# Model used by matching.py when OpenAI is unavailable
+LOCAL_MODEL = "all-MiniLM-L6-v2"
+
+
+def content_hash(model: str, text: str) -> str:
+    """Cache key of a text's embedding under a model"""
+    return f"{model}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+
+def _encode_local(texts: List[str]) -> np.ndarray:
+    # Importing matching loads the SentenceTransformer from disk the first
+    # time, so this runs in a thread along with the encoding
+    from app.services.matching import model as local_model
+
+    return local_model.encode(texts, convert_to_numpy=True)
+
+
+class EmbeddingService:
+    """Embed text once and reuse the vector.
+
+    Vectors are keyed by model and the SHA-256 of the text, held in an
+    in-process LRU of EMBEDDING_CACHE_SIZE entries and persisted in the
+    ``embeddings`` collection, so repeat texts cost no API call. Concurrent
+    requests for uncached texts are collected for up to
+    EMBEDDING_BATCH_WAIT_SECONDS (or EMBEDDING_BATCH_SIZE texts) and sent as
+    one multi-input API call; requests for the same text share one result.
+    embed_many() falls back to the local SentenceTransformer when OpenAI is
+    not configured or unavailable.
+    """
+
+    def __init__(
+        self,
+        model: str = settings.EMBEDDING_MODEL,
+        cache_size: int = settings.EMBEDDING_CACHE_SIZE,
+        batch_size: int = settings.EMBEDDING_BATCH_SIZE,
+        batch_wait: float = settings.EMBEDDING_BATCH_WAIT_SECONDS
+    ):
+        self.model = model
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # model -> texts waiting for the next API call
+        self._batches: Dict[str, List[Tuple[str, str]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks: set = set()
+
+    def _cache_get(self, key: str) -> Optional[np.ndarray]:
+        vector = self._cache.get(key)
+        if vector is not None:
+            self._cache.move_to_end(key)
+        return vector
+
+    def _cache_put(self, key: str, vector: np.ndarray) -> None:
+        self._cache[key] = vector
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _load(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        try:
+            cursor = get_embeddings_collection().find({"_id": {"$in": keys}}, {"vector": 1})
+            return {
+                doc["_id"]: np.frombuffer(doc["vector"], dtype=np.float32)
+                async for doc in cursor
+            }
+        except Exception as e:
+            logger.error(f"Error loading cached embeddings: {e}")
+            return {}
+
+    async def _save(self, model: str, vectors: Dict[str, np.ndarray]) -> None:
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {"_id": key},
+                {"$setOnInsert": {"model": model, "vector": vector.tobytes(), "dimensions": len(vector), "created_at": now}},
+                upsert=True
+            )
+            for key, vector in vectors.items()
+        ]
+        try:
+            await get_embeddings_collection().bulk_write(operations, ordered=False)
+        except Exception as e:
+            logger.error(f"Error storing embeddings: {e}")
+
+    async def embed(self, text: str, model: Optional[str] = None) -> np.ndarray:
+        """OpenAI embedding of one text; raises LLMError if it cannot be computed"""
+        model = model or self.model
+        key = content_hash(model, text)
+        vector = self._cache_get(key)
+        if vector is not None:
+            return vector
+
+        future = self._inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._inflight[key] = future
+            batch = self._batches.setdefault(model, [])
+            batch.append((key, text))
+            if len(batch) >= self.batch_size:
+                self._flush(model)
+            elif model not in self._timers:
+                self._timers[model] = loop.call_later(self.batch_wait, self._flush, model)
+        # Shielded so one cancelled caller does not cancel the result others wait for
+        return await asyncio.shield(future)
+
+    async def embed_batch(self, texts: Sequence[str], model: Optional[str] = None) -> List[np.ndarray]:
+        """OpenAI embeddings of several texts, batched with concurrent requests"""
+        return list(await asyncio.gather(*(self.embed(text, model) for text in texts)))
+
+    async def embed_many(self, texts: Sequence[str]) -> Tuple[str, List[np.ndarray]]:
+        """Embeddings of texts that can be compared with each other.
+
+        Uses OpenAI when it is configured and reachable, otherwise the local
+        model; returns ``(model, vectors)`` with every vector from that model.
+        """
+        if get_api_key():
+            try:
+                return self.model, await self.embed_batch(texts)
+            except LLMError as e:
+                logger.warning(f"Embedding API unavailable, using {LOCAL_MODEL}: {e.detail}")
+        return LOCAL_MODEL, await self.embed_local(texts)
+
+    def _flush(self, model: str) -> None:
+        timer = self._timers.pop(model, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._batches.pop(model, [])
+        if batch:
+            task = asyncio.create_task(self._resolve(model, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, model: str, batch: List[Tuple[str, str]]) -> None:
+        try:
+            vectors = await self._load([key for key, _ in batch])
+            missing = [(key, text) for key, text in batch if key not in vectors]
+            if missing:
+                data = await llm_client.request("/embeddings", {"input": [text for _, text in missing], "model": model})
+                items = sorted(data["data"], key=lambda item: item["index"])
+                computed = {
+                    key: np.asarray(item["embedding"], dtype=np.float32)
+                    for (key, _), item in zip(missing, items)
+                }
+                await self._save(model, computed)
+                vectors.update(computed)
+            for key, _ in batch:
+                self._cache_put(key, vectors[key])
+                self._set_result(key, vectors[key])
+        except Exception as e:
+            for key, _ in batch:
+                self._set_result(key, error=e)
+
+    def _set_result(self, key: str, vector: Optional[np.ndarray] = None, error: Optional[Exception] = None) -> None:
+        future = self._inflight.pop(key, None)
+        if future is None or future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+            # Mark retrieved so callers that went away do not log "exception never retrieved"
+            future.exception()
+        else:
+            future.set_result(vector)
+
+    async def embed_local(self, texts: Sequence[str]) -> List[np.ndarray]:
+        """Embeddings from the local SentenceTransformer, computed off the event loop"""
+        keys = [content_hash(LOCAL_MODEL, text) for text in texts]
+        vectors = {key: self._cache_get(key) for key in keys}
+        missing = [(key, text) for key, text in zip(keys, texts) if vectors[key] is None]
+        if missing:
+            encoded = await asyncio.to_thread(_encode_local, [text for _, text in missing])
+            for (key, _), vector in zip(missing, encoded):
+                vectors[key] = vector.astype(np.float32)
+                self._cache_put(key, vectors[key])
+        return [vectors[key] for key in keys]
+
+
+# Global instance
+embedding_service = EmbeddingService()
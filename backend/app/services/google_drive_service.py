@@ -1,187 +1,168 @@
-import os
-import io
-import json
-from typing import Dict, Any, Optional
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
-import PyPDF2
-from docx import Document
-from fastapi import HTTPException, status
+"""
+Google Drive files API client
+"""
+from typing import Any, AsyncIterator, Dict, Optional
 import logging
 
+import httpx
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.services.resume_parser import resume_parser, SUPPORTED_MIME_TYPES
+
 logger = logging.getLogger(__name__)
 
+FILES_PATH = "/drive/v3/files"
+MAX_DOWNLOAD_BYTES = 10 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+
 class GoogleDriveService:
-    def __init__(self):
-        self.SCOPES = [
-            'https://www.googleapis.com/auth/drive.readonly',
-            'https://www.googleapis.com/auth/drive.file'
-        ]
-        self.service = None
-
-    def validate_token(self, access_token: str) -> bool:
-        """Validate Google OAuth access token"""
+    """Download files from Google Drive over one pooled HTTP client.
+
+    The Drive v3 REST endpoints are called directly with the user's OAuth
+    access token, so no discovery document is fetched or parsed and no
+    service object is built per request; one ``httpx.AsyncClient`` serves
+    every credential. The token is checked by the download itself (Drive
+    answers 401), and content is yielded in chunks as it arrives so callers
+    can hash, parse or store it as it streams. GOOGLE_DRIVE_API_URL can point
+    at scripts/mock_google_drive.py for local testing.
+    """
+
+    def __init__(
+        self,
+        base_url: str = settings.GOOGLE_DRIVE_API_URL,
+        timeout: float = settings.GOOGLE_DRIVE_TIMEOUT_SECONDS,
+        max_bytes: int = MAX_DOWNLOAD_BYTES
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def start(self) -> None:
+        """Create the pooled client"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.timeout, connect=10.0)
+            )
+
+    async def stop(self) -> None:
+        """Close pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created lazily outside the app (scripts, tests)
+        if self._client is None:
+            self.start()
+        return self._client
+
+    @staticmethod
+    def _raise_for_status(response: httpx.Response) -> None:
+        if response.status_code < 400:
+            return
+        if response.status_code == 401:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired Google OAuth token"
+            )
+        if response.status_code == 403:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access to this Google Drive file was denied"
+            )
+        if response.status_code == 404:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="File not found in Google Drive"
+            )
         try:
-            credentials = Credentials(access_token)
-            if credentials.expired and credentials.refresh_token:
-                credentials.refresh(Request())
-            
-            # Test the token by making a simple API call
-            service = build('drive', 'v3', credentials=credentials)
-            service.files().list(pageSize=1).execute()
-            return True
-        except Exception as e:
-            logger.error(f"Token validation failed: {e}")
-            return False
-
-    def download_file(self, file_id: str, access_token: str) -> bytes:
-        """Download file content from Google Drive"""
+            message = response.json()["error"]["message"]
+        except Exception:
+            message = f"HTTP {response.status_code}"
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to download file from Google Drive: {message}"
+        )
+
+    def _too_large(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File size must be less than {self.max_bytes // (1024 * 1024)}MB."
+        )
+
+    async def get_metadata(self, file_id: str, access_token: str) -> Dict[str, Any]:
+        """Name, MIME type and size of a Drive file"""
         try:
-            credentials = Credentials(access_token)
-            service = build('drive', 'v3', credentials=credentials)
-            
-            # Get file metadata
-            file_metadata = service.files().get(fileId=file_id).execute()
-            
-            # Download file content
-            request = service.files().get_media(fileId=file_id)
-            file_content = io.BytesIO()
-            downloader = MediaIoBaseDownload(file_content, request)
-            
-            done = False
-            while not done:
-                status, done = downloader.next_chunk()
-                if status:
-                    logger.info(f"Download {int(status.progress() * 100)}%")
-            
-            return file_content.getvalue()
-            
-        except Exception as e:
-            logger.error(f"Failed to download file: {e}")
+            response = await self.client.get(
+                f"{FILES_PATH}/{file_id}",
+                params={"fields": "id,name,mimeType,size"},
+                headers={"Authorization": f"Bearer {access_token}"}
+            )
+        except httpx.RequestError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Failed to download file from Google Drive: {str(e)}"
             )
+        self._raise_for_status(response)
+        return response.json()
 
-    def parse_pdf_content(self, file_content: bytes) -> Dict[str, Any]:
-        """Parse PDF content and extract resume information"""
+    async def stream_file(self, file_id: str, access_token: str) -> AsyncIterator[bytes]:
+        """Content of a Drive file in chunks as it is received"""
         try:
-            pdf_file = io.BytesIO(file_content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            
-            text_content = ""
-            for page in pdf_reader.pages:
-                text_content += page.extract_text()
-            
-            return self._extract_resume_data(text_content)
-            
-        except Exception as e:
-            logger.error(f"Failed to parse PDF: {e}")
+            async with self.client.stream(
+                "GET",
+                f"{FILES_PATH}/{file_id}",
+                params={"alt": "media"},
+                headers={"Authorization": f"Bearer {access_token}"}
+            ) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                self._raise_for_status(response)
+                if int(response.headers.get("content-length") or 0) > self.max_bytes:
+                    raise self._too_large()
+
+                received = 0
+                async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                    received += len(chunk)
+                    if received > self.max_bytes:
+                        raise self._too_large()
+                    yield chunk
+        except httpx.TimeoutException:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Failed to parse PDF file: {str(e)}"
+                status_code=status.HTTP_408_REQUEST_TIMEOUT,
+                detail="Timed out downloading file from Google Drive"
             )
-
-    def parse_docx_content(self, file_content: bytes) -> Dict[str, Any]:
-        """Parse DOCX content and extract resume information"""
-        try:
-            doc_file = io.BytesIO(file_content)
-            doc = Document(doc_file)
-            
-            text_content = ""
-            for paragraph in doc.paragraphs:
-                text_content += paragraph.text + "\n"
-            
-            return self._extract_resume_data(text_content)
-            
-        except Exception as e:
-            logger.error(f"Failed to parse DOCX: {e}")
+        except httpx.RequestError as e:
+            logger.error(f"Failed to download file: {e}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Failed to parse DOCX file: {str(e)}"
+                detail=f"Failed to download file from Google Drive: {str(e)}"
             )
 
-    def _extract_resume_data(self, text_content: str) -> Dict[str, Any]:
-        """Extract resume information from text content using basic parsing"""
-        # This is a basic implementation - in production, you might want to use
-        # more sophisticated NLP/AI models for better extraction
-        
-        lines = text_content.split('\n')
-        personal_info = {}
-        
-        # Basic email extraction
-        import re
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text_content)
-        if emails:
-            personal_info['email'] = emails[0]
-        
-        # Basic phone extraction
-        phone_pattern = r'(\+?[\d\s\-\(\)]{10,})'
-        phones = re.findall(phone_pattern, text_content)
-        if phones:
-            personal_info['phone'] = phones[0].strip()
-        
-        # Try to extract name (first line that looks like a name)
-        for line in lines[:10]:  # Check first 10 lines
-            line = line.strip()
-            if line and len(line.split()) <= 4 and not any(char.isdigit() for char in line):
-                if not personal_info.get('name'):
-                    personal_info['name'] = line
-                break
-        
-        # Extract summary (look for longer paragraphs)
-        summary_candidates = []
-        for line in lines:
-            line = line.strip()
-            if len(line) > 50 and len(line) < 500:
-                summary_candidates.append(line)
-        
-        if summary_candidates:
-            personal_info['summary'] = summary_candidates[0]
-        
-        # Try to extract location (look for common location patterns)
-        location_patterns = [
-            r'\b[A-Z][a-z]+,\s*[A-Z]{2}\b',  # City, State
-            r'\b[A-Z][a-z]+,\s*[A-Z][a-z]+\b',  # City, Country
-        ]
-        
-        for pattern in location_patterns:
-            locations = re.findall(pattern, text_content)
-            if locations:
-                personal_info['location'] = locations[0]
-                break
-        
-        return {
-            'personalInfo': personal_info,
-            'rawText': text_content[:1000]  # First 1000 characters for debugging
-        }
-
-    def process_google_drive_file(self, file_id: str, access_token: str, mime_type: str) -> Dict[str, Any]:
-        """Process a Google Drive file and extract resume information"""
-        # Validate token
-        if not self.validate_token(access_token):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired Google OAuth token"
-            )
-        
-        # Download file
-        file_content = self.download_file(file_id, access_token)
-        
-        # Parse based on file type
-        if mime_type == 'application/pdf':
-            return self.parse_pdf_content(file_content)
-        elif mime_type == 'application/vnd.openxmlformats-officedocument.wordprocessingml.document':
-            return self.parse_docx_content(file_content)
-        else:
+    async def download_file(self, file_id: str, access_token: str) -> bytes:
+        """Whole content of a Drive file"""
+        return b"".join([chunk async for chunk in self.stream_file(file_id, access_token)])
+
+    async def process_google_drive_file(self, file_id: str, access_token: str, mime_type: Optional[str] = None) -> Dict[str, Any]:
+        """Download a Google Drive resume and extract resume information.
+
+        The download is parsed as it streams in (see ResumeParser.parse_stream);
+        without ``mime_type`` it is looked up from the file's metadata first.
+        """
+        if mime_type is None:
+            mime_type = (await self.get_metadata(file_id, access_token)).get("mimeType")
+        if mime_type not in SUPPORTED_MIME_TYPES:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Unsupported file type. Only PDF and DOCX files are supported."
             )
+        return await resume_parser.parse_stream(self.stream_file(file_id, access_token), mime_type)
+
 
 # Create singleton instance
-google_drive_service = GoogleDriveService() 
\ No newline at end of file
+google_drive_service = GoogleDriveService()
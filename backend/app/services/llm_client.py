@@ -0,0 +1,347 @@
+"""
+Async gateway for every request to the OpenAI API
+"""
+import asyncio
+import os
+import random
+import time
+from collections import Counter
+from contextlib import AsyncExitStack, asynccontextmanager, nullcontext
+from datetime import datetime
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import logging
+
+import httpx
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.db.database import get_llm_usage_collection
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: timeouts, conflicts, rate limits and server errors
+RETRY_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+MAX_RETRY_AFTER_SECONDS = 30.0
+USAGE_FIELDS = ("prompt_tokens", "completion_tokens", "total_tokens")
+
+
+def get_api_key() -> Optional[str]:
+    """OpenAI API key from settings or the frontend's VITE_ variable"""
+    return settings.OPENAI_API_KEY or os.getenv("VITE_OPENAI_API_KEY")
+
+
+class LLMError(Exception):
+    """An LLM request that failed; ``status_code`` is suitable for an HTTP error"""
+
+    def __init__(self, status_code: int, detail: Any):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class CircuitBreaker:
+    """Stop calling an upstream that keeps failing.
+
+    After ``failure_threshold`` consecutive failed requests the circuit opens
+    and requests are rejected without a network call. Once ``reset_timeout``
+    seconds have passed one trial request is let through; success closes the
+    circuit, failure keeps it open for another ``reset_timeout``.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return self._failures >= self.failure_threshold
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now"""
+        if not self.is_open:
+            return True
+        now = time.monotonic()
+        if now - self._opened_at >= self.reset_timeout:
+            # Half-open: let this request through and hold the rest back
+            self._opened_at = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self.is_open:
+            self._opened_at = time.monotonic()
+
+
+class LLMStream:
+    """Streamed LLM response; iterate ``aiter_lines()`` and always ``aclose()``"""
+
+    def __init__(self, gateway: "LLMClient", response: httpx.Response, stack: AsyncExitStack, user_id: Optional[str], model: str):
+        self.response = response
+        self._gateway = gateway
+        self._stack = stack
+        self._user_id = user_id
+        self._model = model
+
+    async def aiter_lines(self) -> AsyncIterator[str]:
+        """Upstream SSE lines as they arrive; token usage is recorded on the way"""
+        async for line in self.response.aiter_lines():
+            if line.startswith("data: {") and '"usage"' in line:
+                try:
+                    self._gateway.record_usage(self._user_id, self._model, json.loads(line[6:]).get("usage"))
+                except ValueError:
+                    pass
+            yield line
+
+    async def aclose(self) -> None:
+        await self._stack.aclose()
+
+
+class LLMClient:
+    """One pooled ``httpx.AsyncClient`` shared by every AI feature.
+
+    The client is created at startup and keeps up to OPENAI_MAX_CONNECTIONS
+    connections open (over HTTP/2 when the ``h2`` package is installed).
+    At most LLM_MAX_CONCURRENCY requests are in flight, and at most
+    LLM_MAX_CONCURRENCY_PER_USER for one user; the rest wait their turn.
+    Timeouts, 429s and 5xx responses are retried LLM_MAX_RETRIES times with
+    exponential backoff and jitter, honouring ``Retry-After``. Requests that
+    still fail feed a circuit breaker that sheds load while the upstream is
+    down. Token usage from each response is counted per user, model and day
+    and flushed to ``llm_usage`` every LLM_USAGE_FLUSH_INTERVAL_SECONDS.
+    OPENAI_BASE_URL can point at ``scripts/mock_openai.py`` for local testing.
+    """
+
+    def __init__(
+        self,
+        base_url: str = settings.OPENAI_BASE_URL,
+        timeout: float = settings.OPENAI_TIMEOUT_SECONDS,
+        max_connections: int = settings.OPENAI_MAX_CONNECTIONS,
+        max_concurrency: int = settings.LLM_MAX_CONCURRENCY,
+        max_concurrency_per_user: int = settings.LLM_MAX_CONCURRENCY_PER_USER,
+        max_retries: int = settings.LLM_MAX_RETRIES,
+        retry_delay: float = settings.LLM_RETRY_DELAY_SECONDS,
+        usage_flush_interval: float = settings.LLM_USAGE_FLUSH_INTERVAL_SECONDS
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_concurrency_per_user = max_concurrency_per_user
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.usage_flush_interval = usage_flush_interval
+        self.breaker = CircuitBreaker(
+            settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+            settings.LLM_CIRCUIT_RESET_SECONDS
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # user_id -> [semaphore, number of requests holding or waiting for it]
+        self._user_slots: Dict[str, list] = {}
+        self._usage: Counter = Counter()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Create the pooled client and start the usage flush task"""
+        if self._client is None:
+            try:
+                import h2  # noqa: F401
+                http2 = True
+            except ImportError:
+                http2 = False
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=http2,
+                timeout=httpx.Timeout(self.timeout, connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+            logger.info(f"LLM client started ({self.base_url}, HTTP/{'2' if http2 else '1.1'})")
+        try:
+            if self._task is None or self._task.done():
+                self._task = asyncio.create_task(self._run())
+        except RuntimeError:
+            # No running loop (created from a script); usage is flushed on stop()
+            pass
+
+    async def stop(self) -> None:
+        """Stop the flush task, write pending usage and close pooled connections"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush_usage()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created lazily outside the app (scripts, tests)
+        if self._client is None:
+            self.start()
+        return self._client
+
+    @asynccontextmanager
+    async def _slot(self, user_id: Optional[str]):
+        entry = None
+        if user_id:
+            entry = self._user_slots.setdefault(user_id, [asyncio.Semaphore(self.max_concurrency_per_user), 0])
+            entry[1] += 1
+        try:
+            # Wait for the user's own slot first so one user's backlog does not hold global slots
+            async with (entry[0] if entry else nullcontext()):
+                async with self._semaphore:
+                    yield
+        finally:
+            if entry:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    self._user_slots.pop(user_id, None)
+
+    async def _send(self, path: str, payload: Dict[str, Any], stream: bool, timeout: Optional[float]) -> httpx.Response:
+        if not self.breaker.allow():
+            raise LLMError(503, "AI service temporarily unavailable, please try again shortly")
+
+        headers = {"Authorization": f"Bearer {get_api_key()}"}
+        error: LLMError = LLMError(500, "LLM request failed")
+        for attempt in range(self.max_retries + 1):
+            delay = self.retry_delay * 2 ** attempt
+            try:
+                request = self.client.build_request(
+                    "POST", path, json=payload, headers=headers,
+                    timeout=timeout if timeout is not None else self.client.timeout
+                )
+                response = await self.client.send(request, stream=stream)
+            except httpx.TimeoutException:
+                error = LLMError(408, "Request timeout")
+            except httpx.RequestError as e:
+                error = LLMError(500, f"Network error: {str(e)}")
+            else:
+                if response.status_code == 200:
+                    self.breaker.record_success()
+                    return response
+                content = await response.aread()
+                await response.aclose()
+                try:
+                    detail = json.loads(content) if content else "OpenAI API error"
+                except ValueError:
+                    detail = content.decode(errors="replace")
+                error = LLMError(response.status_code, detail)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    # The request itself is wrong; retrying or tripping the breaker will not help
+                    raise error
+                retry_after = response.headers.get("retry-after")
+                if retry_after:
+                    try:
+                        delay = max(delay, min(float(retry_after), MAX_RETRY_AFTER_SECONDS))
+                    except ValueError:
+                        pass
+            if attempt < self.max_retries:
+                logger.warning(f"LLM request to {path} failed (attempt {attempt + 1}): {error.detail}")
+                await asyncio.sleep(delay + random.uniform(0, self.retry_delay))
+
+        self.breaker.record_failure()
+        raise error
+
+    async def request(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        user_id: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """POST a JSON payload and return the decoded response; raises LLMError"""
+        async with self._slot(user_id):
+            response = await self._send(path, payload, stream=False, timeout=timeout)
+        data = response.json()
+        self.record_usage(user_id, payload.get("model", ""), data.get("usage"))
+        return data
+
+    async def open_stream(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        user_id: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> LLMStream:
+        """POST a JSON payload and return the stream once the upstream accepts it.
+
+        The concurrency slot is held until the stream is closed. Raises
+        LLMError if the request fails before the first byte.
+        """
+        stack = AsyncExitStack()
+        try:
+            await stack.enter_async_context(self._slot(user_id))
+            response = await self._send(path, payload, stream=True, timeout=timeout)
+        except BaseException:
+            await stack.aclose()
+            raise
+        stack.push_async_callback(response.aclose)
+        return LLMStream(self, response, stack, user_id, payload.get("model", ""))
+
+    def record_usage(self, user_id: Optional[str], model: str, usage: Optional[Dict[str, Any]]) -> None:
+        """Count the tokens reported in a response's ``usage`` block"""
+        if not usage:
+            return
+        key = (user_id or "anonymous", model or "unknown", datetime.utcnow().strftime("%Y-%m-%d"))
+        self._usage[key + ("requests",)] += 1
+        for field in USAGE_FIELDS:
+            self._usage[key + (field,)] += int(usage.get(field) or 0)
+
+    async def flush_usage(self) -> int:
+        """Write counted token usage; returns the number of usage documents updated"""
+        if not self._usage:
+            return 0
+        usage, self._usage = self._usage, Counter()
+        increments: Dict[Tuple[str, str, str], Dict[str, int]] = {}
+        for (user_id, model, day, field), count in usage.items():
+            increments.setdefault((user_id, model, day), {})[field] = count
+        operations = [
+            UpdateOne(
+                {"user_id": user_id, "model": model, "date": day},
+                {"$inc": counts, "$set": {"updated_at": datetime.utcnow()}},
+                upsert=True
+            )
+            for (user_id, model, day), counts in increments.items()
+        ]
+        try:
+            await get_llm_usage_collection().bulk_write(operations, ordered=False)
+            return len(operations)
+        except Exception as e:
+            # Keep the counts so the next flush retries them
+            self._usage.update(usage)
+            logger.error(f"Failed to flush LLM token usage: {e}")
+            return 0
+
+    async def get_usage(self, user_id: str, since: str) -> List[Dict[str, Any]]:
+        """Daily token usage per model for a user since ``since`` (YYYY-MM-DD)"""
+        await self.flush_usage()
+        cursor = get_llm_usage_collection().find(
+            {"user_id": user_id, "date": {"$gte": since}},
+            {"_id": 0, "user_id": 0}
+        ).sort("date", 1)
+        return await cursor.to_list(length=None)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.usage_flush_interval)
+            try:
+                await self.flush_usage()
+            except Exception as e:
+                logger.error(f"Error flushing LLM token usage: {e}")
+
+
+# Global instance
+llm_client = LLMClient()
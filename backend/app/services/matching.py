@@ -1,7 +1,6 @@
 from sentence_transformers import SentenceTransformer, util
 import numpy as np
-from app.services import openai_service
-from app.core.config import settings
+from app.services.embedding_service import embedding_service
 
 # Load a pre-trained model (can be replaced with a more advanced one)
 model = SentenceTransformer('all-MiniLM-L6-v2')
@@ -41,11 +40,9 @@ def add_feedback(resume_id: int, job_id: int, score: float, feedback: int):
     return True
 
 
-def openai_match_score(resume_text: str, job_text: str) -> float:
-    if not settings.OPENAI_API_KEY:
-        return match_score(resume_text, job_text)
-    emb_resume = openai_service.get_embedding(resume_text)
-    emb_job = openai_service.get_embedding(job_text)
+async def openai_match_score(resume_text: str, job_text: str) -> float:
+    # Both vectors come from the same model: OpenAI, or the local model as a fallback
+    _, (emb_resume, emb_job) = await embedding_service.embed_many([resume_text, job_text])
     # Cosine similarity
     score = float(np.dot(emb_resume, emb_job) / (np.linalg.norm(emb_resume) * np.linalg.norm(emb_job)))
-    return score 
\ No newline at end of file
+    return score
@@ -0,0 +1,132 @@
+"""
+In-process pub/sub for pushing notification events to connected clients
+"""
+import asyncio
+import json
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Set
+import logging
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+from app.db.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "notifications:events"
+
+
+class NotificationBroker:
+    """Fan notification events out to the streams of each user.
+
+    Every open WebSocket/SSE connection subscribes with a bounded queue.
+    Events are delivered to local subscribers directly; when REDIS_ENABLED
+    is set they are also published on a Redis channel so that connections
+    held by other workers receive them. A subscriber that falls behind
+    loses its oldest events instead of slowing down publishers.
+    """
+
+    def __init__(self, queue_size: int = settings.NOTIFICATION_STREAM_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        # Identifies this worker so it can skip its own messages from Redis
+        self._origin = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start relaying events published by other workers"""
+        if get_redis() is None:
+            return
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+            logger.info(f"Notification broker listening on Redis channel {CHANNEL}")
+
+    async def stop(self) -> None:
+        """Stop the Redis relay"""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def subscriber_count(self, user_id: Optional[str] = None) -> int:
+        """Number of open streams, for one user or overall"""
+        if user_id is not None:
+            return len(self._subscribers.get(user_id, ()))
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: str) -> AsyncIterator[asyncio.Queue]:
+        """Register a stream for ``user_id`` and yield the queue it reads from"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(user_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+
+    async def publish(self, user_id: str, event: Dict[str, Any]) -> None:
+        """Send an event to every stream of ``user_id`` on all workers"""
+        if not user_id:
+            return
+        event = jsonable_encoder(event)
+        self._deliver(user_id, event)
+
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.publish(CHANNEL, json.dumps({
+                "origin": self._origin,
+                "user_id": user_id,
+                "event": event
+            }))
+        except Exception as e:
+            logger.warning(f"Failed to publish notification event to Redis: {e}")
+
+    def _deliver(self, user_id: str, event: Dict[str, Any]) -> None:
+        for queue in list(self._subscribers.get(user_id, ())):
+            if queue.full():
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            queue.put_nowait(event)
+
+    async def _listen(self) -> None:
+        while True:
+            redis = get_redis()
+            if redis is None:
+                return
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.subscribe(CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    payload = json.loads(message["data"])
+                    if payload.get("origin") == self._origin:
+                        continue
+                    self._deliver(payload["user_id"], payload["event"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Notification relay interrupted, reconnecting: {e}")
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+# Global instance
+notification_broker = NotificationBroker()
@@ -0,0 +1,138 @@
+"""
+Per-user unread notification counters maintained incrementally
+"""
+import asyncio
+from datetime import datetime
+from typing import Dict, Optional
+import logging
+
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.db.database import get_notification_counters_collection, get_notifications_collection
+
+logger = logging.getLogger(__name__)
+
+# A notification counts as unread until it is read, archived or deleted
+UNREAD_QUERY = {"is_read": False, "is_archived": {"$ne": True}}
+
+
+def unread_adjustment(delta: int) -> list:
+    # Update pipeline so the counter never drops below zero
+    return [{"$set": {
+        "unread": {"$max": [0, {"$add": [{"$ifNull": ["$unread", 0]}, delta]}]},
+        "updated_at": "$$NOW"
+    }}]
+
+
+class UnreadCounter:
+    """Keep an unread notification count per user in ``notification_counters``.
+
+    A user's counter document (``_id`` is the user id) is seeded with a
+    ``count_documents`` the first time their count is read and from then on
+    adjusted as notifications are created, read, archived or deleted, so
+    reading it is a ``find_one`` by ``_id``. Adjustments for users without a
+    counter are skipped; the seed count already includes them. A background
+    task recomputes every counter each
+    NOTIFICATION_COUNTER_RECONCILE_INTERVAL_SECONDS to correct any drift.
+    """
+
+    def __init__(self, reconcile_interval: float = settings.NOTIFICATION_COUNTER_RECONCILE_INTERVAL_SECONDS):
+        self.reconcile_interval = reconcile_interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the periodic reconciliation task"""
+        if self.reconcile_interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the reconciliation task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def get(self, user_id: str) -> int:
+        """Unread count for a user"""
+        counters = get_notification_counters_collection()
+        counter = await counters.find_one({"_id": user_id}, {"unread": 1})
+        if counter is not None:
+            return counter.get("unread", 0)
+
+        unread = await get_notifications_collection().count_documents({"user_id": user_id, **UNREAD_QUERY})
+        await counters.update_one(
+            {"_id": user_id},
+            {"$setOnInsert": {"unread": unread, "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+        return unread
+
+    async def refresh(self, user_id: str) -> int:
+        """Recount a user's unread notifications after a bulk change"""
+        unread = await get_notifications_collection().count_documents({"user_id": user_id, **UNREAD_QUERY})
+        await get_notification_counters_collection().update_one(
+            {"_id": user_id},
+            {"$set": {"unread": unread, "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+        return unread
+
+    async def adjust(self, user_id: str, delta: int) -> None:
+        """Add ``delta`` to a user's unread count"""
+        await self.adjust_many({user_id: delta})
+
+    async def adjust_many(self, deltas: Dict[str, int]) -> None:
+        """Apply several per-user adjustments with one bulk_write"""
+        operations = [
+            UpdateOne({"_id": user_id}, unread_adjustment(delta))
+            for user_id, delta in deltas.items()
+            if user_id and delta
+        ]
+        if not operations:
+            return
+        try:
+            await get_notification_counters_collection().bulk_write(operations, ordered=False)
+        except Exception as e:
+            # Reconciliation will correct the counters
+            logger.error(f"Error adjusting unread counters: {e}")
+
+    async def reconcile(self) -> int:
+        """Recompute every existing counter from the notifications collection"""
+        counters = get_notification_counters_collection()
+        pipeline = [
+            {"$match": UNREAD_QUERY},
+            {"$group": {"_id": "$user_id", "unread": {"$sum": 1}}}
+        ]
+        actual: Dict[str, int] = {}
+        async for row in get_notifications_collection().aggregate(pipeline):
+            actual[row["_id"]] = row["unread"]
+
+        now = datetime.utcnow()
+        operations = []
+        async for counter in counters.find({}, {"unread": 1}):
+            unread = actual.get(counter["_id"], 0)
+            if counter.get("unread") != unread:
+                operations.append(UpdateOne(
+                    {"_id": counter["_id"]},
+                    {"$set": {"unread": unread, "updated_at": now}}
+                ))
+        if operations:
+            await counters.bulk_write(operations, ordered=False)
+        logger.info(f"Reconciled unread counters: {len(operations)} corrected")
+        return len(operations)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error(f"Error reconciling unread counters: {e}")
+
+
+# Global instance
+unread_counter = UnreadCounter()
@@ -0,0 +1,160 @@
+"""
+Queued, batched delivery of notifications off the request path
+"""
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import logging
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+from app.db.database import get_notification_dead_letters_collection
+from app.services.notification_service import notification_service
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDispatcher:
+    """Accept notifications from request handlers and write them in batches.
+
+    enqueue() only puts documents on a bounded asyncio queue; a background
+    worker drains up to NOTIFICATION_BATCH_SIZE of them (waiting at most
+    NOTIFICATION_BATCH_WAIT_SECONDS for a batch to fill) and stores each
+    batch with one insert_many. Failed writes are retried with exponential
+    backoff, and notifications that still fail are kept in
+    ``notification_dead_letters`` for requeue_dead_letters(). With
+    NOTIFICATION_DISPATCH_BACKEND set to "celery" batches are handed to the
+    Celery worker instead. When the queue is full, enqueue() waits for room.
+    Before start() (e.g. in scripts) notifications are written inline.
+    """
+
+    def __init__(
+        self,
+        max_size: int = settings.NOTIFICATION_QUEUE_MAX_SIZE,
+        batch_size: int = settings.NOTIFICATION_BATCH_SIZE,
+        batch_wait: float = settings.NOTIFICATION_BATCH_WAIT_SECONDS,
+        max_retries: int = settings.NOTIFICATION_DISPATCH_MAX_RETRIES,
+        retry_delay: float = settings.NOTIFICATION_RETRY_DELAY_SECONDS,
+        backend: str = settings.NOTIFICATION_DISPATCH_BACKEND
+    ):
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.backend = backend
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the background delivery worker"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Notification dispatcher started ({self.backend} backend)")
+
+    async def stop(self) -> None:
+        """Stop the worker and deliver everything still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while not self._queue.empty():
+            batch = []
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self._deliver(batch)
+
+    def pending_count(self) -> int:
+        """Number of notifications waiting to be written"""
+        return self._queue.qsize()
+
+    async def enqueue(self, *notification_docs: Dict[str, Any]) -> None:
+        """Queue notification documents for delivery"""
+        docs = [doc for doc in notification_docs if doc and doc.get("user_id")]
+        if not docs:
+            return
+        if self._task is None:
+            await self._deliver(docs)
+            return
+        for doc in docs:
+            try:
+                self._queue.put_nowait(doc)
+            except asyncio.QueueFull:
+                logger.warning("Notification queue full, waiting for the dispatcher to catch up")
+                await self._queue.put(doc)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._deliver(batch)
+            except Exception as e:
+                logger.error(f"Unexpected error delivering notifications: {e}")
+
+    async def _deliver(self, batch: List[Dict[str, Any]]) -> None:
+        if self.backend == "celery":
+            try:
+                from app.worker import deliver_notifications
+                payload = jsonable_encoder(batch, custom_encoder={ObjectId: str})
+                # delay() publishes to the broker over a blocking connection
+                await asyncio.to_thread(deliver_notifications.delay, payload)
+                return
+            except Exception as e:
+                logger.error(f"Failed to hand notifications to Celery, writing them here: {e}")
+
+        pending = batch
+        error: Any = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                pending = await notification_service.insert_notifications(pending)
+                if not pending:
+                    return
+                error = "write errors"
+            except Exception as e:
+                error = e
+            logger.warning(f"Failed to write {len(pending)} notifications (attempt {attempt + 1}): {error}")
+            if attempt < self.max_retries:
+                await asyncio.sleep(self.retry_delay * 2 ** attempt)
+        await self._dead_letter(pending, error, self.max_retries + 1)
+
+    async def _dead_letter(self, notification_docs: List[Dict[str, Any]], error: Any, attempts: int) -> None:
+        failed_at = datetime.utcnow()
+        try:
+            await get_notification_dead_letters_collection().insert_many([
+                {"notification": doc, "error": str(error), "attempts": attempts, "failed_at": failed_at}
+                for doc in notification_docs
+            ])
+            logger.error(f"Moved {len(notification_docs)} notifications to the dead-letter store: {error}")
+        except Exception as e:
+            logger.error(f"Failed to store {len(notification_docs)} undeliverable notifications: {e}; lost: {notification_docs}")
+
+    async def requeue_dead_letters(self, limit: int = 1000) -> int:
+        """Move dead-lettered notifications back onto the queue; returns how many"""
+        dead_letters = get_notification_dead_letters_collection()
+        entries = await dead_letters.find().sort("failed_at", 1).limit(limit).to_list(length=limit)
+        if not entries:
+            return 0
+        await dead_letters.delete_many({"_id": {"$in": [entry["_id"] for entry in entries]}})
+        await self.enqueue(*(entry["notification"] for entry in entries))
+        return len(entries)
+
+
+# Global instance
+notification_dispatcher = NotificationDispatcher()
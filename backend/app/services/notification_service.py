@@ -1,14 +1,34 @@
 """
 Notification service for sending notifications to users
 """
-from datetime import datetime
-from typing import Optional, Dict, Any
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
 from app.db.database import get_notifications_collection
 from app.schemas.mongodb_schemas import MongoDBNotification
+from app.services.notification_broker import notification_broker
+from app.services.notification_counter import unread_counter
+from app.services.templates import template_registry
 import logging
 
 logger = logging.getLogger(__name__)
 
+DUPLICATE_KEY_ERROR = 11000
+
+# Notification type (and template under notifications/) for each application status
+APPLICATION_STATUS_NOTIFICATIONS = {
+    "accepted": "application_accepted",
+    "rejected": "application_rejected",
+    "shortlisted": "application_shortlisted",
+    "interviewing": "application_interview",
+    "interview_scheduled": "application_interview",
+    "reviewing": "application_reviewing",
+    "under_review": "application_reviewing",
+}
+DEFAULT_STATUS_NOTIFICATION = "application_status_change"
+
 
 class NotificationService:
     """Service for creating and managing notifications"""
@@ -27,28 +47,277 @@ class NotificationService:
     ) -> Optional[MongoDBNotification]:
         """Create a new notification for a user"""
         try:
-            notification_doc = {
-                "user_id": user_id,
-                "title": title,
-                "message": message,
-                "notification_type": notification_type,
-                "data": data or {},
-                "action_url": action_url,
-                "is_read": False,
-                "is_archived": False,
-                "created_at": datetime.utcnow(),
-                "read_at": None
-            }
+            notification_doc = self._notification_doc(
+                user_id, title, message, notification_type, data, action_url
+            )
             
             result = await self.notifications_collection.insert_one(notification_doc)
             notification_doc["_id"] = str(result.inserted_id)
             
             logger.info(f"Created notification for user {user_id}: {title}")
+            await self.notify_created(notification_doc)
             return MongoDBNotification(**notification_doc)
         except Exception as e:
             logger.error(f"Error creating notification: {e}")
             return None
     
+    def _notification_doc(
+        self,
+        user_id: str,
+        title: str,
+        message: str,
+        notification_type: str,
+        data: Optional[Dict[str, Any]] = None,
+        action_url: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build a notification document ready for insertion"""
+        return {
+            "user_id": user_id,
+            "title": title,
+            "message": message,
+            "notification_type": notification_type,
+            "data": data or {},
+            "action_url": action_url,
+            "is_read": False,
+            "is_archived": False,
+            "created_at": datetime.utcnow(),
+            "read_at": None,
+            "archived_at": None
+        }
+    
+    async def create_notifications(self, notification_docs: List[Dict[str, Any]]) -> int:
+        """Insert many notifications with a single insert_many; returns the count inserted"""
+        if not notification_docs:
+            return 0
+        try:
+            failed = await self.insert_notifications(notification_docs)
+            return len(notification_docs) - len(failed)
+        except Exception as e:
+            logger.error(f"Error creating notifications: {e}")
+            return 0
+    
+    async def insert_notifications(self, notification_docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert notifications with one unordered insert_many and return the
+        documents that could not be written.
+
+        Documents rejected as duplicates were stored by an earlier attempt and
+        count as written. Errors that fail the whole batch are raised.
+        """
+        if not notification_docs:
+            return []
+        failed_indexes = set()
+        try:
+            await self.notifications_collection.insert_many(notification_docs, ordered=False)
+        except BulkWriteError as e:
+            failed_indexes = {
+                error["index"] for error in e.details.get("writeErrors", [])
+                if error.get("code") != DUPLICATE_KEY_ERROR
+            }
+        
+        written, failed = [], []
+        for index, notification_doc in enumerate(notification_docs):
+            (failed if index in failed_indexes else written).append(notification_doc)
+        
+        deltas: Dict[str, int] = {}
+        for notification_doc in written:
+            notification_doc["_id"] = str(notification_doc["_id"])
+            if self._is_unread(notification_doc):
+                deltas[notification_doc["user_id"]] = deltas.get(notification_doc["user_id"], 0) + 1
+        await unread_counter.adjust_many(deltas)
+        for notification_doc in written:
+            await self._publish_created(notification_doc)
+        
+        logger.info(f"Created {len(written)} notifications")
+        return failed
+    
+    async def get_unread_count(self, user_id: str) -> int:
+        """Number of unread notifications for a user"""
+        return await unread_counter.get(user_id)
+    
+    async def notify_created(self, notification_doc: Dict[str, Any]) -> None:
+        """Count a newly stored notification and push it to the user's open streams"""
+        if self._is_unread(notification_doc):
+            await unread_counter.adjust(notification_doc.get("user_id"), 1)
+        await self._publish_created(notification_doc)
+    
+    async def _publish_created(self, notification_doc: Dict[str, Any]) -> None:
+        await notification_broker.publish(notification_doc.get("user_id"), {
+            "type": "notification.created",
+            "notification": notification_doc
+        })
+    
+    @staticmethod
+    def _is_unread(notification_doc: Dict[str, Any]) -> bool:
+        return not notification_doc.get("is_read") and not notification_doc.get("is_archived")
+    
+    def _owned(self, notification_id: str, user_id: Optional[str]) -> Dict[str, Any]:
+        query: Dict[str, Any] = {"_id": ObjectId(notification_id)}
+        if user_id is not None:
+            query["user_id"] = user_id
+        return query
+    
+    async def _update_notification(
+        self,
+        notification_id: str,
+        update: Dict[str, Any],
+        event_type: str,
+        user_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        previous = await self.notifications_collection.find_one_and_update(
+            self._owned(notification_id, user_id),
+            {"$set": update},
+            projection={"user_id": 1, "is_read": 1, "is_archived": 1},
+            return_document=ReturnDocument.BEFORE
+        )
+        if previous is not None:
+            delta = int(self._is_unread({**previous, **update})) - int(self._is_unread(previous))
+            if delta:
+                await unread_counter.adjust(previous.get("user_id"), delta)
+            await notification_broker.publish(previous.get("user_id"), {
+                "type": event_type,
+                "notification_id": notification_id
+            })
+        return previous
+    
+    async def mark_as_read(self, notification_id: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Mark a notification as read; returns its previous state, or None if missing"""
+        return await self._update_notification(
+            notification_id,
+            {"is_read": True, "read_at": datetime.utcnow()},
+            "notification.read",
+            user_id
+        )
+    
+    async def mark_as_unread(self, notification_id: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Mark a notification as unread; returns its previous state, or None if missing"""
+        return await self._update_notification(
+            notification_id,
+            {"is_read": False, "read_at": None},
+            "notification.unread",
+            user_id
+        )
+    
+    async def archive_notification(self, notification_id: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Archive a notification; returns its previous state, or None if missing"""
+        return await self._update_notification(
+            notification_id,
+            {"is_archived": True, "archived_at": datetime.utcnow()},
+            "notification.archived",
+            user_id
+        )
+    
+    async def delete_notification(self, notification_id: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Delete a notification; returns the deleted document, or None if missing"""
+        deleted = await self.notifications_collection.find_one_and_delete(
+            self._owned(notification_id, user_id),
+            projection={"user_id": 1, "is_read": 1, "is_archived": 1}
+        )
+        if deleted is not None:
+            if self._is_unread(deleted):
+                await unread_counter.adjust(deleted.get("user_id"), -1)
+            await notification_broker.publish(deleted.get("user_id"), {
+                "type": "notification.deleted",
+                "notification_id": notification_id
+            })
+        return deleted
+    
+    async def mark_all_as_read(self, user_id: str, before: Optional[datetime] = None) -> int:
+        """Mark every unread notification of a user as read, optionally only those
+        created at or before ``before``; returns the number updated"""
+        query: Dict[str, Any] = {"user_id": user_id, "is_read": False}
+        if before is not None:
+            query["created_at"] = {"$lte": before}
+        result = await self.notifications_collection.update_many(
+            query,
+            {"$set": {"is_read": True, "read_at": datetime.utcnow()}}
+        )
+        if result.modified_count:
+            await unread_counter.refresh(user_id)
+            await notification_broker.publish(user_id, {
+                "type": "notifications.read",
+                "before": before,
+                "count": result.modified_count
+            })
+        return result.modified_count
+    
+    async def archive_older_than(self, user_id: str, days: int) -> int:
+        """Archive a user's notifications created more than ``days`` days ago;
+        returns the number archived"""
+        now = datetime.utcnow()
+        before = now - timedelta(days=days)
+        result = await self.notifications_collection.update_many(
+            {"user_id": user_id, "created_at": {"$lt": before}, "is_archived": {"$ne": True}},
+            {"$set": {"is_archived": True, "archived_at": now}}
+        )
+        if result.modified_count:
+            await unread_counter.refresh(user_id)
+            await notification_broker.publish(user_id, {
+                "type": "notifications.archived",
+                "before": before,
+                "count": result.modified_count
+            })
+        return result.modified_count
+    
+    def build_application_status_notification(
+        self,
+        applicant_id: str,
+        job_title: str,
+        company_name: str,
+        status: str,
+        job_id: str,
+        application_id: str,
+        locale: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build the notification document for an application status change"""
+        return self.build_application_status_notifications([{
+            "applicant_id": applicant_id,
+            "job_title": job_title,
+            "company_name": company_name,
+            "status": status,
+            "job_id": job_id,
+            "application_id": application_id
+        }], locale)[0]
+    
+    def build_application_status_notifications(
+        self,
+        items: List[Dict[str, Any]],
+        locale: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Build status change notifications for many applications at once.
+
+        Each item holds applicant_id, job_title, company_name, status, job_id
+        and application_id. Items are rendered per template in one pass.
+        """
+        by_type: Dict[str, List[int]] = {}
+        for index, item in enumerate(items):
+            notification_type = APPLICATION_STATUS_NOTIFICATIONS.get(item["status"], DEFAULT_STATUS_NOTIFICATION)
+            by_type.setdefault(notification_type, []).append(index)
+        
+        docs: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        for notification_type, indexes in by_type.items():
+            rendered = template_registry.render_many(
+                f"notifications/{notification_type}.txt",
+                (items[index] for index in indexes),
+                locale
+            )
+            for index, content in zip(indexes, rendered):
+                item = items[index]
+                docs[index] = self._notification_doc(
+                    user_id=item["applicant_id"],
+                    title=content.title,
+                    message=content.body,
+                    notification_type=notification_type,
+                    data={
+                        "job_id": item["job_id"],
+                        "application_id": item["application_id"],
+                        "job_title": item["job_title"],
+                        "company_name": item["company_name"],
+                        "status": item["status"]
+                    },
+                    action_url=f"/applications/{item['application_id']}"
+                )
+        return docs
+    
     async def create_application_status_notification(
         self,
         applicant_id: str,
@@ -60,55 +329,48 @@ class NotificationService:
     ) -> Optional[MongoDBNotification]:
         """Create a notification for application status change"""
         try:
-            # Create appropriate message based on status
-            if status == "accepted":
-                title = f"🎉 Application Accepted!"
-                message = f"Congratulations! Your application for {job_title} at {company_name} has been accepted. The employer will contact you soon."
-                notification_type = "application_accepted"
-            elif status == "rejected":
-                title = f"Application Update"
-                message = f"Thank you for your interest in {job_title} at {company_name}. While we were impressed with your qualifications, we have decided to move forward with other candidates."
-                notification_type = "application_rejected"
-            elif status == "shortlisted":
-                title = f"🌟 You've Been Shortlisted!"
-                message = f"Great news! You've been shortlisted for {job_title} at {company_name}. Expect to hear from them soon for the next steps."
-                notification_type = "application_shortlisted"
-            elif status == "interviewing":
-                title = f"📅 Interview Scheduled"
-                message = f"You've been selected for an interview for {job_title} at {company_name}. Check your email for interview details."
-                notification_type = "application_interview"
-            elif status == "reviewing":
-                title = f"Application Under Review"
-                message = f"Your application for {job_title} at {company_name} is being reviewed by the employer."
-                notification_type = "application_reviewing"
-            else:
-                title = f"Application Status Update"
-                message = f"Your application status for {job_title} at {company_name} has been updated to: {status}"
-                notification_type = "application_status_change"
-            
-            # Create notification data
-            data = {
-                "job_id": job_id,
-                "application_id": application_id,
-                "job_title": job_title,
-                "company_name": company_name,
-                "status": status
-            }
-            
-            action_url = f"/applications/{application_id}"
-            
+            doc = self.build_application_status_notification(
+                applicant_id, job_title, company_name, status, job_id, application_id
+            )
             return await self.create_notification(
-                user_id=applicant_id,
-                title=title,
-                message=message,
-                notification_type=notification_type,
-                data=data,
-                action_url=action_url
+                user_id=doc["user_id"],
+                title=doc["title"],
+                message=doc["message"],
+                notification_type=doc["notification_type"],
+                data=doc["data"],
+                action_url=doc["action_url"]
             )
         except Exception as e:
             logger.error(f"Error creating application status notification: {e}")
             return None
     
+    def build_new_application_notification(
+        self,
+        employer_id: str,
+        applicant_name: str,
+        job_title: str,
+        job_id: str,
+        application_id: str,
+        locale: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build the notification document telling an employer about a new application"""
+        data = {
+            "job_id": job_id,
+            "application_id": application_id,
+            "job_title": job_title,
+            "applicant_name": applicant_name
+        }
+        content = template_registry.render("notifications/new_application.txt", locale, **data)
+        
+        return self._notification_doc(
+            user_id=employer_id,
+            title=content.title,
+            message=content.body,
+            notification_type="new_application",
+            data=data,
+            action_url=f"/employer/applications/{job_id}"
+        )
+    
     async def create_new_application_notification(
         self,
         employer_id: str,
@@ -119,26 +381,16 @@ class NotificationService:
     ) -> Optional[MongoDBNotification]:
         """Create a notification for employers when someone applies to their job"""
         try:
-            title = f"🎯 New Job Application"
-            message = f"{applicant_name} has applied for your {job_title} position. Review their application now."
-            notification_type = "new_application"
-            
-            data = {
-                "job_id": job_id,
-                "application_id": application_id,
-                "job_title": job_title,
-                "applicant_name": applicant_name
-            }
-            
-            action_url = f"/employer/applications/{job_id}"
-            
+            doc = self.build_new_application_notification(
+                employer_id, applicant_name, job_title, job_id, application_id
+            )
             return await self.create_notification(
-                user_id=employer_id,
-                title=title,
-                message=message,
-                notification_type=notification_type,
-                data=data,
-                action_url=action_url
+                user_id=doc["user_id"],
+                title=doc["title"],
+                message=doc["message"],
+                notification_type=doc["notification_type"],
+                data=doc["data"],
+                action_url=doc["action_url"]
             )
         except Exception as e:
             logger.error(f"Error creating new application notification: {e}")
@@ -1,20 +1,27 @@
-import openai
+from typing import List, Optional, Sequence
+
 from app.core.config import settings
+from app.services.embedding_service import embedding_service
+from app.services.llm_client import llm_client
 
-openai.api_key = settings.OPENAI_API_KEY
-# Embedding function
-def get_embedding(text: str, model: str = "text-embedding-3-small"):
-    response = openai.embeddings.create(
-        input=text,
-        model=model
-    )
-    return response.data[0].embedding
+
+# Embedding function (cached and batched with concurrent calls)
+async def get_embedding(text: str, model: str = settings.EMBEDDING_MODEL) -> List[float]:
+    return (await embedding_service.embed(text, model)).tolist()
+
+# Batch embedding function
+async def get_embeddings(texts: Sequence[str], model: str = settings.EMBEDDING_MODEL) -> List[List[float]]:
+    return [vector.tolist() for vector in await embedding_service.embed_batch(texts, model)]
 
 # GPT-4 completion function
-def gpt4_completion(prompt: str, model: str = "gpt-4o"):
-    response = openai.chat.completions.create(
-        model=model,
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=512
+async def gpt4_completion(prompt: str, model: str = "gpt-4o", user_id: Optional[str] = None) -> str:
+    data = await llm_client.request(
+        "/chat/completions",
+        {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": 512
+        },
+        user_id=user_id
     )
-    return response.choices[0].message.content 
\ No newline at end of file
+    return data["choices"][0]["message"]["content"]
@@ -0,0 +1,143 @@
+"""
+Cache of rendered resume PDFs, keyed by the resume data
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+import logging
+
+from app.core.config import settings
+from app.services.pdf_generator import DEFAULT_TEMPLATE, TEMPLATES
+
+logger = logging.getLogger(__name__)
+
+PURGE_INTERVAL_SECONDS = 3600
+
+
+def resume_data_hash(resume_data: Dict[str, Any], template_id: str = DEFAULT_TEMPLATE) -> str:
+    """SHA-256 of resume data as canonical JSON, the template and its version"""
+    canonical = json.dumps(resume_data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    version = TEMPLATES[template_id]["version"]
+    return hashlib.sha256(f"{template_id}:{version}:{canonical}".encode("utf-8")).hexdigest()
+
+
+class PDFCache:
+    """Rendered PDFs stored as files, so the same resume is rendered once.
+
+    Files are named by resume_data_hash(): the same data and template always
+    map to the same file, whatever the key order, and bumping a template's
+    version leaves its old files unreachable. The hash doubles as the
+    response ETag. Files live under PDF_CACHE_DIR (not the public uploads
+    directory, since resumes hold personal details) and are deleted
+    PDF_CACHE_TTL_DAYS after their last use. File access runs in a thread, and errors count as a miss.
+    """
+
+    def __init__(
+        self,
+        directory: str = settings.PDF_CACHE_DIR,
+        ttl_days: int = settings.PDF_CACHE_TTL_DAYS,
+        enabled: bool = settings.PDF_CACHE_ENABLED
+    ):
+        self.directory = directory
+        self.ttl = ttl_days * 86400
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start deleting expired files in the background"""
+        if self.enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                removed = await asyncio.to_thread(self.purge_expired)
+                if removed:
+                    logger.info(f"Removed {removed} expired cached PDFs")
+            except Exception as e:
+                logger.error(f"Error purging cached PDFs: {e}")
+            await asyncio.sleep(PURGE_INTERVAL_SECONDS)
+
+    def _path(self, key: str) -> str:
+        # Two-character shards keep directories small
+        return os.path.join(self.directory, key[:2], f"{key}.pdf")
+
+    def _read(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+        # Last use decides expiry
+        os.utime(path)
+        return content
+
+    def _write(self, key: str, pdf_content: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Written under a temporary name so readers never see a partial file
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(pdf_content)
+        os.replace(temporary, path)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Cached PDF for a resume_data_hash(), or None"""
+        if not self.enabled:
+            return None
+        try:
+            content = await asyncio.to_thread(self._read, key)
+        except Exception as e:
+            logger.error(f"Error reading cached PDF: {e}")
+            content = None
+        if content is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return content
+
+    async def put(self, key: str, pdf_content: bytes) -> None:
+        """Store a rendered PDF"""
+        if not self.enabled:
+            return
+        try:
+            await asyncio.to_thread(self._write, key, pdf_content)
+        except Exception as e:
+            logger.error(f"Error caching PDF: {e}")
+
+    def purge_expired(self) -> int:
+        """Delete files unused for PDF_CACHE_TTL_DAYS; returns how many were deleted"""
+        cutoff = time.time() - self.ttl
+        removed = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+# Global instance
+pdf_cache = PDFCache()
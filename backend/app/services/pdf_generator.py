@@ -1,12 +1,17 @@
 import os
 import io
+import copy
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
 from reportlab.lib.units import inch
 from reportlab.lib.colors import HexColor, black, white
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.lib.fonts import addMapping
+from reportlab.platypus import (
+    BaseDocTemplate, Frame, FrameBreak, NextPageTemplate, PageTemplate,
+    Paragraph, Spacer, Table, TableStyle, PageBreak
+)
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT, TA_JUSTIFY
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
@@ -15,198 +20,254 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-class PDFGenerator:
-    def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
-    
-    def _setup_custom_styles(self):
-        """Setup custom paragraph styles for the resume"""
+# Resume templates. Bump a template's version whenever its rendered layout
+# changes; cached PDFs from older versions are then rendered again.
+DEFAULT_TEMPLATE = 'classic'
+TEMPLATES = {
+    'classic': {
+        'name': 'Classic',
+        'version': 2,
+        'accent': '#1e40af',
+        'boxed_headers': True
+    },
+    'compact': {
+        'name': 'Compact',
+        'version': 1,
+        'font': 'Vera',
+        'accent': '#0f766e',
+        'font_scale': 0.85,
+        'leading': 1.2,
+        'spacing': 0.6,
+        'margin': 0.5 * inch
+    },
+    'two-column': {
+        'name': 'Two column',
+        'version': 1,
+        'font': 'Vera',
+        'accent': '#7c3aed',
+        'font_scale': 0.9,
+        'leading': 1.2,
+        'spacing': 0.8,
+        'margin': 0.6 * inch,
+        'sidebar_width': 0.32,
+        'sidebar_sections': ('skills', 'education', 'certifications')
+    },
+    'ats': {
+        'name': 'ATS plain',
+        'version': 1,
+        'plain': True,
+        'bullet': '-',
+        'section_titles': {
+            'summary': 'SUMMARY',
+            'experience': 'EXPERIENCE',
+            'education': 'EDUCATION',
+            'skills': 'SKILLS',
+            'projects': 'PROJECTS',
+            'certifications': 'CERTIFICATIONS'
+        }
+    }
+}
+
+SECTIONS = ('summary', 'experience', 'education', 'skills', 'projects', 'certifications')
+SECTION_TITLES = {
+    'summary': 'Professional Summary',
+    'experience': 'Professional Experience',
+    'education': 'Education',
+    'skills': 'Skills',
+    'projects': 'Projects',
+    'certifications': 'Certifications'
+}
+
+# TrueType families registered with pdfmetrics (regular and bold files);
+# the Vera fonts ship with reportlab. Other names are standard PDF fonts.
+FONT_FAMILIES = {
+    'Vera': ('Vera.ttf', 'VeraBd.ttf')
+}
+
+# Styles every template derives from, built once per process
+BASE_STYLES = getSampleStyleSheet()
+
+
+def register_font_family(family: str) -> Tuple[str, str]:
+    """Register a font family once; returns its regular and bold font names"""
+    if family not in FONT_FAMILIES:
+        return family, f"{family}-Bold"
+    bold = f"{family}-Bold"
+    if family not in pdfmetrics.getRegisteredFontNames():
+        regular_file, bold_file = FONT_FAMILIES[family]
+        try:
+            pdfmetrics.registerFont(TTFont(family, regular_file))
+            pdfmetrics.registerFont(TTFont(bold, bold_file))
+        except Exception as e:
+            logger.warning(f"Font {family} unavailable, using Helvetica: {e}")
+            return 'Helvetica', 'Helvetica-Bold'
+        # So <b> in paragraphs picks the bold face
+        addMapping(family, 0, 0, family)
+        addMapping(family, 1, 0, bold)
+        addMapping(family, 0, 1, family)
+        addMapping(family, 1, 1, bold)
+    return family, bold
+
+
+class ResumeTemplate:
+    """A resume layout compiled once per process.
+
+    Creating a template registers its fonts, derives its paragraph styles
+    from BASE_STYLES, parses its section headers and lays out its page
+    frames, so rendering a resume only builds the resume's own paragraphs.
+    Frames and header paragraphs hold layout state while a document is
+    built, so each render gets fresh frames and copies of the headers.
+    """
+
+    def __init__(
+        self,
+        template_id: str,
+        name: str,
+        version: int = 1,
+        font: str = 'Helvetica',
+        accent: str = '#1e40af',
+        font_scale: float = 1.0,
+        leading: Optional[float] = None,
+        spacing: float = 1.0,
+        margin: float = 0.75 * inch,
+        boxed_headers: bool = False,
+        plain: bool = False,
+        bullet: str = '•',
+        sidebar_width: float = 0.0,
+        sidebar_sections: Sequence[str] = (),
+        section_titles: Optional[Dict[str, str]] = None
+    ):
+        self.id = template_id
+        self.name = name
+        self.version = version
+        self.accent = accent
+        self.font_scale = font_scale
+        self.leading = leading
+        self.spacing = spacing
+        self.margin = margin
+        self.boxed_headers = boxed_headers
+        self.plain = plain
+        self.bullet = bullet
+        self.sidebar_width = sidebar_width
+        self.sidebar_sections = tuple(sidebar_sections)
+        # The sidebar is narrow, so contact details go one per line there
+        self.contact_separator = "<br/>" if sidebar_width else " | "
+
+        self.font, self.bold_font = register_font_family(font)
+        self.styles = self._compile_styles()
+        titles = {**SECTION_TITLES, **(section_titles or {})}
+        self._section_headers = {
+            section: Paragraph(titles[section], self.styles['SectionHeader']) for section in SECTIONS
+        }
+        self._frames = self._compile_frames()
+
+    def _color(self, value: str):
+        return black if self.plain else HexColor(value)
+
+    def _compile_styles(self) -> StyleSheet1:
+        styles = StyleSheet1()
+
+        def add(name: str, parent: str, font_size: float, **kwargs):
+            kwargs['fontSize'] = font_size * self.font_scale
+            if self.leading:
+                kwargs['leading'] = kwargs['fontSize'] * self.leading
+            for key in ('spaceAfter', 'spaceBefore'):
+                if key in kwargs:
+                    kwargs[key] *= self.spacing
+            styles.add(ParagraphStyle(name=name, parent=BASE_STYLES[parent], **kwargs))
+
+        centered = TA_LEFT if self.plain or self.sidebar_width else TA_CENTER
+        header_box = {}
+        if self.boxed_headers:
+            header_box = dict(
+                borderWidth=1,
+                borderColor=self._color(self.accent),
+                borderPadding=6,
+                backColor=HexColor('#f8fafc')
+            )
+
         # Header style
-        self.styles.add(ParagraphStyle(
-            name='ResumeHeader',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            spaceAfter=12,
-            textColor=HexColor('#1e40af'),
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        ))
-        
+        add('ResumeHeader', 'Heading1', 24, spaceAfter=12, textColor=self._color(self.accent),
+            alignment=centered, fontName=self.bold_font)
         # Section header style
-        self.styles.add(ParagraphStyle(
-            name='SectionHeader',
-            parent=self.styles['Heading2'],
-            fontSize=16,
-            spaceAfter=8,
-            spaceBefore=16,
-            textColor=HexColor('#1e40af'),
-            fontName='Helvetica-Bold',
-            borderWidth=1,
-            borderColor=HexColor('#1e40af'),
-            borderPadding=6,
-            backColor=HexColor('#f8fafc')
-        ))
-        
+        add('SectionHeader', 'Heading2', 16, spaceAfter=8, spaceBefore=16, textColor=self._color(self.accent),
+            fontName=self.bold_font, **header_box)
         # Contact info style
-        self.styles.add(ParagraphStyle(
-            name='ContactInfo',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            spaceAfter=6,
-            alignment=TA_CENTER,
-            fontName='Helvetica'
-        ))
-        
+        add('ContactInfo', 'Normal', 10, spaceAfter=6, alignment=centered, fontName=self.font)
         # Job title style
-        self.styles.add(ParagraphStyle(
-            name='JobTitle',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            spaceAfter=4,
-            fontName='Helvetica-Bold',
-            textColor=HexColor('#374151')
-        ))
-        
+        add('JobTitle', 'Normal', 12, spaceAfter=4, fontName=self.bold_font, textColor=self._color('#374151'))
         # Company style
-        self.styles.add(ParagraphStyle(
-            name='Company',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            spaceAfter=2,
-            fontName='Helvetica-Bold',
-            textColor=HexColor('#6b7280')
-        ))
-        
+        add('Company', 'Normal', 11, spaceAfter=2, fontName=self.bold_font, textColor=self._color('#6b7280'))
         # Date style
-        self.styles.add(ParagraphStyle(
-            name='Date',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            spaceAfter=6,
-            fontName='Helvetica',
-            textColor=HexColor('#9ca3af')
-        ))
-        
+        add('Date', 'Normal', 10, spaceAfter=6, fontName=self.font, textColor=self._color('#9ca3af'))
         # Description style
-        self.styles.add(ParagraphStyle(
-            name='Description',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            spaceAfter=8,
-            fontName='Helvetica',
-            alignment=TA_JUSTIFY,
-            leftIndent=20
-        ))
-        
+        add('Description', 'Normal', 10, spaceAfter=8, fontName=self.font,
+            alignment=TA_LEFT if self.plain else TA_JUSTIFY, leftIndent=0 if self.plain else 20)
         # Skill style
-        self.styles.add(ParagraphStyle(
-            name='Skill',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            spaceAfter=2,
-            fontName='Helvetica'
-        ))
+        add('Skill', 'Normal', 10, spaceAfter=2, fontName=self.font)
+        return styles
+
+    def _compile_frames(self) -> Dict[str, List[Tuple[str, float, float, float, float]]]:
+        """Frame geometry ``(id, x, y, width, height)`` of each page template"""
+        page_width, page_height = A4
+        width = page_width - 2 * self.margin
+        height = page_height - 2 * self.margin
+        full = [('normal', self.margin, self.margin, width, height)]
+        if not self.sidebar_width:
+            return {'page': full}
+
+        gutter = 0.25 * inch
+        sidebar = width * self.sidebar_width
+        return {
+            'first': [
+                ('sidebar', self.margin, self.margin, sidebar, height),
+                ('main', self.margin + sidebar + gutter, self.margin, width - sidebar - gutter, height)
+            ],
+            'later': full
+        }
+
+    def _draw_sidebar(self, canvas, doc):
+        _, x, y, width, height = self._frames['first'][0]
+        canvas.saveState()
+        canvas.setFillColor(HexColor('#f3f4f6'))
+        canvas.rect(x - 6, y - 6, width + 12, height + 12, stroke=0, fill=1)
+        canvas.restoreState()
 
-    def generate_resume_pdf(self, resume_data: Dict[str, Any]) -> bytes:
+    def page_templates(self) -> List[PageTemplate]:
+        """Page templates for one document, with fresh frames"""
+        templates = []
+        for template_id, frames in self._frames.items():
+            page_template = PageTemplate(
+                id=template_id,
+                frames=[Frame(x, y, width, height, id=frame_id) for frame_id, x, y, width, height in frames]
+            )
+            if template_id == 'first':
+                page_template.onPage = self._draw_sidebar
+            templates.append(page_template)
+        return templates
+
+    def section_header(self, section: str) -> Paragraph:
+        return copy.copy(self._section_headers[section])
+
+    def spacer(self, height: float) -> Spacer:
+        return Spacer(1, height * self.spacing)
+
+
+class PDFGenerator:
+    def __init__(self):
+        # Every template is compiled when the generator is created: at import,
+        # so once per API or renderer worker process
+        self.templates = {
+            template_id: ResumeTemplate(template_id, **spec) for template_id, spec in TEMPLATES.items()
+        }
+        self.styles = self.templates[DEFAULT_TEMPLATE].styles
+
+    def generate_resume_pdf(self, resume_data: Dict[str, Any], template_id: str = DEFAULT_TEMPLATE) -> bytes:
         """Generate a PDF resume from resume data"""
         try:
             logger.info("Starting PDF generation")
             logger.info(f"Resume data keys: {list(resume_data.keys()) if resume_data else 'None'}")
-            
-            # Create PDF in memory
-            buffer = io.BytesIO()
-            doc = SimpleDocTemplate(
-                buffer,
-                pagesize=A4,
-                rightMargin=0.75*inch,
-                leftMargin=0.75*inch,
-                topMargin=0.75*inch,
-                bottomMargin=0.75*inch
-            )
-            
-            # Build the PDF content
-            story = []
-            
-            # Add header with name
-            personal_info = resume_data.get('personalInfo', {})
-            name = personal_info.get('name', 'Resume')
-            
-            story.append(Paragraph(
-                name,
-                self.styles['ResumeHeader']
-            ))
-            story.append(Spacer(1, 12))
-            
-            # Add contact information
-            contact_info = self._build_contact_info(resume_data.get('personalInfo', {}))
-            if contact_info:
-                story.append(contact_info)
-                story.append(Spacer(1, 16))
-            
-            # Add professional summary
-            if resume_data.get('personalInfo', {}).get('summary'):
-                story.append(Paragraph(
-                    'Professional Summary',
-                    self.styles['SectionHeader']
-                ))
-                story.append(Paragraph(
-                    resume_data['personalInfo']['summary'],
-                    self.styles['Description']
-                ))
-                story.append(Spacer(1, 12))
-            
-            # Add experience section
-            if resume_data.get('experience'):
-                story.append(Paragraph(
-                    'Professional Experience',
-                    self.styles['SectionHeader']
-                ))
-                story.extend(self._build_experience_section(resume_data['experience']))
-                story.append(Spacer(1, 12))
-            
-            # Add education section
-            if resume_data.get('education'):
-                story.append(Paragraph(
-                    'Education',
-                    self.styles['SectionHeader']
-                ))
-                story.extend(self._build_education_section(resume_data['education']))
-                story.append(Spacer(1, 12))
-            
-            # Add skills section
-            if resume_data.get('skills'):
-                story.append(Paragraph(
-                    'Skills',
-                    self.styles['SectionHeader']
-                ))
-                story.extend(self._build_skills_section(resume_data['skills']))
-                story.append(Spacer(1, 12))
-            
-            # Add projects section
-            if resume_data.get('projects'):
-                story.append(Paragraph(
-                    'Projects',
-                    self.styles['SectionHeader']
-                ))
-                story.extend(self._build_projects_section(resume_data['projects']))
-                story.append(Spacer(1, 12))
-            
-            # Add certifications section
-            if resume_data.get('certifications'):
-                story.append(Paragraph(
-                    'Certifications',
-                    self.styles['SectionHeader']
-                ))
-                story.extend(self._build_certifications_section(resume_data['certifications']))
-            
-            # Build the PDF
-            doc.build(story)
-            
-            # Get the PDF content
-            buffer.seek(0)
-            return buffer.getvalue()
-            
+            return self.render(resume_data, template_id)
         except Exception as e:
             logger.error(f"Error generating PDF: {e}")
             raise HTTPException(
@@ -214,7 +275,84 @@ class PDFGenerator:
                 detail=f"Failed to generate PDF: {str(e)}"
             )
 
-    def _build_contact_info(self, personal_info: Dict[str, Any]) -> Paragraph:
+    def render(self, resume_data: Dict[str, Any], template_id: str = DEFAULT_TEMPLATE) -> bytes:
+        """Render resume data to PDF bytes with a template; errors are raised as they occur"""
+        template = self.templates.get(template_id)
+        if template is None:
+            raise ValueError(f"Unknown resume template: {template_id}")
+        
+        # Create PDF in memory
+        buffer = io.BytesIO()
+        doc = BaseDocTemplate(
+            buffer,
+            pagesize=A4,
+            rightMargin=template.margin,
+            leftMargin=template.margin,
+            topMargin=template.margin,
+            bottomMargin=template.margin,
+            pageTemplates=template.page_templates()
+        )
+        
+        # Build the PDF content
+        story = []
+        personal_info = resume_data.get('personalInfo', {})
+        
+        # Add header with name
+        story.append(Paragraph(
+            personal_info.get('name', 'Resume'),
+            template.styles['ResumeHeader']
+        ))
+        story.append(template.spacer(12))
+        
+        # Add contact information
+        contact_info = self._build_contact_info(personal_info, template)
+        if contact_info:
+            story.append(contact_info)
+            story.append(template.spacer(16))
+        
+        sections = self._build_sections(resume_data, template)
+        if template.sidebar_width:
+            # Sidebar sections fill the left frame of the first page, the
+            # rest starts in the main frame and continues full width
+            story.insert(0, NextPageTemplate('later'))
+            for section in template.sidebar_sections:
+                story.extend(sections.pop(section, []))
+            story.append(FrameBreak())
+        for flowables in sections.values():
+            story.extend(flowables)
+        
+        # Build the PDF
+        doc.build(story)
+        
+        # Get the PDF content
+        buffer.seek(0)
+        return buffer.getvalue()
+
+    def _build_sections(self, resume_data: Dict[str, Any], template: ResumeTemplate) -> Dict[str, List]:
+        """Flowables of each section the resume has, in SECTIONS order"""
+        builders = {
+            'experience': self._build_experience_section,
+            'education': self._build_education_section,
+            'skills': self._build_skills_section,
+            'projects': self._build_projects_section,
+            'certifications': self._build_certifications_section
+        }
+        sections = {}
+        for section in SECTIONS:
+            if section == 'summary':
+                # Add professional summary
+                summary = resume_data.get('personalInfo', {}).get('summary')
+                if not summary:
+                    continue
+                content = [Paragraph(summary, template.styles['Description'])]
+            elif resume_data.get(section):
+                content = builders[section](resume_data[section], template)
+            else:
+                continue
+            sections[section] = [template.section_header(section), *content, template.spacer(12)]
+        return sections
+
+    def _build_contact_info(self, personal_info: Dict[str, Any], template: ResumeTemplate) -> Paragraph:
         """Build contact information section"""
         contact_parts = []
         
@@ -232,19 +370,19 @@ class PDFGenerator:
             contact_parts.append(f"Portfolio: {personal_info['portfolio']}")
         
         if contact_parts:
-            contact_text = " | ".join(contact_parts)
-            return Paragraph(contact_text, self.styles['ContactInfo'])
+            contact_text = template.contact_separator.join(contact_parts)
+            return Paragraph(contact_text, template.styles['ContactInfo'])
         
         return None
 
-    def _build_experience_section(self, experiences: List[Dict[str, Any]]) -> List:
+    def _build_experience_section(self, experiences: List[Dict[str, Any]], template: ResumeTemplate) -> List:
         """Build experience section"""
         story = []
         
         for exp in experiences:
             # Job title and company
             title_company = f"{exp.get('position', '')} at {exp.get('company', '')}"
-            story.append(Paragraph(title_company, self.styles['JobTitle']))
+            story.append(Paragraph(title_company, template.styles['JobTitle']))
             
             # Date range
             start_date = exp.get('startDate')
@@ -259,25 +397,25 @@ class PDFGenerator:
                     end_str = self._format_date(end_date)
                     date_range = f"{start_str} - {end_str}"
                 
-                story.append(Paragraph(date_range, self.styles['Date']))
+                story.append(Paragraph(date_range, template.styles['Date']))
             
             # Description
             if exp.get('description'):
-                story.append(Paragraph(exp['description'], self.styles['Description']))
+                story.append(Paragraph(exp['description'], template.styles['Description']))
             
             # Achievements
             if exp.get('achievements'):
                 for achievement in exp['achievements']:
                     story.append(Paragraph(
-                        f"• {achievement}",
-                        self.styles['Description']
+                        f"{template.bullet} {achievement}",
+                        template.styles['Description']
                     ))
             
-            story.append(Spacer(1, 8))
+            story.append(template.spacer(8))
         
         return story
 
-    def _build_education_section(self, education: List[Dict[str, Any]]) -> List:
+    def _build_education_section(self, education: List[Dict[str, Any]], template: ResumeTemplate) -> List:
         """Build education section"""
         story = []
         
@@ -297,7 +435,7 @@ class PDFGenerator:
             else:
                 title_text = degree_text or institution
             
-            story.append(Paragraph(title_text, self.styles['JobTitle']))
+            story.append(Paragraph(title_text, template.styles['JobTitle']))
             
             # Date range
             start_date = edu.get('startDate')
@@ -311,46 +449,46 @@ class PDFGenerator:
                     end_str = self._format_date(end_date)
                     date_range = f"{start_str} - {end_str}"
                 
-                story.append(Paragraph(date_range, self.styles['Date']))
+                story.append(Paragraph(date_range, template.styles['Date']))
             
             # GPA
             if edu.get('gpa'):
-                story.append(Paragraph(f"GPA: {edu['gpa']}", self.styles['Description']))
+                story.append(Paragraph(f"GPA: {edu['gpa']}", template.styles['Description']))
             
             # Description
             if edu.get('description'):
-                story.append(Paragraph(edu['description'], self.styles['Description']))
+                story.append(Paragraph(edu['description'], template.styles['Description']))
             
-            story.append(Spacer(1, 8))
+            story.append(template.spacer(8))
         
         return story
 
-    def _build_skills_section(self, skills: List[str]) -> List:
+    def _build_skills_section(self, skills: List[str], template: ResumeTemplate) -> List:
         """Build skills section"""
         story = []
         
         # Group skills into columns for better layout
         skills_text = ", ".join(skills)
-        story.append(Paragraph(skills_text, self.styles['Skill']))
+        story.append(Paragraph(skills_text, template.styles['Skill']))
         
         return story
 
-    def _build_projects_section(self, projects: List[Dict[str, Any]]) -> List:
+    def _build_projects_section(self, projects: List[Dict[str, Any]], template: ResumeTemplate) -> List:
         """Build projects section"""
         story = []
         
         for project in projects:
             # Project name
-            story.append(Paragraph(project.get('name', ''), self.styles['JobTitle']))
+            story.append(Paragraph(project.get('name', ''), template.styles['JobTitle']))
             
             # Description
             if project.get('description'):
-                story.append(Paragraph(project['description'], self.styles['Description']))
+                story.append(Paragraph(project['description'], template.styles['Description']))
             
             # Technologies
             if project.get('technologies'):
                 tech_text = f"Technologies: {', '.join(project['technologies'])}"
-                story.append(Paragraph(tech_text, self.styles['Description']))
+                story.append(Paragraph(tech_text, template.styles['Description']))
             
             # Links
             links = []
@@ -361,13 +499,13 @@ class PDFGenerator:
             
             if links:
                 links_text = " | ".join(links)
-                story.append(Paragraph(links_text, self.styles['Description']))
+                story.append(Paragraph(links_text, template.styles['Description']))
             
-            story.append(Spacer(1, 8))
+            story.append(template.spacer(8))
         
         return story
 
-    def _build_certifications_section(self, certifications: List[Dict[str, Any]]) -> List:
+    def _build_certifications_section(self, certifications: List[Dict[str, Any]], template: ResumeTemplate) -> List:
         """Build certifications section"""
         story = []
         
@@ -381,22 +519,22 @@ class PDFGenerator:
             else:
                 title_text = name or issuer
             
-            story.append(Paragraph(title_text, self.styles['JobTitle']))
+            story.append(Paragraph(title_text, template.styles['JobTitle']))
             
             # Date
             if cert.get('date'):
                 date_str = self._format_date(cert['date'])
-                story.append(Paragraph(date_str, self.styles['Date']))
+                story.append(Paragraph(date_str, template.styles['Date']))
             
             # Credential ID
             if cert.get('credentialId'):
-                story.append(Paragraph(f"Credential ID: {cert['credentialId']}", self.styles['Description']))
+                story.append(Paragraph(f"Credential ID: {cert['credentialId']}", template.styles['Description']))
             
             # URL
             if cert.get('url'):
-                story.append(Paragraph(f"Verification: {cert['url']}", self.styles['Description']))
+                story.append(Paragraph(f"Verification: {cert['url']}", template.styles['Description']))
             
-            story.append(Spacer(1, 8))
+            story.append(template.spacer(8))
         
         return story
 
@@ -415,4 +553,10 @@ class PDFGenerator:
             return str(date_value)
 
 # Create singleton instance
-pdf_generator = PDFGenerator() 
\ No newline at end of file
+pdf_generator = PDFGenerator()
+
+
+def render_resume_pdf(resume_data: Dict[str, Any], template_id: str = DEFAULT_TEMPLATE) -> bytes:
+    """Worker function for PDFRenderer; each worker process reuses its own generator"""
+    return pdf_generator.render(resume_data, template_id)
+ 
\ No newline at end of file
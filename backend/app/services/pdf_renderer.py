@@ -0,0 +1,111 @@
+"""
+Resume PDF rendering off the event loop, in a process pool
+"""
+import asyncio
+from typing import Any, Dict, List, Sequence
+import logging
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.services.pdf_cache import pdf_cache, resume_data_hash
+from app.services.pdf_generator import DEFAULT_TEMPLATE, render_resume_pdf
+from app.services.worker_pool import WorkerPool
+
+logger = logging.getLogger(__name__)
+
+
+class PDFRenderer:
+    """Render resume PDFs in a pool of worker processes.
+
+    Each of PDF_RENDER_WORKERS processes builds its PDFGenerator, which
+    compiles every resume template, once and reuses it for every resume,
+    and renders run on all workers at once, so batch exports scale across
+    cores. A render that takes longer than
+    PDF_RENDER_TIMEOUT_SECONDS once started fails with a 408 and the workers
+    are killed and replaced. Rendered PDFs are kept in the PDF cache, so rendering the same
+    resume data again costs a file read.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.PDF_RENDER_WORKERS,
+        timeout: float = settings.PDF_RENDER_TIMEOUT_SECONDS
+    ):
+        self.workers = workers
+        self.timeout = timeout
+        self._pool = WorkerPool(workers, "PDF renderer")
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def start(self) -> None:
+        """Start the worker processes"""
+        self._pool.start()
+
+    def stop(self, cancel_pending: bool = True) -> None:
+        """Shut down the worker processes"""
+        self._pool.stop(cancel_pending)
+
+    async def render(
+        self,
+        resume_data: Dict[str, Any],
+        template_id: str = DEFAULT_TEMPLATE,
+        use_cache: bool = True
+    ) -> bytes:
+        """Render one resume to PDF bytes, or return the cached PDF of the same data and template.
+
+        Concurrent requests for the same uncached data share one render.
+        """
+        if not use_cache:
+            return await self._render(resume_data, template_id)
+
+        key = resume_data_hash(resume_data, template_id)
+        cached = await pdf_cache.get(key)
+        if cached is not None:
+            return cached
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            pdf_content = await self._render(resume_data, template_id)
+            await pdf_cache.put(key, pdf_content)
+            future.set_result(pdf_content)
+            return pdf_content
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark as retrieved when nobody else was waiting
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _render(self, resume_data: Dict[str, Any], template_id: str) -> bytes:
+        try:
+            return await self._pool.submit(render_resume_pdf, resume_data, template_id, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"PDF rendering timed out after {self.timeout}s")
+            raise HTTPException(
+                status_code=status.HTTP_408_REQUEST_TIMEOUT,
+                detail="Timed out generating the PDF"
+            )
+        except Exception as e:
+            logger.error(f"Error generating PDF: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to generate PDF: {str(e)}"
+            )
+
+    async def render_many(self, resumes: Sequence[Dict[str, Any]], template_id: str = DEFAULT_TEMPLATE) -> List[Any]:
+        """Render several resumes concurrently; failures are returned as HTTPExceptions"""
+        return await asyncio.gather(
+            *(self.render(resume_data, template_id) for resume_data in resumes),
+            return_exceptions=True
+        )
+
+
+# Global instance
+pdf_renderer = PDFRenderer()
@@ -0,0 +1,201 @@
+"""
+Two-tier response cache for read-heavy endpoints (job feeds)
+"""
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+import logging
+
+from app.core.config import settings
+from app.db.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Namespaces for the public job feeds; invalidated whenever the set of
+# published jobs (or their content) changes
+FEATURED_JOBS = "jobs:featured"
+RECENT_JOBS = "jobs:recent"
+JOB_FEEDS = (FEATURED_JOBS, RECENT_JOBS)
+
+_MISS = object()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+class ResponseCache:
+    """In-process LRU cache with an optional shared Redis tier.
+
+    Entries are keyed by namespace and request parameters. Concurrent misses
+    for the same key share a single loader call (single-flight), so a cold or
+    freshly invalidated key costs one database query no matter how many
+    requests arrive at once. Other workers' in-process entries expire after
+    CACHE_LOCAL_TTL_SECONDS; the Redis tier is cleared immediately.
+    """
+
+    def __init__(
+        self,
+        local_ttl: int = settings.CACHE_LOCAL_TTL_SECONDS,
+        redis_ttl: int = settings.CACHE_REDIS_TTL_SECONDS,
+        max_entries: int = settings.CACHE_MAX_ENTRIES
+    ):
+        self.local_ttl = local_ttl
+        self.redis_ttl = redis_ttl
+        self.max_entries = max_entries
+        self._local: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._generations: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(namespace: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Build a cache key from a namespace and request parameters"""
+        if not params:
+            return namespace
+        encoded = "&".join(f"{k}={params[k]}" for k in sorted(params))
+        return f"{namespace}?{encoded}"
+
+    async def get_or_set(
+        self,
+        namespace: str,
+        params: Optional[Dict[str, Any]],
+        loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the cached value for the key, loading it once on a miss"""
+        key = self.make_key(namespace, params)
+
+        value = self._get_local(key)
+        if value is not _MISS:
+            self.hits += 1
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generations.get(namespace, 0)
+        try:
+            value = await self._get_remote(key)
+            # Don't keep a value that was loaded across an invalidation, in either tier
+            if value is _MISS:
+                value = await loader()
+                if self._generations.get(namespace, 0) == generation:
+                    await self._set_remote(namespace, key, value)
+                    if self._generations.get(namespace, 0) != generation:
+                        await self._delete_remote(key)
+            if self._generations.get(namespace, 0) == generation:
+                self._set_local(key, value)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark as retrieved when nobody else was waiting
+            raise
+        finally:
+            # invalidate() may have handed the key to a newer load already
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def invalidate(self, namespaces: Iterable[str]) -> None:
+        """Drop every entry in the given namespaces from both tiers.
+
+        Loads already running are detached, so later misses start a fresh load
+        instead of waiting for data read before the invalidation.
+        """
+        namespaces = list(namespaces)
+        for namespace in namespaces:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            for keys in (self._local, self._inflight):
+                for key in [k for k in keys if k == namespace or k.startswith(f"{namespace}?")]:
+                    del keys[key]
+
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            for namespace in namespaces:
+                index_key = self._index_key(namespace)
+                keys = await redis.smembers(index_key)
+                if keys:
+                    await redis.delete(*keys)
+                await redis.delete(index_key)
+        except Exception as e:
+            logger.error(f"Failed to invalidate Redis cache for {namespaces}: {e}")
+
+    def clear(self) -> None:
+        """Drop all in-process entries"""
+        self._local.clear()
+
+    def _get_local(self, key: str) -> Any:
+        entry = self._local.get(key)
+        if entry is None:
+            return _MISS
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._local[key]
+            return _MISS
+        self._local.move_to_end(key)
+        return value
+
+    def _set_local(self, key: str, value: Any) -> None:
+        self._local[key] = (time.monotonic() + self.local_ttl, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    @staticmethod
+    def _redis_key(key: str) -> str:
+        return f"cache:{key}"
+
+    @staticmethod
+    def _index_key(namespace: str) -> str:
+        return f"cache-index:{namespace}"
+
+    async def _get_remote(self, key: str) -> Any:
+        redis = get_redis()
+        if redis is None:
+            return _MISS
+        try:
+            raw = await redis.get(self._redis_key(key))
+            return _MISS if raw is None else json.loads(raw)
+        except Exception as e:
+            logger.error(f"Redis cache read failed for {key}: {e}")
+            return _MISS
+
+    async def _set_remote(self, namespace: str, key: str, value: Any) -> None:
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            redis_key = self._redis_key(key)
+            index_key = self._index_key(namespace)
+            pipe = redis.pipeline()
+            pipe.set(redis_key, json.dumps(value, default=_json_default), ex=self.redis_ttl)
+            pipe.sadd(index_key, redis_key)
+            pipe.expire(index_key, self.redis_ttl)
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"Redis cache write failed for {key}: {e}")
+
+    async def _delete_remote(self, key: str) -> None:
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.delete(self._redis_key(key))
+        except Exception as e:
+            logger.error(f"Redis cache delete failed for {key}: {e}")
+
+
+# Global instance
+response_cache = ResponseCache()
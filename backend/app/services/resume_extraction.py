@@ -0,0 +1,435 @@
+"""
+Structured extraction of resume text into resume builder data
+"""
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.services.skill_taxonomy import SkillTaxonomy, get_skill_taxonomy
+
+MAX_SKILLS = 50
+
+# Contact details
+# Parts are bounded (64-character local part, 63-character labels) so long
+# runs without whitespace cannot make a search quadratic
+EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9-]{1,63}(?:\.[A-Za-z0-9-]{1,63}){0,8}\.[A-Za-z]{2,24}\b")
+PHONE_RE = re.compile(r"(?<![\w/])\+?\d[\d\s().-]{8,}\d(?![\w/])")
+LINKEDIN_RE = re.compile(r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/[^\s,;|]+", re.IGNORECASE)
+GITHUB_RE = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[^\s,;|]+", re.IGNORECASE)
+URL_RE = re.compile(r"(?:https?://|www\.)[^\s,;|]+|\b[a-z0-9-]{1,63}(?:\.[a-z0-9-]{1,63}){0,8}\.(?:com|io|dev|me|net|org|app|co|ai|tech)(?:/[^\s,;|]*)?\b", re.IGNORECASE)
+# Repeats are bounded and the patterns below are searched line by line, so a
+# long run of capitalised words cannot make a search quadratic
+LOCATION_RE = re.compile(r"\b[A-Z][a-zA-Z]+(?:[ -][A-Z][a-zA-Z]+){0,3},[ \t]*(?:[A-Z]{2}\b|[A-Z][a-z]+(?: [A-Z][a-z]+){0,3})")
+
+# Dates
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
+}
+DATE = r"(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?,?\s+\d{4}|\d{1,2}/\d{4}|\d{4}-\d{2}|(?:19|20)\d{2})"
+DATE_RE = re.compile(DATE, re.IGNORECASE)
+DATE_RANGE_RE = re.compile(
+    rf"(?P<start>{DATE})\s*(?:-|–|—|to|until)\s*(?P<end>{DATE}|present|current|now|today|ongoing)",
+    re.IGNORECASE
+)
+ONGOING = {"present", "current", "now", "today", "ongoing"}
+
+# Entries
+BULLET_RE = re.compile(r"^\s*(?:[•●▪■◦‣∙·*➢►✓-]|\d{1,2}[.)])\s+")
+TITLE_SPLIT_RE = re.compile(r"\s+(?:at|@)\s+|\s*[|•·,–—]\s*|\s+-\s+")
+GPA_RE = re.compile(r"\b(?:GPA|CGPA)\s*[:\-]?\s*(\d(?:\.\d{1,2})?)", re.IGNORECASE)
+DEGREE_RE = re.compile(
+    r"(?P<degree>"
+    r"(?:Bachelor|Master|Doctor|Associate)(?:'s|s)?(?: of (?:Science|Arts|Engineering|Technology|Business Administration|Commerce|Fine Arts|Laws|Philosophy))?(?: Degree)?"
+    r"|Ph\.?\s?D\.?|M\.?B\.?A\.?|B\.?\s?Tech|M\.?\s?Tech|B\.?\s?Sc\.?|M\.?\s?Sc\.?|B\.?S\.?|M\.?S\.?|B\.?A\.?|M\.?A\.?|B\.?E\.?|M\.?E\.?|Diploma|High School Diploma"
+    r")(?:\s+(?:in|of)\s+|\s*,\s*|\s+-\s+)?(?P<field>[A-Z][A-Za-z&/ ]+?)?(?=\s*(?:,|\||–|—|-|\(|\bat\b|\bfrom\b|\d|$))"
+)
+INSTITUTION_RE = re.compile(
+    r"(?:[A-Z][\w.&'-]*\s+){0,3}(?:University|College|Institute|School|Academy|Polytechnic)(?:\s+of\s+[A-Z][\w&'-]*(?:\s+[A-Z][\w&'-]*){0,3})?"
+)
+TECHNOLOGIES_RE = re.compile(r"^(?:tech(?:nologies|nology| stack)?|built with|stack|tools)\s*:\s*(?P<items>.+)$", re.IGNORECASE)
+CREDENTIAL_RE = re.compile(r"(?:credential|license|certificate)\s*(?:id|#|no\.?|number)\s*[:#]?\s*(?P<id>[A-Za-z0-9-]{4,})", re.IGNORECASE)
+SKILL_ITEM_SPLIT_RE = re.compile(r"[,;|•·●\n]|\s{3,}")
+SKILL_LABEL_RE = re.compile(r"^[A-Za-z &/]{2,30}:\s*")
+
+# Section headings, compared after lowercasing and dropping everything but letters, spaces and "&"
+SECTION_HEADINGS = {
+    "summary": (
+        "summary", "professional summary", "profile", "professional profile", "objective",
+        "career objective", "about me", "about", "career summary", "executive summary"
+    ),
+    "experience": (
+        "experience", "work experience", "professional experience", "employment",
+        "employment history", "work history", "career history", "relevant experience", "internships"
+    ),
+    "education": ("education", "academic background", "education & training", "academics", "educational background"),
+    "skills": (
+        "skills", "technical skills", "core skills", "key skills", "core competencies",
+        "competencies", "technologies", "tools & technologies", "skills & tools", "expertise"
+    ),
+    "projects": ("projects", "personal projects", "key projects", "academic projects", "selected projects"),
+    "certifications": (
+        "certifications", "certificates", "licenses & certifications",
+        "certifications & licenses", "licenses", "courses & certifications"
+    )
+}
+HEADING_LOOKUP = {title: section for section, titles in SECTION_HEADINGS.items() for title in titles}
+HEADING_CLEAN_RE = re.compile(r"[^a-z& ]+")
+
+
+# Helpers
+
+def _to_iso(value: str) -> Optional[str]:
+    """``Jan 2020``, ``01/2020``, ``2020-01`` or ``2020`` as an ISO date"""
+    value = value.strip().lower().rstrip(".")
+    if value in ONGOING:
+        return None
+    match = re.match(r"([a-z]+)\.?,?\s+(\d{4})$", value)
+    if match and match.group(1)[:3] in MONTHS:
+        return f"{match.group(2)}-{MONTHS[match.group(1)[:3]]:02d}-01"
+    match = re.match(r"(\d{1,2})/(\d{4})$", value) or re.match(r"(\d{4})-(\d{2})$", value)
+    if match:
+        month, year = (match.group(1), match.group(2)) if "/" in value else (match.group(2), match.group(1))
+        if 1 <= int(month) <= 12:
+            return f"{year}-{int(month):02d}-01"
+    if re.match(r"\d{4}$", value):
+        return f"{value}-01-01"
+    return None
+
+
+def _take_date_range(line: str) -> Tuple[str, Optional[str], Optional[str], bool]:
+    """Remove a date range from a line; returns ``(rest, start, end, current)``"""
+    match = DATE_RANGE_RE.search(line)
+    if not match:
+        return line, None, None, False
+    rest = (line[:match.start()] + " " + line[match.end():]).strip(" \t|,-–—()")
+    ongoing = match.group("end").lower() in ONGOING
+    return rest, _to_iso(match.group("start")), _to_iso(match.group("end")), ongoing
+
+
+def _strip_bullet(line: str) -> Tuple[str, bool]:
+    match = BULLET_RE.match(line)
+    return (line[match.end():].strip(), True) if match else (line.strip(), False)
+
+
+def _search_lines(pattern: re.Pattern, lines: Iterable[str]) -> Optional[re.Match]:
+    """First match of ``pattern`` in any of ``lines``"""
+    for line in lines:
+        match = pattern.search(line)
+        if match:
+            return match
+    return None
+
+
+def _heading(line: str) -> Tuple[Optional[str], str]:
+    """Section a heading line starts, plus any text after ``Heading:`` on the same line"""
+    stripped = line.strip()
+    if not stripped or len(stripped) > 60:
+        return None, ""
+    head, _, rest = stripped.partition(":")
+    section = HEADING_LOOKUP.get(HEADING_CLEAN_RE.sub("", head.lower()).strip())
+    if section and (not rest or len(head) <= 40):
+        return section, rest.strip()
+    return None, ""
+
+
+def _split_title(lines: List[str]) -> Tuple[str, str]:
+    """First part and second part of an entry heading (position and company, name and issuer)"""
+    if not lines:
+        return "", ""
+    parts = [part.strip() for part in TITLE_SPLIT_RE.split(lines[0], maxsplit=1) if part.strip()]
+    if len(parts) == 2:
+        return parts[0], parts[1]
+    return lines[0], lines[1] if len(lines) > 1 else ""
+
+
+def _entries(lines: List[str]) -> List[List[str]]:
+    """Split a section into entries.
+
+    An entry ends at a blank line once it has a date or bullets, when a
+    plain line follows its bullets, or when a second date range appears (the
+    heading line just before that date then starts the next entry).
+    """
+    blocks: List[List[str]] = []
+    current: List[str] = []
+    has_date = has_bullets = False
+    for line in lines:
+        if not line.strip():
+            if current and (has_date or has_bullets):
+                blocks.append(current)
+                current, has_date, has_bullets = [], False, False
+            continue
+        is_bullet = bool(BULLET_RE.match(line))
+        dated = bool(DATE_RANGE_RE.search(line))
+        if current and ((not is_bullet and has_bullets) or (dated and has_date)):
+            carried = []
+            date_only = dated and not _take_date_range(line)[0]
+            if dated and date_only and len(current) > 1 and not BULLET_RE.match(current[-1]):
+                carried = [current.pop()]
+            blocks.append(current)
+            current, has_date, has_bullets = carried, False, False
+        current.append(line)
+        has_date = has_date or dated
+        has_bullets = has_bullets or is_bullet
+    if current:
+        blocks.append(current)
+    return blocks
+
+
+def _dedupe(items: Iterable[str]) -> List[str]:
+    seen: Dict[str, str] = {}
+    for item in items:
+        key = item.lower()
+        if item and key not in seen:
+            seen[key] = item
+    return list(seen.values())
+
+
+# Section parsers
+
+def _parse_experience(block: List[str], index: int) -> Dict[str, Any]:
+    start = end = None
+    current = False
+    heading: List[str] = []
+    description: List[str] = []
+    achievements: List[str] = []
+    for raw in block:
+        line, is_bullet = _strip_bullet(raw)
+        if is_bullet:
+            achievements.append(line)
+            continue
+        if start is None:
+            line, start, end, current = _take_date_range(line)
+            if not line:
+                continue
+        if len(heading) < 2 and not description and len(line.split()) <= 12:
+            heading.append(line)
+        else:
+            description.append(line)
+    position, company = _split_title(heading)
+    if len(heading) > 1 and heading[1] not in (position, company):
+        description.insert(0, heading[1])
+    return {
+        "id": f"experience-{index + 1}",
+        "position": position,
+        "company": company,
+        "startDate": start,
+        "endDate": end,
+        "current": current,
+        "description": " ".join(description),
+        "achievements": achievements
+    }
+
+
+def _parse_education(block: List[str], index: int) -> Dict[str, Any]:
+    text = " | ".join(_strip_bullet(line)[0] for line in block)
+    _, start, end, _ = _take_date_range(text)
+    if start is None:
+        years = DATE_RE.findall(text)
+        end = _to_iso(years[-1]) if years else None
+
+    degree = field = ""
+    match = DEGREE_RE.search(text)
+    if match:
+        degree = match.group("degree").strip()
+        field = (match.group("field") or "").strip()
+    institution_match = _search_lines(INSTITUTION_RE, (_strip_bullet(line)[0] for line in block))
+    institution = institution_match.group(0).strip() if institution_match else ""
+    if not institution:
+        first = _take_date_range(_strip_bullet(block[0])[0])[0]
+        institution = first if not match or match.group(0) not in first else ""
+
+    gpa_match = GPA_RE.search(text)
+    consumed = [part for part in (degree, field, institution) if part]
+    description = [
+        _strip_bullet(line)[0] for line in block[1:]
+        if not any(part in line for part in consumed) and not DATE_RANGE_RE.search(line) and not GPA_RE.search(line)
+    ]
+    return {
+        "id": f"education-{index + 1}",
+        "institution": institution,
+        "degree": degree,
+        "field": field,
+        "startDate": start,
+        "endDate": end,
+        "gpa": float(gpa_match.group(1)) if gpa_match else None,
+        "description": " ".join(description)
+    }
+
+
+def _parse_project(block: List[str], index: int, taxonomy: SkillTaxonomy) -> Dict[str, Any]:
+    name = ""
+    technologies: List[str] = []
+    description: List[str] = []
+    url = github = None
+    for raw in block:
+        line, is_bullet = _strip_bullet(raw)
+        github_match = GITHUB_RE.search(line)
+        if github_match and not github:
+            github = github_match.group(0)
+            line = line.replace(github, "").strip(" |,-–—:")
+        url_match = URL_RE.search(line)
+        if url_match and not url and not EMAIL_RE.search(line):
+            url = url_match.group(0)
+            line = line.replace(url, "").strip(" |,-–—:")
+        tech_match = TECHNOLOGIES_RE.match(line)
+        if tech_match:
+            technologies.extend(item.strip() for item in SKILL_ITEM_SPLIT_RE.split(tech_match.group("items")) if item.strip())
+            continue
+        if not line:
+            continue
+        if not name and not is_bullet:
+            line, _, _, _ = _take_date_range(line)
+            name, rest = _split_title([line])
+            if rest:
+                description.append(rest)
+            continue
+        description.append(line)
+    if not technologies:
+        technologies = taxonomy.extract(" ".join(block))
+    return {
+        "id": f"project-{index + 1}",
+        "name": name,
+        "description": " ".join(description),
+        "technologies": _dedupe(technologies),
+        "url": url,
+        "github": github
+    }
+
+
+def _parse_certification(line: str, index: int) -> Dict[str, Any]:
+    line, _ = _strip_bullet(line)
+    url_match = URL_RE.search(line)
+    url = url_match.group(0) if url_match else None
+    if url:
+        line = line.replace(url, "")
+    credential_match = CREDENTIAL_RE.search(line)
+    if credential_match:
+        line = line[:credential_match.start()] + line[credential_match.end():]
+    date_match = DATE_RE.search(line)
+    if date_match:
+        line = line[:date_match.start()] + line[date_match.end():]
+    line = re.sub(r"\(\s*\)", "", line).strip(" \t|,-–—()")
+    by_match = re.search(r"\s+(?:by|from)\s+", line)
+    if by_match:
+        name, issuer = line[:by_match.start()], line[by_match.end():]
+    else:
+        name, issuer = _split_title([line])
+    return {
+        "id": f"certification-{index + 1}",
+        "name": name.strip(),
+        "issuer": issuer.strip(" ,"),
+        "date": _to_iso(date_match.group(0)) if date_match else None,
+        "credentialId": credential_match.group("id") if credential_match else None,
+        "url": url
+    }
+
+
+def _parse_skills(lines: List[str], text: str, taxonomy: SkillTaxonomy) -> List[str]:
+    listed: List[str] = []
+    for raw in lines:
+        line = SKILL_LABEL_RE.sub("", _strip_bullet(raw)[0])
+        for item in SKILL_ITEM_SPLIT_RE.split(line):
+            item = item.strip(" .")
+            if not item or len(item) > 40:
+                continue
+            # Prefer the taxonomy's name for a listed skill
+            canonical = taxonomy.normalize(item)
+            known = [canonical] if canonical else taxonomy.extract(item)
+            listed.extend(known if known else [item])
+    return _dedupe(listed + taxonomy.extract(text))[:MAX_SKILLS]
+
+
+def _looks_like_name(line: str) -> bool:
+    words = line.split()
+    return (
+        1 < len(words) <= 4
+        and "@" not in line
+        and not any(char.isdigit() for char in line)
+        and all(re.fullmatch(r"[A-Za-z][A-Za-z.'-]*", word) for word in words)
+        and line.lower() not in ("curriculum vitae", "resume")
+    )
+
+
+def _parse_personal_info(header: List[str], text: str, summary: List[str]) -> Dict[str, Any]:
+    header_text = "\n".join(header)
+    info: Dict[str, Any] = {}
+    for line in header:
+        candidate = line.strip()
+        if candidate and _looks_like_name(candidate):
+            info["name"] = candidate.title() if candidate.isupper() else candidate
+            break
+
+    email = _search_lines(EMAIL_RE, header) or _search_lines(EMAIL_RE, text.split("\n"))
+    if email:
+        info["email"] = email.group(0)
+    phone = PHONE_RE.search(header_text) or PHONE_RE.search(text)
+    if phone and sum(char.isdigit() for char in phone.group(0)) >= 10:
+        info["phone"] = phone.group(0).strip()
+    location = _search_lines(LOCATION_RE, header) or _search_lines(LOCATION_RE, text.split("\n"))
+    if location:
+        info["location"] = location.group(0)
+
+    links_text = EMAIL_RE.sub(" ", header_text)
+    linkedin = LINKEDIN_RE.search(links_text)
+    if linkedin:
+        info["linkedIn"] = linkedin.group(0)
+    github = GITHUB_RE.search(links_text)
+    if github:
+        info["github"] = github.group(0)
+    for url in URL_RE.finditer(links_text):
+        if "linkedin.com" not in url.group(0).lower() and "github.com" not in url.group(0).lower():
+            info["portfolio"] = url.group(0)
+            break
+
+    if summary:
+        info["summary"] = " ".join(line.strip() for line in summary if line.strip())
+    else:
+        # No summary heading: use the first paragraph-length line
+        for line in header + text.split("\n"):
+            line = line.strip()
+            if 50 < len(line) < 500 and not BULLET_RE.match(line):
+                info["summary"] = line
+                break
+    return info
+
+
+def segment_sections(lines: Iterable[str]) -> Dict[str, List[str]]:
+    """Split resume lines into sections in one pass; lines before any heading go to ``header``"""
+    sections: Dict[str, List[str]] = {"header": []}
+    current = "header"
+    for line in lines:
+        section, rest = _heading(line)
+        if section:
+            current = section
+            sections.setdefault(current, [])
+            if rest:
+                sections[current].append(rest)
+            continue
+        sections.setdefault(current, []).append(line)
+    return sections
+
+
+def extract_resume(text_content: str) -> Dict[str, Any]:
+    """Extract resume builder data from resume text.
+
+    Returns the structure PDFGenerator.generate_resume_pdf takes
+    (``personalInfo``, ``experience``, ``education``, ``skills``,
+    ``projects``, ``certifications``) plus the first 1000 characters of the
+    text as ``rawText``.
+    """
+    text_content = text_content.replace("\r\n", "\n").replace("\r", "\n")
+    sections = segment_sections(text_content.split("\n"))
+    taxonomy = get_skill_taxonomy()
+
+    return {
+        "personalInfo": _parse_personal_info(sections["header"], text_content, sections.get("summary", [])),
+        "experience": [_parse_experience(block, i) for i, block in enumerate(_entries(sections.get("experience", [])))],
+        "education": [_parse_education(block, i) for i, block in enumerate(_entries(sections.get("education", [])))],
+        "skills": _parse_skills(sections.get("skills", []), text_content, taxonomy),
+        "projects": [_parse_project(block, i, taxonomy) for i, block in enumerate(_entries(sections.get("projects", [])))],
+        "certifications": [
+            _parse_certification(line, i)
+            for i, line in enumerate(line for line in sections.get("certifications", []) if line.strip())
+        ],
+        "rawText": text_content[:1000]
+    }
@@ -0,0 +1,226 @@
+"""
+Resume parsing off the event loop, in a process pool
+"""
+import asyncio
+import hashlib
+import io
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+import logging
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.db.database import get_parsed_resumes_collection
+from app.services.resume_extraction import extract_resume
+from app.services.worker_pool import WorkerPool
+
+logger = logging.getLogger(__name__)
+
+PDF_MIME_TYPE = "application/pdf"
+DOCX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+SUPPORTED_MIME_TYPES = (PDF_MIME_TYPE, DOCX_MIME_TYPE)
+
+# Bump whenever extraction output changes; cached results from older
+# versions are then ignored and the file is parsed again on next upload
+PARSER_VERSION = 4
+# Hash larger files off the event loop
+HASH_IN_THREAD_BYTES = 1024 * 1024
+
+
+# Worker functions. These run in pool processes, so they only take and
+# return picklable values and import the parsing libraries themselves.
+
+def extract_pdf_pages(file_content: bytes, start: int = 0, stop: Optional[int] = None) -> List[str]:
+    """Text of pages ``start`` to ``stop`` of a PDF"""
+    import PyPDF2
+
+    pages = PyPDF2.PdfReader(io.BytesIO(file_content)).pages
+    stop = len(pages) if stop is None else min(stop, len(pages))
+    return [pages[index].extract_text() or "" for index in range(start, stop)]
+
+
+def extract_pdf_text(file_content: bytes) -> str:
+    """Text of a whole PDF, pages joined by newlines"""
+    return "\n".join(extract_pdf_pages(file_content))
+
+
+def extract_docx_text(file_content: bytes) -> str:
+    """Text of a DOCX document, one paragraph per line"""
+    from docx import Document
+
+    return "\n".join(paragraph.text for paragraph in Document(io.BytesIO(file_content)).paragraphs)
+
+
+def extract_resume_data(text_content: str) -> Dict[str, Any]:
+    """Extract resume builder data (sections, contact details, skills) from text content"""
+    return extract_resume(text_content)
+
+
+def parse_document(file_content: bytes, mime_type: str, max_pages: Optional[int] = None) -> Tuple[Optional[Dict[str, Any]], int]:
+    """Parse a resume in one step; returns ``(parsed_data, page_count)``.
+
+    A PDF with more than ``max_pages`` pages is not extracted here and
+    ``(None, page_count)`` is returned so the caller can split it.
+    """
+    if mime_type == PDF_MIME_TYPE:
+        import PyPDF2
+
+        pages = PyPDF2.PdfReader(io.BytesIO(file_content)).pages
+        if max_pages is not None and len(pages) > max_pages:
+            return None, len(pages)
+        text_content = "\n".join(page.extract_text() or "" for page in pages)
+        return extract_resume_data(text_content), len(pages)
+    return extract_resume_data(extract_docx_text(file_content)), 1
+
+
+class ResumeParser:
+    """Parse PDF and DOCX resumes in a pool of worker processes.
+
+    Extraction never runs on the event loop: each document is parsed by one
+    of RESUME_PARSER_WORKERS processes, and a PDF with more than
+    RESUME_PARSER_PAGES_PER_WORKER pages is split into page ranges that are
+    extracted in parallel. A step that runs longer than
+    RESUME_PARSE_TIMEOUT_SECONDS on its worker fails the document with a
+    408, and the workers are killed and replaced so a stuck one does not
+    hold up later documents. Time spent waiting for a free worker does not
+    count towards the timeout.
+
+    Results are cached in ``parsed_resumes`` by the SHA-256 of the file and
+    PARSER_VERSION, so re-uploading the same file skips parsing. Entries
+    expire after RESUME_PARSE_CACHE_TTL_DAYS.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.RESUME_PARSER_WORKERS,
+        timeout: float = settings.RESUME_PARSE_TIMEOUT_SECONDS,
+        pages_per_worker: int = settings.RESUME_PARSER_PAGES_PER_WORKER
+    ):
+        self.workers = workers
+        self.timeout = timeout
+        self.pages_per_worker = pages_per_worker
+        self._pool = WorkerPool(workers, "Resume parser")
+
+    def start(self) -> None:
+        """Start the worker processes"""
+        self._pool.start()
+
+    def stop(self, cancel_pending: bool = True) -> None:
+        """Shut down the worker processes"""
+        self._pool.stop(cancel_pending)
+
+    async def _submit(self, function, *args):
+        return await self._pool.submit(function, *args, timeout=self.timeout)
+
+    async def _parse(self, file_content: bytes, mime_type: str) -> Dict[str, Any]:
+        parsed_data, page_count = await self._submit(parse_document, file_content, mime_type, self.pages_per_worker)
+        if parsed_data is not None:
+            return parsed_data
+
+        ranges = range(0, page_count, self.pages_per_worker)
+        chunks = await asyncio.gather(*(
+            self._submit(extract_pdf_pages, file_content, start, start + self.pages_per_worker)
+            for start in ranges
+        ))
+        text_content = "\n".join(page for chunk in chunks for page in chunk)
+        return await self._submit(extract_resume_data, text_content)
+
+    @staticmethod
+    async def _digest(file_content: bytes) -> str:
+        if len(file_content) > HASH_IN_THREAD_BYTES:
+            return await asyncio.to_thread(lambda: hashlib.sha256(file_content).hexdigest())
+        return hashlib.sha256(file_content).hexdigest()
+
+    async def _cached(self, digest: str) -> Optional[Dict[str, Any]]:
+        try:
+            cached = await get_parsed_resumes_collection().find_one(
+                {"_id": digest, "parser_version": PARSER_VERSION}, {"data": 1}
+            )
+            return cached["data"] if cached else None
+        except Exception as e:
+            logger.error(f"Error reading parsed resume cache: {e}")
+            return None
+
+    async def _store(self, digest: str, mime_type: str, parsed_data: Dict[str, Any]) -> None:
+        try:
+            await get_parsed_resumes_collection().replace_one(
+                {"_id": digest},
+                {
+                    "parser_version": PARSER_VERSION,
+                    "mime_type": mime_type,
+                    "data": parsed_data,
+                    "created_at": datetime.utcnow()
+                },
+                upsert=True
+            )
+        except Exception as e:
+            logger.error(f"Error caching parsed resume: {e}")
+
+    @staticmethod
+    def _check_type(mime_type: str) -> None:
+        if mime_type not in SUPPORTED_MIME_TYPES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Unsupported file type. Only PDF and DOCX files are supported."
+            )
+
+    async def parse(
+        self,
+        file_content: bytes,
+        mime_type: str,
+        use_cache: bool = True,
+        digest: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Parse one PDF or DOCX resume, or return the cached result for the same file.
+
+        ``digest`` is the file's SHA-256 hex digest when the caller already has it.
+        """
+        self._check_type(mime_type)
+        if not use_cache:
+            digest = None
+        elif digest is None:
+            digest = await self._digest(file_content)
+        if digest:
+            cached = await self._cached(digest)
+            if cached is not None:
+                return cached
+        try:
+            parsed_data = await self._parse(file_content, mime_type)
+        except asyncio.TimeoutError:
+            logger.error(f"Resume parsing timed out after {self.timeout}s")
+            raise HTTPException(
+                status_code=status.HTTP_408_REQUEST_TIMEOUT,
+                detail="Timed out parsing the resume file"
+            )
+        except Exception as e:
+            kind = "PDF" if mime_type == PDF_MIME_TYPE else "DOCX"
+            logger.error(f"Failed to parse {kind}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Failed to parse {kind} file: {str(e)}"
+            )
+        if digest:
+            await self._store(digest, mime_type, parsed_data)
+        return parsed_data
+
+    async def parse_stream(self, chunks: AsyncIterator[bytes], mime_type: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Parse a resume received in chunks, hashing each chunk as it arrives"""
+        self._check_type(mime_type)
+        digest = hashlib.sha256()
+        parts = []
+        async for chunk in chunks:
+            digest.update(chunk)
+            parts.append(chunk)
+        return await self.parse(b"".join(parts), mime_type, use_cache=use_cache, digest=digest.hexdigest())
+
+    async def parse_many(self, documents: Sequence[Tuple[bytes, str]]) -> List[Any]:
+        """Parse several resumes concurrently; failures are returned as HTTPExceptions"""
+        return await asyncio.gather(
+            *(self.parse(file_content, mime_type) for file_content, mime_type in documents),
+            return_exceptions=True
+        )
+
+
+# Global instance
+resume_parser = ResumeParser()
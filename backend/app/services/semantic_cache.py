@@ -0,0 +1,136 @@
+"""
+Semantic cache of AI chat answers
+"""
+import re
+import time
+from typing import List, Optional
+import logging
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.embedding_service import embedding_service
+
+logger = logging.getLogger(__name__)
+
+# Contact details mark a prompt as personal (a pasted resume, a cover letter)
+_PERSONAL_RE = re.compile(
+    r"[\w.%+-]{1,64}@[\w-]{1,63}\.[\w.-]{2,}"     # email
+    r"|\+?\d[\d\s().-]{7,20}\d"                 # phone number
+    r"|https?://|www\.|linkedin\.com|github\.com",
+    re.IGNORECASE
+)
+
+
+class SemanticCache:
+    """Answer a prompt from a previous answer to a near-identical prompt.
+
+    Prompts are embedded with the local MiniLM model and kept, normalized, as
+    rows of one matrix, so a lookup is a single matrix-vector product over at
+    most SEMANTIC_CACHE_MAX_ENTRIES rows. A cached answer is returned when
+    its prompt's cosine similarity reaches SEMANTIC_CACHE_THRESHOLD and it is
+    younger than SEMANTIC_CACHE_TTL_SECONDS. When full, expired entries are
+    reused first, then the oldest. The cache is per process and never fails
+    a request: errors count as a miss.
+
+    Answers are shared by every user, so only prompts that pass shareable()
+    are looked up or stored: at most SEMANTIC_CACHE_MAX_PROMPT_CHARS long
+    and without emails, phone numbers or links. Longer prompts usually carry
+    a pasted resume or other personal details, and an answer written from
+    them must not reach another user.
+    """
+
+    def __init__(
+        self,
+        threshold: float = settings.SEMANTIC_CACHE_THRESHOLD,
+        ttl: float = settings.SEMANTIC_CACHE_TTL_SECONDS,
+        max_entries: int = settings.SEMANTIC_CACHE_MAX_ENTRIES,
+        enabled: bool = settings.SEMANTIC_CACHE_ENABLED,
+        max_prompt_chars: int = settings.SEMANTIC_CACHE_MAX_PROMPT_CHARS
+    ):
+        self.threshold = threshold
+        self.max_prompt_chars = max_prompt_chars
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._vectors: Optional[np.ndarray] = None
+        self._created = np.zeros(max_entries)
+        self._size = 0
+        self._models: List[Optional[str]] = [None] * max_entries
+        self._responses: List[Optional[str]] = [None] * max_entries
+
+    def shareable(self, prompt: str) -> bool:
+        """Whether an answer to ``prompt`` may be cached and served to other users"""
+        prompt = prompt.strip()
+        return 0 < len(prompt) <= self.max_prompt_chars and not _PERSONAL_RE.search(prompt)
+
+    async def _embed(self, prompt: str) -> np.ndarray:
+        vector = (await embedding_service.embed_local([prompt.strip().lower()]))[0]
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def _nearest(self, vector: np.ndarray, model: str) -> Optional[int]:
+        if not self._size:
+            return None
+        scores = self._vectors[:self._size] @ vector
+        expired = self._created[:self._size] < time.time() - self.ttl
+        scores[expired] = -1.0
+        candidates = np.flatnonzero(scores >= self.threshold)
+        for index in candidates[np.argsort(-scores[candidates])]:
+            if self._models[index] == model:
+                return int(index)
+        return None
+
+    async def get(self, prompt: str, model: str) -> Optional[str]:
+        """Cached answer to a prompt similar to ``prompt``, or None"""
+        if not self.enabled or not self.shareable(prompt):
+            return None
+        try:
+            index = self._nearest(await self._embed(prompt), model)
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+            return None
+        if index is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._responses[index]
+
+    async def put(self, prompt: str, model: str, response: str) -> None:
+        """Remember the answer to a prompt"""
+        if not self.enabled or not response or not self.shareable(prompt):
+            return
+        try:
+            vector = await self._embed(prompt)
+        except Exception as e:
+            logger.warning(f"Semantic cache store failed: {e}")
+            return
+
+        if self._vectors is None:
+            self._vectors = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+        index = self._nearest(vector, model)
+        if index is None:
+            if self._size < self.max_entries:
+                index = self._size
+                self._size += 1
+            else:
+                # Oldest entry; expired entries are always older than live ones
+                index = int(np.argmin(self._created))
+        self._vectors[index] = vector
+        self._created[index] = time.time()
+        self._models[index] = model
+        self._responses[index] = response
+
+    def clear(self) -> None:
+        """Drop every cached answer"""
+        self._size = 0
+        self._models = [None] * self.max_entries
+        self._responses = [None] * self.max_entries
+
+    def stats(self) -> dict:
+        return {"entries": self._size, "hits": self.hits, "misses": self.misses}
+
+
+# Global instance
+semantic_cache = SemanticCache()
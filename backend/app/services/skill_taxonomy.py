@@ -0,0 +1,143 @@
+"""
+Skill taxonomy: canonical skill names, synonyms and fast extraction from text
+"""
+import json
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+SKILLS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "skills.json")
+
+# Characters that continue a term, so "C" is not found in "C++" and "R" not in "R&D"
+WORD_CHARS = frozenset("+#&")
+NORMALIZE_RE = re.compile(r"[\s._-]+")
+
+
+def normalize_skill(term: str) -> str:
+    """Lookup key of a skill name: ``Node.js``, ``nodejs`` and ``node js`` share one"""
+    return NORMALIZE_RE.sub("", term.strip().lower())
+
+
+def _continues_word(char: str) -> bool:
+    return char.isalnum() or char in WORD_CHARS
+
+
+class SkillTaxonomy:
+    """Canonical skills with their synonyms, compiled into an Aho-Corasick automaton.
+
+    Every name and synonym is a pattern of one automaton, so extraction is a
+    single pass over the text however large the vocabulary is. A match only
+    counts on word boundaries, overlapping matches keep the longest (so
+    "Machine Learning" wins over "Learning"), and terms of three characters
+    or fewer or listed as case sensitive must match the exact case.
+    """
+
+    def __init__(self, categories: Dict[str, Dict[str, List[str]]], case_sensitive: Iterable[str] = ()):
+        case_sensitive = set(case_sensitive)
+        self.categories: Dict[str, str] = {}
+        self._canonical: Dict[str, str] = {}
+        # Automaton states: transitions, failure link and the terms ending there
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str, Optional[str]]]] = [[]]
+
+        for category, skills in categories.items():
+            for canonical, synonyms in skills.items():
+                self.categories[canonical] = category
+                for term in (canonical, *synonyms):
+                    self._canonical.setdefault(normalize_skill(term), canonical)
+                    exact = term if len(term) <= 3 or term in case_sensitive else None
+                    self._add(term, canonical, exact)
+        self._build()
+
+    @classmethod
+    def load(cls, path: str = SKILLS_PATH) -> "SkillTaxonomy":
+        """Taxonomy from a JSON file shaped like ``app/data/skills.json``"""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["categories"], data.get("case_sensitive", []))
+
+    def _add(self, term: str, canonical: str, exact: Optional[str]) -> None:
+        state = 0
+        for char in term.lower():
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append((len(term), canonical, exact))
+
+    def _build(self) -> None:
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def _matches(self, text: str) -> List[Tuple[int, int, str]]:
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters lowercase to several; keep offsets aligned with the text
+            lowered = "".join(char if len(char.lower()) != 1 else char.lower() for char in text)
+        goto, fail, out = self._goto, self._fail, self._out
+        matches = []
+        state = 0
+        for end, char in enumerate(lowered, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, canonical, exact in out[state]:
+                start = end - length
+                if start > 0 and _continues_word(text[start - 1]):
+                    continue
+                if end < len(text) and _continues_word(text[end]):
+                    continue
+                if exact is not None and text[start:end] != exact:
+                    continue
+                matches.append((start, end, canonical))
+        return matches
+
+    def extract(self, text: str) -> List[str]:
+        """Canonical names of the skills mentioned in ``text``, in order of first mention"""
+        found: Dict[str, None] = {}
+        position = 0
+        for start, end, canonical in sorted(self._matches(text), key=lambda match: (match[0], -match[1])):
+            if start >= position:
+                found.setdefault(canonical)
+                position = end
+        return list(found)
+
+    def extract_many(self, texts: Sequence[str]) -> List[List[str]]:
+        """Skills of several documents with the same compiled automaton"""
+        return [self.extract(text) for text in texts]
+
+    def document_frequency(self, texts: Sequence[str]) -> Counter:
+        """Number of documents mentioning each skill"""
+        counts: Counter = Counter()
+        for skills in self.extract_many(texts):
+            counts.update(skills)
+        return counts
+
+    def normalize(self, term: str) -> Optional[str]:
+        """Canonical name of a skill name or synonym, or None if it is not in the taxonomy"""
+        return self._canonical.get(normalize_skill(term))
+
+    def category(self, skill: str) -> Optional[str]:
+        """Category of a skill name or synonym"""
+        canonical = self.normalize(skill)
+        return self.categories.get(canonical) if canonical else None
+
+
+@lru_cache(maxsize=1)
+def get_skill_taxonomy() -> SkillTaxonomy:
+    """Taxonomy from ``app/data/skills.json``, compiled once per process"""
+    return SkillTaxonomy.load()
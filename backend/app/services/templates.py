@@ -0,0 +1,93 @@
+"""
+Compiled Jinja2 templates for emails and notifications
+"""
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+from jinja2 import Environment, FileSystemLoader, Template, TemplateNotFound, select_autoescape
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
+
+
+class RenderedTemplate:
+    """Rendered body plus the variables a template exports with ``{% set %}``"""
+
+    def __init__(self, body: str, exports: Dict[str, Any]):
+        self.body = body
+        self.exports = exports
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self.exports[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+class TemplateRegistry:
+    """Compile every template under ``app/templates`` once and render by name.
+
+    Templates live in one directory per locale (``en/email/welcome.html``,
+    ``en/notifications/new_application.txt``); a template missing from the
+    requested locale falls back to DEFAULT_LOCALE. Values a template sets at
+    top level (the email ``subject``, the notification ``title``) are
+    returned alongside the rendered body. HTML templates are autoescaped.
+    """
+
+    def __init__(self, templates_dir: str = TEMPLATES_DIR, default_locale: str = settings.DEFAULT_LOCALE):
+        self.default_locale = default_locale
+        self.env = Environment(
+            loader=FileSystemLoader(templates_dir),
+            autoescape=select_autoescape(enabled_extensions=("html",), default_for_string=False),
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+        self._templates: Dict[str, Template] = {}
+
+    def load(self) -> int:
+        """Compile all templates up front; returns how many were compiled"""
+        self._templates = {name: self.env.get_template(name) for name in self.env.list_templates()}
+        logger.info(f"Compiled {len(self._templates)} templates")
+        return len(self._templates)
+
+    def get(self, name: str, locale: Optional[str] = None) -> Template:
+        """Compiled template ``name`` for ``locale``, falling back to the default locale"""
+        if not self._templates:
+            self.load()
+        for candidate in (locale, self.default_locale):
+            if candidate and f"{candidate}/{name}" in self._templates:
+                return self._templates[f"{candidate}/{name}"]
+        raise TemplateNotFound(name)
+
+    def render(self, template_name: str, locale: Optional[str] = None, **context: Any) -> RenderedTemplate:
+        """Render one template"""
+        return self._render(self.get(template_name, locale), context)
+
+    def render_many(
+        self,
+        template_name: str,
+        contexts: Iterable[Dict[str, Any]],
+        locale: Optional[str] = None
+    ) -> List[RenderedTemplate]:
+        """Render one template for many contexts, e.g. for a bulk send"""
+        template = self.get(template_name, locale)
+        return [self._render(template, context) for context in contexts]
+
+    @staticmethod
+    def _render(template: Template, context: Dict[str, Any]) -> RenderedTemplate:
+        module = template.make_module(context)
+        exports = {key: value for key, value in vars(module).items() if not key.startswith("_")}
+        return RenderedTemplate(str(module).strip(), exports)
+
+    def render_email(self, template_name: str, locale: Optional[str] = None, **context: Any) -> Tuple[str, str]:
+        """Render ``email/<template_name>.html`` and return ``(subject, html_body)``"""
+        rendered = self.render(f"email/{template_name}.html", locale, **context)
+        return rendered.exports.get("subject", ""), rendered.body
+
+
+# Global instance
+template_registry = TemplateRegistry()
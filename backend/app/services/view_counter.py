@@ -0,0 +1,177 @@
+"""
+Write-behind aggregation of job view counts
+"""
+import asyncio
+from collections import Counter
+from typing import Dict, Optional, Tuple
+import logging
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.db.mongodb import get_jobs_collection
+from app.db.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "job_views:pending"
+
+# Atomically take every pending count, so each increment is written by one flush only
+CLAIM_SCRIPT = """
+local counts = redis.call('HGETALL', KEYS[1])
+redis.call('DEL', KEYS[1])
+return counts
+"""
+
+
+class ViewCounter:
+    """Accumulate job view increments and flush them with one bulk_write.
+
+    Views are counted in process memory, or with HINCRBY in Redis when
+    REDIS_ENABLED is set so that counts survive a worker crash and are shared
+    between workers. A background task flushes every
+    VIEW_COUNTER_FLUSH_INTERVAL_SECONDS; stop() performs a final flush on
+    shutdown. A flush claims the pending counts before writing them and puts
+    back only the increments MongoDB did not apply, so a failed or partly
+    failed flush is retried without counting any view twice.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = settings.VIEW_COUNTER_FLUSH_INTERVAL_SECONDS,
+        max_pending: int = settings.VIEW_COUNTER_MAX_PENDING
+    ):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Counter = Counter()
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._flush_requested = asyncio.Event()
+
+    def start(self) -> None:
+        """Start the periodic flush task"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"View counter flushing every {self.flush_interval}s")
+
+    async def stop(self) -> None:
+        """Stop the flush task and write out everything still pending"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def record(self, job_id: str, count: int = 1) -> None:
+        """Record ``count`` views of a job"""
+        if not ObjectId.is_valid(job_id):
+            return
+
+        redis = get_redis()
+        if redis is not None:
+            try:
+                await redis.hincrby(PENDING_KEY, job_id, count)
+                return
+            except Exception as e:
+                logger.error(f"Redis view counter unavailable, counting in memory: {e}")
+
+        self._pending[job_id] += count
+        if len(self._pending) >= self.max_pending:
+            self._flush_requested.set()
+
+    async def flush(self) -> int:
+        """Write all pending increments; returns the number of jobs updated"""
+        async with self._flush_lock:
+            updated = await self._flush_memory()
+            updated += await self._flush_redis()
+            return updated
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing job view counts: {e}")
+
+    async def _write(self, counts: Dict[str, int]) -> Tuple[int, Dict[str, int]]:
+        """Apply increments; returns the jobs updated and the increments not written.
+
+        Errors other than a partial BulkWriteError are raised, and then
+        nothing is known to have been written.
+        """
+        increments = [(job_id, int(count)) for job_id, count in counts.items() if int(count) > 0]
+        if not increments:
+            return 0, {}
+        operations = [
+            UpdateOne({"_id": ObjectId(job_id)}, {"$inc": {"views_count": count}})
+            for job_id, count in increments
+        ]
+        try:
+            result = await get_jobs_collection().bulk_write(operations, ordered=False)
+            return result.modified_count, {}
+        except BulkWriteError as e:
+            # Unordered: every operation not listed in writeErrors was applied
+            failed = dict(increments[error["index"]] for error in e.details.get("writeErrors", []))
+            logger.error(f"Failed to write {len(failed)} of {len(increments)} job view counts: {e}")
+            return e.details.get("nModified", 0), failed
+
+    async def _flush_memory(self) -> int:
+        if not self._pending:
+            return 0
+        counts, self._pending = self._pending, Counter()
+        try:
+            updated, failed = await self._write(counts)
+        except Exception as e:
+            logger.error(f"Failed to flush {len(counts)} job view counts: {e}")
+            updated, failed = 0, counts
+        # Put back what was not written so the next flush retries it
+        self._pending.update(failed)
+        return updated
+
+    async def _flush_redis(self) -> int:
+        redis = get_redis()
+        if redis is None:
+            return 0
+
+        try:
+            claimed = await redis.eval(CLAIM_SCRIPT, 1, PENDING_KEY)
+        except Exception as e:
+            logger.error(f"Failed to flush job view counts from Redis: {e}")
+            return 0
+        counts = dict(zip(claimed[::2], claimed[1::2]))
+        if not counts:
+            return 0
+
+        try:
+            updated, failed = await self._write(counts)
+        except Exception as e:
+            logger.error(f"Failed to flush {len(counts)} job view counts: {e}")
+            updated, failed = 0, counts
+        if failed:
+            await self._restore(failed)
+        return updated
+
+    async def _restore(self, counts: Dict[str, int]) -> None:
+        """Return claimed increments to the shared hash, or to this process if Redis fails"""
+        try:
+            pipe = get_redis().pipeline()
+            for job_id, count in counts.items():
+                pipe.hincrby(PENDING_KEY, job_id, int(count))
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to return {len(counts)} job view counts to Redis, keeping them in memory: {e}")
+            self._pending.update({job_id: int(count) for job_id, count in counts.items()})
+
+
+# Global instance
+view_counter = ViewCounter()
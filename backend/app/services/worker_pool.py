@@ -0,0 +1,86 @@
+"""
+Process pools for CPU-bound work kept off the event loop
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerPool:
+    """A pool of worker processes that can be replaced when a worker hangs or dies.
+
+    Functions submitted with submit() run in another process, so they and
+    their arguments and results must be picklable; they should raise plain
+    exceptions rather than HTTPException, which does not survive pickling.
+    """
+
+    def __init__(self, workers: int, name: str):
+        self.workers = workers
+        self.name = name
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # One task per worker at a time, so a timeout only covers running the
+        # task and not the wait for a free worker
+        self._slots = asyncio.Semaphore(workers)
+
+    def start(self) -> None:
+        """Start the worker processes"""
+        if self._executor is None:
+            # Spawned rather than forked: the API process runs threads (Motor, the event loop)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"{self.name} started with {self.workers} workers")
+
+    def stop(self, cancel_pending: bool = True) -> None:
+        """Shut down the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=cancel_pending)
+            self._executor = None
+
+    def recycle(self) -> None:
+        """Kill the worker processes and start new ones"""
+        self._replace(self._executor)
+
+    def _replace(self, executor: Optional[ProcessPoolExecutor]) -> None:
+        # Another task that failed on the same executor may have replaced it already
+        if executor is None or executor is not self._executor:
+            return
+        self._executor = None
+        # shutdown() alone leaves a hung worker running forever. Killing the
+        # processes fails the tasks still running there with BrokenProcessPool,
+        # and submit() retries those in the new processes.
+        for process in list((executor._processes or {}).values()):
+            process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+        logger.warning(f"{self.name} workers replaced")
+        self.start()
+
+    async def submit(self, function, *args, timeout: Optional[float] = None):
+        """Run ``function(*args)`` in a worker process.
+
+        Waits for a free worker, then allows the run ``timeout`` seconds; a
+        run that takes longer raises asyncio.TimeoutError and its workers
+        are replaced, since the process may be stuck.
+        """
+        async with self._slots:
+            try:
+                return await self._run(function, args, timeout)
+            except BrokenProcessPool:
+                return await self._run(function, args, timeout)
+
+    async def _run(self, function, args, timeout: Optional[float]):
+        if self._executor is None:
+            self.start()
+        executor = self._executor
+        future = asyncio.get_running_loop().run_in_executor(executor, function, *args)
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except (asyncio.TimeoutError, BrokenProcessPool):
+            self._replace(executor)
+            raise
@@ -0,0 +1,114 @@
+"""
+Celery worker for notification delivery
+
+Start with: celery -A app.worker worker --loglevel=info
+Used when NOTIFICATION_DISPATCH_BACKEND is "celery".
+"""
+from datetime import datetime
+import json
+import logging
+
+from bson import ObjectId
+from celery import Celery
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.services.notification_broker import CHANNEL
+from app.services.notification_counter import unread_adjustment
+
+logger = logging.getLogger(__name__)
+
+celery_app = Celery("jobify", broker=settings.CELERY_BROKER_URL or settings.REDIS_URL)
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    task_acks_late=True,
+    worker_prefetch_multiplier=1
+)
+
+DUPLICATE_KEY_ERROR = 11000
+DATETIME_FIELDS = ("created_at", "read_at", "archived_at")
+
+_db = None
+
+
+def _get_db():
+    global _db
+    if _db is None:
+        _db = MongoClient(settings.MONGODB_URI)[settings.MONGODB_DB_NAME]
+    return _db
+
+
+def _restore(notification: dict) -> dict:
+    # Datetimes arrive as ISO strings after JSON serialization. Ids are fixed
+    # before the first attempt so that retries cannot store duplicates.
+    doc = dict(notification)
+    doc["_id"] = ObjectId(doc["_id"]) if doc.get("_id") else ObjectId()
+    for field in DATETIME_FIELDS:
+        if isinstance(doc.get(field), str):
+            doc[field] = datetime.fromisoformat(doc[field])
+    return doc
+
+
+def _publish(written: list) -> None:
+    if not settings.REDIS_ENABLED:
+        return
+    try:
+        import redis
+        client = redis.Redis.from_url(settings.REDIS_URL)
+        for doc in written:
+            event = {"type": "notification.created", "notification": {**doc, "_id": str(doc["_id"])}}
+            client.publish(CHANNEL, json.dumps({"origin": "worker", "user_id": doc["user_id"], "event": event}, default=str))
+    except Exception as e:
+        logger.warning(f"Failed to publish notification events: {e}")
+
+
+@celery_app.task(bind=True, name="notifications.deliver", max_retries=settings.NOTIFICATION_DISPATCH_MAX_RETRIES)
+def deliver_notifications(self, notifications: list) -> int:
+    """Store a batch of notifications, retrying and dead-lettering failures"""
+    db = _get_db()
+    docs = [_restore(notification) for notification in notifications]
+    failed_indexes = set()
+    try:
+        db.notifications.insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        failed_indexes = {
+            error["index"] for error in e.details.get("writeErrors", [])
+            if error.get("code") != DUPLICATE_KEY_ERROR
+        }
+    except Exception as e:
+        failed_indexes = set(range(len(docs)))
+        logger.warning(f"Failed to write notification batch: {e}")
+
+    written = [doc for index, doc in enumerate(docs) if index not in failed_indexes]
+    # Retry with the ids already assigned so a write that did land is not duplicated
+    failed = [{**notifications[index], "_id": str(docs[index]["_id"])} for index in sorted(failed_indexes)]
+
+    deltas = {}
+    for doc in written:
+        if not doc.get("is_read") and not doc.get("is_archived"):
+            deltas[doc["user_id"]] = deltas.get(doc["user_id"], 0) + 1
+    if deltas:
+        try:
+            db.notification_counters.bulk_write(
+                [UpdateOne({"_id": user_id}, unread_adjustment(delta)) for user_id, delta in deltas.items()],
+                ordered=False
+            )
+        except Exception as e:
+            logger.error(f"Error adjusting unread counters: {e}")
+    _publish(written)
+
+    if failed:
+        if self.request.retries < self.max_retries:
+            raise self.retry(
+                args=(failed,),
+                countdown=settings.NOTIFICATION_RETRY_DELAY_SECONDS * 2 ** self.request.retries
+            )
+        db.notification_dead_letters.insert_many([
+            {"notification": _restore(notification), "error": "write errors",
+             "attempts": self.request.retries + 1, "failed_at": datetime.utcnow()}
+            for notification in failed
+        ])
+        logger.error(f"Moved {len(failed)} notifications to the dead-letter store")
+    return len(written)
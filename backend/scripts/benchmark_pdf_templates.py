@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Time resume PDF rendering for every template.
+
+Reports how long compiling the templates takes (once per generator) and,
+for each template, the mean, median and 95th percentile render time and
+the PDF size for a sample resume. Renders run in this process, without the
+worker pool or the PDF cache. Usage (from the backend directory):
+    python scripts/benchmark_pdf_templates.py [--iterations 50] [--entries 4]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.pdf_generator import PDFGenerator, TEMPLATES  # noqa: E402
+
+
+def sample_resume(entries: int) -> dict:
+    return {
+        "personalInfo": {
+            "name": "Jane Doe",
+            "email": "jane.doe@example.com",
+            "phone": "+1 234 567 8900",
+            "location": "San Francisco, CA",
+            "linkedIn": "linkedin.com/in/janedoe",
+            "github": "github.com/janedoe",
+            "summary": "Backend engineer building APIs and data pipelines. " * 3
+        },
+        "experience": [
+            {
+                "position": "Software Engineer",
+                "company": f"Company {i}",
+                "location": "Remote",
+                "startDate": "2020-01-01",
+                "endDate": "2022-06-01",
+                "description": "Built and operated services. " * 4,
+                "achievements": [f"Shipped feature {j} used by thousands of customers" for j in range(3)]
+            }
+            for i in range(entries)
+        ],
+        "education": [
+            {
+                "degree": "B.S.",
+                "field": "Computer Science",
+                "institution": "State University",
+                "startDate": "2014-09-01",
+                "endDate": "2018-06-01",
+                "gpa": "3.8"
+            }
+        ],
+        "skills": ["Python", "FastAPI", "MongoDB", "Docker", "Kubernetes", "React", "TypeScript", "AWS"],
+        "projects": [
+            {
+                "name": f"Project {i}",
+                "description": "A tool for something useful. " * 3,
+                "technologies": ["Python", "Redis"],
+                "github": "github.com/janedoe/project"
+            }
+            for i in range(entries)
+        ],
+        "certifications": [
+            {"name": "AWS Solutions Architect", "issuer": "Amazon", "date": "2021-03-01"}
+        ]
+    }
+
+
+def percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50, help="Renders per template")
+    parser.add_argument("--entries", type=int, default=4, help="Experience and project entries in the sample resume")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    generator = PDFGenerator()
+    print(f"Compiled {len(TEMPLATES)} templates in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    resume_data = sample_resume(args.entries)
+    print(f"{'template':<12} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'size KB':>9}")
+    for template_id in TEMPLATES:
+        # First render warms font and image caches
+        pdf_content = generator.render(resume_data, template_id)
+        timings = []
+        for _ in range(args.iterations):
+            started = time.perf_counter()
+            generator.render(resume_data, template_id)
+            timings.append((time.perf_counter() - started) * 1000)
+        print(
+            f"{template_id:<12} {statistics.mean(timings):>9.1f} {percentile(timings, 0.5):>9.1f} "
+            f"{percentile(timings, 0.95):>9.1f} {len(pdf_content) / 1024:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Apply versioned MongoDB schema migrations.
+
+Usage (from the backend directory):
+    python scripts/migrate.py status
+    python scripts/migrate.py up [--target N] [--batch-size 500] [--dry-run] [--allow-destructive [--yes]]
+
+Runs are resumable: if a migration is interrupted, running ``up`` again
+continues from the last completed batch. Destructive migrations only run
+with --allow-destructive; the documents they would delete are listed first
+and the run asks for confirmation unless --yes is given.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import sys
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.db.migrations import MIGRATIONS, MigrationRunner  # noqa: E402
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
+MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "jobify")
+
+
+async def show_status(runner: MigrationRunner):
+    """Print the state of every migration"""
+    for state in await runner.status():
+        flag = " (destructive)" if state["destructive"] else ""
+        logger.info(
+            f"{state['version']:04d} {state['name']:<24} {state['status']:<10} "
+            f"scanned={state['scanned']} modified={state['modified']}{flag}"
+        )
+
+
+async def confirm_destructive(runner: MigrationRunner, target) -> bool:
+    """Preview the pending destructive migrations and ask before running them"""
+    destructive = [
+        migration for migration in await runner.pending(allow_destructive=True)
+        if migration.destructive and (target is None or migration.version <= target)
+    ]
+    if not destructive:
+        return True
+    for migration in destructive:
+        await runner.apply(migration, dry_run=True)
+    names = ", ".join(f"{migration.version:04d} {migration.name}" for migration in destructive)
+    answer = input(f"Run destructive migrations {names}? Type 'yes' to continue: ")
+    return answer.strip().lower() == "yes"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="MongoDB schema migrations")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("status", help="Show applied and pending migrations")
+    up = subparsers.add_parser("up", help="Apply pending migrations")
+    up.add_argument("--target", type=int, help="Stop after this version")
+    up.add_argument("--batch-size", type=int, default=500, help="Documents per bulk_write")
+    up.add_argument("--dry-run", action="store_true", help="Report changes without writing")
+    up.add_argument("--allow-destructive", action="store_true", help="Also run migrations that delete data")
+    up.add_argument("--yes", action="store_true", help="Run destructive migrations without asking")
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(MONGODB_URI)
+    try:
+        db = client[MONGODB_DB_NAME]
+        if args.command == "status":
+            await show_status(MigrationRunner(db, MIGRATIONS))
+            return
+
+        runner = MigrationRunner(db, MIGRATIONS, batch_size=args.batch_size)
+        if args.allow_destructive and not args.dry_run and not args.yes:
+            if not await confirm_destructive(runner, args.target):
+                logger.info("Aborted")
+                return
+        if not await runner.acquire_lock(f"{socket.gethostname()}:{os.getpid()}"):
+            logger.error("Another process is applying migrations; try again when it has finished")
+            sys.exit(1)
+        try:
+            results = await runner.run(
+                target=args.target,
+                allow_destructive=args.allow_destructive,
+                dry_run=args.dry_run
+            )
+        finally:
+            await runner.release_lock()
+        if not results:
+            logger.info("No pending migrations")
+        await show_status(runner)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Google Drive files API.
+
+Serves the files of a directory, using each file name as its Drive file id:
+``GET /drive/v3/files/{id}`` returns the metadata and, with ``alt=media``,
+the content, streamed in chunks. Requests must carry
+``Authorization: Bearer <token>`` (``--token``, default ``test-token``),
+otherwise the answer is a 401 like Drive's for an expired token. Point the
+backend at it with GOOGLE_DRIVE_API_URL=http://localhost:8002. Usage (from
+the backend directory):
+    python scripts/mock_google_drive.py --dir ./sample_resumes [--port 8002] [--delay 0.01]
+"""
+import argparse
+import asyncio
+import mimetypes
+import os
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+CHUNK_SIZE = 16 * 1024
+MIME_TYPES = {
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+}
+
+app = FastAPI(title="Mock Google Drive API")
+app.state.directory = "."
+app.state.token = "test-token"
+app.state.delay = 0.0
+
+
+def _error(code: int, message: str) -> JSONResponse:
+    return JSONResponse(status_code=code, content={"error": {"code": code, "message": message}})
+
+
+@app.get("/drive/v3/files/{file_id}")
+async def get_file(file_id: str, request: Request, alt: str = "json"):
+    if request.headers.get("authorization") != f"Bearer {app.state.token}":
+        return _error(401, "Request had invalid authentication credentials.")
+    path = os.path.join(app.state.directory, os.path.basename(file_id))
+    if not os.path.isfile(path):
+        return _error(404, f"File not found: {file_id}.")
+
+    if alt != "media":
+        extension = os.path.splitext(path)[1].lower()
+        return {
+            "id": file_id,
+            "name": file_id,
+            "mimeType": MIME_TYPES.get(extension) or mimetypes.guess_type(path)[0] or "application/octet-stream",
+            "size": str(os.path.getsize(path))
+        }
+
+    async def content():
+        with open(path, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                await asyncio.sleep(app.state.delay)
+                yield chunk
+
+    return StreamingResponse(
+        content(),
+        media_type="application/octet-stream",
+        headers={"Content-Length": str(os.path.getsize(path))}
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", default=".", help="Directory of files to serve")
+    parser.add_argument("--port", type=int, default=8002)
+    parser.add_argument("--token", default="test-token", help="Access token to accept")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds between streamed chunks")
+    args = parser.parse_args()
+    app.state.directory = args.dir
+    app.state.token = args.token
+    app.state.delay = args.delay
+    uvicorn.run(app, host="127.0.0.1", port=args.port)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenAI API.
+
+Answers ``POST /v1/chat/completions`` with a canned reply, either as one
+JSON response or, with ``"stream": true``, as server-sent events emitted one
+word at a time, and ``POST /v1/embeddings`` with deterministic vectors.
+``--error-rate`` answers that fraction of requests with a 503 to exercise
+retries and the circuit breaker. Point the backend at it with
+OPENAI_BASE_URL=http://localhost:8001/v1 and any OPENAI_API_KEY. Usage
+(from the backend directory):
+    python scripts/mock_openai.py [--port 8001] [--delay 0.05] [--error-rate 0.2]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+REPLY = (
+    "Hi, I'm Opusnex AI! Tailor your resume to each job, lead with measurable "
+    "results, and keep it to one or two pages."
+)
+
+app = FastAPI(title="Mock OpenAI API")
+app.state.delay = 0.05
+app.state.error_rate = 0.0
+
+
+@app.middleware("http")
+async def inject_errors(request: Request, call_next):
+    if random.random() < app.state.error_rate:
+        return JSONResponse(
+            status_code=503,
+            content={"error": {"message": "The server is overloaded", "type": "server_error"}}
+        )
+    return await call_next(request)
+
+
+def _usage(prompt_tokens: int, completion_tokens: int = 0) -> dict:
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens
+    }
+
+
+def _chunk(completion_id: str, model: str, delta: dict, finish_reason=None, usage=None) -> str:
+    body = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}] if usage is None else [],
+        "usage": usage
+    }
+    return f"data: {json.dumps(body)}\n\n"
+
+
+def _embedding(text: str, dimensions: int = 16) -> list:
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return [(byte - 128) / 128 for byte in digest[:dimensions]]
+
+
+@app.post("/v1/embeddings")
+async def embeddings(request: Request):
+    payload = await request.json()
+    inputs = payload.get("input")
+    inputs = [inputs] if isinstance(inputs, str) else inputs
+    return {
+        "object": "list",
+        "model": payload.get("model", "mock"),
+        "data": [
+            {"object": "embedding", "index": index, "embedding": _embedding(text)}
+            for index, text in enumerate(inputs)
+        ],
+        "usage": _usage(sum(len(text.split()) for text in inputs))
+    }
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    payload = await request.json()
+    model = payload.get("model", "mock")
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    words = REPLY.split(" ")
+
+    if not payload.get("stream"):
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": REPLY}, "finish_reason": "stop"}],
+            "usage": _usage(10, len(words))
+        }
+
+    async def events():
+        yield _chunk(completion_id, model, {"role": "assistant", "content": ""})
+        for index, word in enumerate(words):
+            await asyncio.sleep(app.state.delay)
+            yield _chunk(completion_id, model, {"content": word if index == 0 else f" {word}"})
+        yield _chunk(completion_id, model, {}, finish_reason="stop")
+        if payload.get("stream_options", {}).get("include_usage"):
+            yield _chunk(completion_id, model, {}, usage=_usage(10, len(words)))
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--delay", type=float, default=0.05, help="Seconds between streamed words")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 503")
+    args = parser.parse_args()
+    app.state.delay = args.delay
+    app.state.error_rate = args.error_rate
+    uvicorn.run(app, host="127.0.0.1", port=args.port)
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Recompute the materialized application statistics from scratch.
+
+The initial backfill runs as migration 4 (backfill_application_stats); run
+this to reconcile counters that have drifted. Usage (from the backend directory):
+    python scripts/rebuild_application_stats.py
+"""
+import asyncio
+import logging
+import os
+import sys
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+load_dotenv()
+
+from app.db.mongodb import connect_to_mongo, close_mongo_connection  # noqa: E402
+from app.services.application_stats import application_stats_service  # noqa: E402
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+
+async def main():
+    await connect_to_mongo()
+    try:
+        written = await application_stats_service.rebuild()
+        logging.info(f"Wrote {written} application stats documents")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())